@@ -1,115 +1,71 @@
-import tkinter as tk
-from tkinter import messagebox
-import subprocess
-import os
-from dotenv import load_dotenv
-import json
 import sys
+import time
 from pathlib import Path
-import threading
 
 BASE_DIR = Path(__file__).resolve().parent
-
-
-class Theme:
-    """Design system for consistent styling"""
-
-    # Colors
-    BG_PRIMARY = "#FFFFFF"
-    BG_SECONDARY = "#F8F9FA"
-    BG_HOVER = "#E9ECEF"
-
-    ACCENT_PRIMARY = "#4A90E2"
-    ACCENT_HOVER = "#357ABD"
-    ACCENT_DARK = "#2E5C8A"
-
-    TEXT_PRIMARY = "#1A1A1A"
-    TEXT_SECONDARY = "#6C757D"
-    TEXT_LIGHT = "#ADB5BD"
-
-    BORDER = "#DEE2E6"
-    SUCCESS = "#28A745"
-    ERROR = "#DC3545"
-    WARNING = "#FFC107"
-
-    # Fonts
-    FONT_TITLE = ("Segoe UI", 24, "bold")
-    FONT_SUBTITLE = ("Segoe UI", 12)
-    FONT_CATEGORY = ("Segoe UI", 16, "bold")
-    FONT_BUTTON = ("Segoe UI", 11)
-    FONT_BUTTON_LARGE = ("Segoe UI", 13)
-    FONT_STATUS = ("Segoe UI", 9)
-
-    # Spacing
-    PADDING_XL = 34
-    PADDING_L = 18
-    PADDING_M = 12
-    PADDING_S = 6
-
-    # Dimensions
-    BUTTON_HEIGHT = 32
-    BUTTON_HEIGHT_SMALL = 22
-    BORDER_RADIUS = 6
-
-
-class ModernButton(tk.Button):
-    """Custom button with hover effects and modern styling"""
-
-    def __init__(self, parent, style="primary", **kwargs):
-        # Set default styling based on style type
-        if style == "primary":
-            defaults = {
-                "bg": Theme.ACCENT_PRIMARY,
-                "fg": "white",
-                "activebackground": Theme.ACCENT_HOVER,
-                "activeforeground": "white",
-            }
-            self.hover_color = Theme.ACCENT_HOVER
-            self.normal_color = Theme.ACCENT_PRIMARY
-        elif style == "secondary":
-            defaults = {
-                "bg": Theme.BG_SECONDARY,
-                "fg": Theme.TEXT_PRIMARY,
-                "activebackground": Theme.BG_HOVER,
-                "activeforeground": Theme.TEXT_PRIMARY,
-            }
-            self.hover_color = Theme.BG_HOVER
-            self.normal_color = Theme.BG_SECONDARY
-        else:  # ghost/back button
-            defaults = {
-                "bg": Theme.BG_PRIMARY,
-                "fg": Theme.TEXT_SECONDARY,
-                "activebackground": Theme.BG_SECONDARY,
-                "activeforeground": Theme.TEXT_PRIMARY,
-            }
-            self.hover_color = Theme.BG_SECONDARY
-            self.normal_color = Theme.BG_PRIMARY
-
-        defaults.update(
-            {
-                "font": kwargs.get("font", Theme.FONT_BUTTON),
-                "relief": "flat",
-                "cursor": "hand2",
-                "bd": 0,
-                "padx": 20,
-                "pady": 12,
-            }
-        )
-
-        # Merge with provided kwargs
-        defaults.update(kwargs)
-
-        super().__init__(parent, **defaults)
-
-        # Bind hover events
-        self.bind("<Enter>", self._on_enter)
-        self.bind("<Leave>", self._on_leave)
-
-    def _on_enter(self, e):
-        self.config(bg=self.hover_color)
-
-    def _on_leave(self, e):
-        self.config(bg=self.normal_color)
+RUN_LOG_DIR = BASE_DIR / "logs" / "runs"
+STARTUP_HISTORY = BASE_DIR / ".cache" / "startup.jsonl"
+METRICS_FILE = BASE_DIR / ".cache" / "metrics.prom"
+
+# Category whose page offers the portfolio panel
+PORTFOLIO_CATEGORY = "finances"
+
+# Navigation buttons shown at first paint; any other category the registry
+# holds, e.g. discovery's default, gets a button once scripts are loaded
+CATEGORIES = (
+    ("💻 Coding", "coding"),
+    ("💰 Finances", "finances"),
+    ("☀️ Morning Activities", "morning"),
+    ("📚 Study", "study"),
+    ("📋 Planning", "planning"),
+)
+OTHER_CATEGORY_ICON = "📁"
+
+# Make the launcher package importable when started via `python -m script_launcher`
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+
+# Headless commands never import tkinter; --help is the CLI's
+if __name__ == "__main__" and len(sys.argv) > 1:
+    from launcher.cli import COMMANDS
+
+    if sys.argv[1] in COMMANDS or sys.argv[1] in ("-h", "--help"):
+        from launcher.cli import main as cli_main
+
+        sys.exit(cli_main(sys.argv[1:]))
+
+from launcher.startup import StartupTimer, report_requested
+
+STARTUP = StartupTimer()
+
+# Only what the navigation screen needs is imported before first paint
+tk = STARTUP.timed_import("tkinter")
+STARTUP.timed_import("launcher.widgets")
+from launcher.widgets import ModernButton, Theme, VirtualList
+
+# Loaded by finish_startup() once the window is on screen
+DEFERRED_IMPORTS = (
+    "subprocess",
+    "tkinter.messagebox",
+    "launcher.config",
+    "launcher.discovery",
+    "launcher.pool",
+    "launcher.jobs",
+    "launcher.aio",
+    "launcher.output",
+    "launcher.search",
+    "launcher.metrics",
+    "launcher.history",
+    "launcher.macros",
+    "launcher.runlog",
+    "launcher.resources",
+    "launcher.cron",
+    "launcher.speculate",
+    "launcher.uipump",
+    "launcher.jobview",
+    "launcher.statsview",
+    "launcher.palette",
+)
 
 
 class ScriptLauncher:
@@ -119,13 +75,38 @@ class ScriptLauncher:
         self.root.geometry("580x700")
         self.root.configure(bg=Theme.BG_PRIMARY)
 
-        # Make window non-resizable for consistent layout
-        self.root.resizable(False, False)
+        # Fixed width keeps the layout consistent; long lists scroll vertically
+        self.root.resizable(False, True)
+        self.root.minsize(580, 400)
 
-        load_dotenv()
-        self.scripts = self.load_scripts()
+        # Config, registry and workers load after first paint (finish_startup)
+        self.config = None
+        self.scripts = {}
+        self._started = False
+        self._closing = False
         self.current_page = None
 
+        # Widget updates are batched per frame once startup finishes
+        self.pump = None
+        self._notices = []
+
+        # Built on first use; reading the portfolio pulls in NumPy
+        self.portfolio_panel = None
+
+        # Pages are built on first visit and kept alive between navigations
+        self._pages = {}
+        self._page_builders = {}
+        # Navigation buttons of categories outside CATEGORIES, by key
+        self._category_container = None
+        self._other_categories = {}
+
+        # Ctrl+K / Ctrl+P search every script without drilling into categories
+        root.bind("<Control-k>", self.open_palette)
+        root.bind("<Control-p>", self.open_palette)
+        root.bind("<Control-j>", self.open_jobs)
+        root.bind("<Control-m>", self.open_stats)
+        root.bind("<Control-f>", self.open_portfolio)
+
         # Main container with padding
         container = tk.Frame(root, bg=Theme.BG_PRIMARY)
         container.pack(fill="both", expand=True)
@@ -141,6 +122,169 @@ class ScriptLauncher:
 
         self.show_navigation()
 
+    def finish_startup(self):
+        """Load config and start the execution machinery; runs once, after paint"""
+        if self._started:
+            return
+        self._started = True
+
+        for name in DEFERRED_IMPORTS:
+            STARTUP.timed_import(name)
+        from launcher import metrics
+        from launcher.aio import AsyncJobScheduler, AsyncWorkerPool, TkEventLoop
+        from launcher.config import load_config
+        from launcher.cron import CronScheduler
+        from launcher.history import open_store
+        from launcher.jobview import JobTable
+        from launcher.palette import CommandPalette
+        from launcher.resources import open_monitor
+        from launcher.runlog import open_run_log
+        from launcher.search import SearchIndex
+        from launcher.speculate import RunHistory, Speculator
+        from launcher.statsview import StatsTable
+        from launcher.uipump import UpdatePump
+
+        self.config = load_config()
+        self.scripts = self.load_scripts()
+        self._sync_category_buttons()
+
+        # Status, table and dialog updates from many jobs are coalesced and
+        # applied at a fixed frame rate instead of one Tk callback each
+        self.pump = UpdatePump(
+            self.root, fps=int(self.config.get("LAUNCHER_UI_FPS", "30"))
+        )
+        self.pump.start()
+
+        self.search_index = SearchIndex()
+        self._index_scripts()
+        self.palette = CommandPalette(
+            self.root, self.search_index, self.run_script, on_hover=self._hover_script
+        )
+
+        # Runs are asyncio tasks sliced into Tk's mainloop: no thread per run,
+        # and job callbacks may update widgets directly
+        self.aio = TkEventLoop(self.root)
+        self.aio.start()
+
+        # Warm interpreters so a click doesn't pay for a cold Python start
+        self.pool = AsyncWorkerPool(
+            self.aio.loop,
+            BASE_DIR,
+            size=int(self.config.get("LAUNCHER_POOL_SIZE", "2")),
+            max_runs=int(self.config.get("LAUNCHER_POOL_MAX_RUNS", "20")),
+            env=self.config.child_env(),
+        )
+        self.pool.start()
+
+        # Bounded concurrency; clicks beyond the limits wait in a queue
+        self.jobs = AsyncJobScheduler(
+            self._execute_job,
+            self.aio.loop,
+            max_workers=int(self.config.get("LAUNCHER_MAX_JOBS", "0")) or None,
+            category_limit=(
+                int(self.config.get("LAUNCHER_CATEGORY_LIMIT", "0")) or None
+            ),
+            script_limit=int(self.config.get("LAUNCHER_SCRIPT_LIMIT", "1")),
+            on_change=self._on_job_change,
+        )
+        self.job_table = JobTable(self.root, self.jobs, pump=self.pump)
+
+        # Every finished run, kept in SQLite and written off the Tk thread
+        self.history = open_store(self.config)
+        # Each run's full output, in rotating segments under logs/launcher
+        self.runlog = open_run_log(self.config)
+        # CPU, memory and disk I/O of each run's processes, sampled off the
+        # Tk thread
+        problems = []
+        self.resources = open_monitor(self.config, problems)
+        for problem in problems:
+            print(f"Warning: {problem}", file=sys.stderr)
+            self.set_status(problem)
+
+        # LAUNCHER_SCHEDULE runs scripts at set times while the launcher is open
+        self.cron = CronScheduler(self._run_scheduled)
+        self._load_schedule()
+        self.cron.attach(self.root)
+
+        # Idle warm workers get ready for the scripts likely to be run next
+        self.speculator = Speculator(
+            self.root,
+            self.pool,
+            RunHistory(self.history),
+            busy=self.jobs.active,
+            enabled=self.config.get("LAUNCHER_SPECULATE", "1") != "0",
+            per_minute=int(self.config.get("LAUNCHER_SPECULATE_PER_MINUTE", "12")),
+        )
+        # By then the warm workers are up
+        self.root.after(2000, self.speculator.anticipate)
+
+        # Per-run latency telemetry, exported as OpenMetrics text
+        self.metrics = metrics.MetricsRegistry()
+        self.metrics_file = Path(self.config.get("LAUNCHER_METRICS_FILE", METRICS_FILE))
+        metrics_port = self.config.get("LAUNCHER_METRICS_PORT")
+        if metrics_port:
+            metrics.serve(self.metrics, int(metrics_port))
+        self.stats_table = StatsTable(
+            self.root, self.aio, self.pump, self.metrics, self.history
+        )
+
+        STARTUP.mark("ready")
+        self._report_startup()
+
+    def _report_startup(self):
+        budget = int(self.config.get("LAUNCHER_FIRST_PAINT_BUDGET_MS", "500"))
+        for warning in STARTUP.record(STARTUP_HISTORY, budget_ms=budget):
+            print(f"Startup warning: {warning}", file=sys.stderr)
+        if report_requested():
+            print(STARTUP.report(), file=sys.stderr)
+
+    def shutdown(self):
+        self._closing = True
+        if self._started:
+            self.cron.close()
+            self.pump.close()
+            self.jobs.shutdown()
+            self.aio.close(self._close_runs())
+            if self.runlog is not None:
+                self.runlog.close()
+            self.history.close()
+
+    async def _close_runs(self):
+        """Leave runs in flight to finish on their own, but end their tasks
+        so each is recorded, as cancelled, before the history closes"""
+        await self.pool.shutdown()
+        self.jobs.shutdown(cancel_running=True)
+        await self.jobs.wait()
+
+    def open_palette(self, event=None):
+        self.finish_startup()
+        return self.palette.open()
+
+    def open_jobs(self, event=None):
+        self.finish_startup()
+        return self.job_table.open()
+
+    def open_stats(self, event=None):
+        self.finish_startup()
+        return self.stats_table.open()
+
+    def open_portfolio(self, event=None):
+        self.finish_startup()
+        if self.portfolio_panel is None:
+            from launcher.portfolioview import PortfolioPanel
+
+            self.portfolio_panel = PortfolioPanel(
+                self.root, self.aio, self.pump, self._portfolio_files
+            )
+        return self.portfolio_panel.open()
+
+    def _portfolio_files(self):
+        self.refresh_config()
+        return (
+            self.config.get("PORTFOLIO_PATH"),
+            self.config.get("PORTFOLIO_PRICES_PATH"),
+        )
+
     def _create_status_bar(self, root):
         """Create modern status bar"""
         status_frame = tk.Frame(root, bg=Theme.BG_SECONDARY, height=36)
@@ -170,6 +314,29 @@ class ScriptLauncher:
         )
         self.status_indicator.pack(side="right")
 
+        # Open the stats (Ctrl+M) and job (Ctrl+J) windows
+        stats_btn = ModernButton(
+            status_frame,
+            text="Stats",
+            style="secondary",
+            command=self.open_stats,
+            font=Theme.FONT_STATUS,
+            padx=Theme.PADDING_S,
+            pady=0,
+        )
+        stats_btn.pack(side="right")
+
+        jobs_btn = ModernButton(
+            status_frame,
+            text="Jobs",
+            style="secondary",
+            command=self.open_jobs,
+            font=Theme.FONT_STATUS,
+            padx=Theme.PADDING_S,
+            pady=0,
+        )
+        jobs_btn.pack(side="right")
+
     def set_status(self, message: str, status_type: str = "ready"):
         """Update status bar with message and color indicator"""
         color_map = {
@@ -179,32 +346,126 @@ class ScriptLauncher:
             "success": Theme.SUCCESS,
         }
 
-        self.root.after(0, lambda: self.status_var.set(message))
-        self.root.after(
-            0,
-            lambda: self.status_indicator.config(
-                fg=color_map.get(status_type, Theme.SUCCESS)
-            ),
-        )
+        if self._closing:
+            return
+        color = color_map.get(status_type, Theme.SUCCESS)
+
+        def apply():
+            self.status_var.set(message)
+            self.status_indicator.config(fg=color)
+
+        if self.pump is None:
+            apply()
+        else:
+            self.pump.post("status", apply)
+
+    def notify(self, kind, title, message):
+        """Show a dialog; several in the same frame are combined into one"""
+        self._notices.append((kind, title, message))
+        self.pump.post("notices", self._show_notices)
+
+    def _show_notices(self):
+        from tkinter import messagebox
+
+        notices, self._notices = self._notices, []
+        if not notices:
+            return
+        if len(notices) == 1:
+            kind, title, message = notices[0]
+        else:
+            kind = "error" if any(n[0] == "error" for n in notices) else "info"
+            title = f"{len(notices)} scripts finished"
+            message = "\n".join(n[2] for n in notices)
+        show = messagebox.showerror if kind == "error" else messagebox.showinfo
+
+        # Modal dialogs open in a callback of their own, never in a batch
+        self.root.after(0, lambda: show(title, message))
 
     def load_scripts(self):
-        try:
-            scripts_json = os.getenv("SCRIPTS_LIST")
-            if not scripts_json:
-                return {}
-            return json.loads(scripts_json)
-        except Exception:
-            return {}
+        from launcher.discovery import load_scripts
+
+        return load_scripts(self.config)
+
+    def refresh_config(self):
+        """Pick up .env edits and new or changed scripts; cheap when nothing changed"""
+        from launcher.config import load_config
+
+        config = load_config()
+        if config.digest != self.config.digest:
+            self.config = config
+            self.pool.reset(env=config.child_env())
+            self._load_schedule()
+
+        scripts = self.load_scripts()
+        if scripts != self.scripts:
+            self.scripts = scripts
+            self._index_scripts()
+            self._invalidate_category_pages()
+            self._sync_category_buttons()
+
+    def _load_schedule(self):
+        from launcher.cron import parse_schedule
+
+        problems = []
+        self.cron.update(parse_schedule(self.config.get("LAUNCHER_SCHEDULE"), problems))
+        for problem in problems:
+            print(f"Schedule warning: {problem}", file=sys.stderr)
+        if self.cron.blocked:
+            self.set_status("Schedule left to the launcher already running it")
+
+    def _run_scheduled(self, entry):
+        """Queue a schedule entry's scripts; called by the cron scheduler"""
+        from launcher.cron import resolve_targets
+
+        jobs = [
+            self.jobs.submit(script.name, script.module, script.category)
+            for script in resolve_targets(self.scripts, entry.run)
+        ]
+        self.set_status(f"Scheduled: {entry.name}", "running")
+        self.aio.wake()
+        return jobs
+
+    def _index_scripts(self):
+        self.search_index.update(
+            script for scripts in self.scripts.values() for script in scripts
+        )
+
+    def _show_page(self, key, builder):
+        """Switch to a cached page, building it on first visit"""
+        page = self._pages.get(key)
+        if page is None:
+            page = tk.Frame(self.main_frame, bg=Theme.BG_PRIMARY)
+            builder(page)
+            self._pages[key] = page
+            self._page_builders[key] = builder
+
+        current = self._pages.get(self.current_page)
+        if current is not None and current is not page:
+            current.pack_forget()
+        page.pack(fill="both", expand=True)
+        self.current_page = key
+
+    def _invalidate_category_pages(self):
+        """Drop category pages after the script registry changed"""
+        current = self.current_page
+        for key in [k for k in self._pages if k != "navigation"]:
+            self._pages.pop(key).destroy()
+        builders = self._page_builders
+        self._page_builders = {k: b for k, b in builders.items() if k == "navigation"}
+
+        # Rebuild the page the user is looking at so it never goes blank
+        if current != "navigation" and current in builders:
+            self.current_page = None
+            self._show_page(current, builders[current])
 
     def show_navigation(self):
         """Display main navigation menu"""
         self.set_status("Ready", "ready")
+        self._show_page("navigation", self._build_navigation)
 
-        for widget in self.main_frame.winfo_children():
-            widget.destroy()
-
+    def _build_navigation(self, page):
         # Header section
-        header_frame = tk.Frame(self.main_frame, bg=Theme.BG_PRIMARY)
+        header_frame = tk.Frame(page, bg=Theme.BG_PRIMARY)
         header_frame.pack(fill="x", pady=(0, Theme.PADDING_XL))
 
         title = tk.Label(
@@ -225,45 +486,71 @@ class ScriptLauncher:
         )
         subtitle.pack(pady=(Theme.PADDING_S, 0))
 
+        hint = tk.Label(
+            header_frame,
+            text="Press Ctrl+K to search all scripts · Shift+click runs a script next",
+            font=Theme.FONT_STATUS,
+            bg=Theme.BG_PRIMARY,
+            fg=Theme.TEXT_LIGHT,
+        )
+        hint.pack(pady=(Theme.PADDING_S, 0))
+
         # Divider
-        divider = tk.Frame(self.main_frame, bg=Theme.BORDER, height=1)
+        divider = tk.Frame(page, bg=Theme.BORDER, height=1)
         divider.pack(fill="x", pady=Theme.PADDING_L)
 
         # Category buttons container
-        button_container = tk.Frame(self.main_frame, bg=Theme.BG_PRIMARY)
+        button_container = tk.Frame(page, bg=Theme.BG_PRIMARY)
         button_container.pack(fill="both", expand=True, pady=Theme.PADDING_M)
+        self._category_container = button_container
+        self._other_categories = {}
+
+        for display_name, category_key in CATEGORIES:
+            self._category_button(display_name, category_key)
+        self._sync_category_buttons()
+
+    def _category_button(self, display_name, category_key):
+        btn = ModernButton(
+            self._category_container,
+            text=display_name,
+            style="secondary",
+            command=lambda: self.show_category(category_key, display_name),
+            font=Theme.FONT_BUTTON_LARGE,
+            width=28,
+            height=2,
+        )
+        btn.pack(pady=Theme.PADDING_S, ipady=4)
+        return btn
 
-        categories = [
-            ("💻 Coding", "coding"),
-            ("💰 Finances", "finances"),
-            ("☀️ Morning Activities", "morning"),
-            ("📚 Study", "study"),
-            ("📋 Planning", "planning"),
-        ]
-
-        for display_name, category_key in categories:
-            btn = ModernButton(
-                button_container,
-                text=display_name,
-                style="secondary",
-                command=lambda cat=category_key, name=display_name: self.show_category(
-                    cat, name
-                ),
-                font=Theme.FONT_BUTTON_LARGE,
-                width=28,
-                height=2,
-            )
-            btn.pack(pady=Theme.PADDING_S, ipady=4)
+    def _sync_category_buttons(self):
+        """Match the extra navigation buttons to the registry's categories"""
+        if self._category_container is None:
+            return
+        standard = {key for _, key in CATEGORIES}
+        others = sorted(key for key, scripts in self.scripts.items() if scripts)
+        others = [key for key in others if key not in standard]
+        for key in [k for k in self._other_categories if k not in others]:
+            self._other_categories.pop(key).destroy()
+        for key in others:
+            if key not in self._other_categories:
+                name = f"{OTHER_CATEGORY_ICON} {key.replace('_', ' ').title()}"
+                self._other_categories[key] = self._category_button(name, key)
 
     def show_category(self, category, category_name):
         """Display scripts for selected category"""
+        self.finish_startup()
+        self.refresh_config()
         self.set_status(f"Viewing {category_name}", "ready")
+        self._show_page(
+            ("category", category),
+            lambda page: self._build_category(page, category, category_name),
+        )
 
-        for widget in self.main_frame.winfo_children():
-            widget.destroy()
+    def _build_category(self, page, category, category_name):
+        from launcher.jobs import RUN_NEXT_PRIORITY
 
         # Header with back button
-        header_frame = tk.Frame(self.main_frame, bg=Theme.BG_PRIMARY)
+        header_frame = tk.Frame(page, bg=Theme.BG_PRIMARY)
         header_frame.pack(fill="x", pady=(0, Theme.PADDING_L))
 
         back_btn = ModernButton(
@@ -291,12 +578,23 @@ class ScriptLauncher:
         )
         title.pack(side="left", padx=Theme.PADDING_M)
 
+        # Holdings summary of the PORTFOLIO_PATH file (Ctrl+F)
+        if category == PORTFOLIO_CATEGORY and self.config.get("PORTFOLIO_PATH"):
+            portfolio_btn = ModernButton(
+                header_frame,
+                text="Portfolio",
+                style="secondary",
+                command=self.open_portfolio,
+                font=Theme.FONT_BUTTON,
+            )
+            portfolio_btn.pack(side="right")
+
         # Divider
-        divider = tk.Frame(self.main_frame, bg=Theme.BORDER, height=1)
+        divider = tk.Frame(page, bg=Theme.BORDER, height=1)
         divider.pack(fill="x", pady=Theme.PADDING_M)
 
-        # Scripts container with scrollbar if needed
-        scripts_container = tk.Frame(self.main_frame, bg=Theme.BG_PRIMARY)
+        # Scripts container; only the visible rows exist as widgets
+        scripts_container = tk.Frame(page, bg=Theme.BG_PRIMARY)
         scripts_container.pack(fill="both", expand=True, pady=Theme.PADDING_M)
 
         category_scripts = self.scripts.get(category, [])
@@ -313,85 +611,214 @@ class ScriptLauncher:
             return
 
         # Script buttons
-        for script in category_scripts:
-            script_name = script.get("name", "Unnamed Script")
-            module_path = script.get("module", "")
+        script_list = VirtualList(
+            scripts_container,
+            label=lambda script: script.name,
+            on_select=lambda script: self.run_script(
+                script.name, script.module, script.category
+            ),
+            on_hover=self._hover_script,
+            on_shift_select=lambda script: self.run_script(
+                script.name, script.module, script.category, RUN_NEXT_PRIORITY
+            ),
+        )
+        script_list.pack(fill="both", expand=True)
+        script_list.set_items(category_scripts)
+
+    def run_script(
+        self, script_name: str, module_path: str, category: str = "", priority=0
+    ):
+        """Queue script for execution on the job scheduler"""
+        self.finish_startup()
+        self.refresh_config()
+        self.set_status(f"Launching {script_name}...", "running")
+        self.speculator.record(module_path)
+        self.jobs.submit(script_name, module_path, category, priority)
+        self.aio.wake()
 
-            # Script card frame
-            card_frame = tk.Frame(scripts_container, bg=Theme.BG_SECONDARY)
-            card_frame.pack(fill="x", pady=Theme.PADDING_S)
+    def _on_job_change(self, job):
+        if self._closing:
+            return
+        self.pump.post("jobs", self.job_table.refresh)
+        if job.finished is not None:
+            self.pump.post("anticipate", self.speculator.anticipate)
+
+    def _hover_script(self, script):
+        self.speculator.hover(script.module if script is not None else None)
+
+    def _output_buffer(self, job):
+        from launcher.output import OutputBuffer
+
+        spill_path = None
+        if self.config.get("LAUNCHER_SPILL_OUTPUT", "0") == "1":
+            stamp = time.strftime("%Y%m%d-%H%M%S")
+            spill_path = RUN_LOG_DIR / f"{stamp}-{job.id}-{job.module}.log"
+        return OutputBuffer(
+            max_lines=int(self.config.get("LAUNCHER_OUTPUT_LINES", "2000")),
+            spill_path=spill_path,
+        )
 
-            btn = ModernButton(
-                card_frame,
-                text=script_name,
-                style="secondary",
-                command=lambda n=script_name, m=module_path: self.run_script(n, m),
-                font=Theme.FONT_BUTTON,
-                width=50,
-                anchor="w",
-            )
-            btn.pack(fill="x", padx=2, pady=2, ipady=8)
+    def _on_job_output(self, job, data):
+        job.output.write(data)
+        if self.runlog is not None:
+            self.runlog.write(job, data)
+        self.job_table.notify_output(job)
+
+    async def _execute_job(self, job):
+        """Scheduler runner for script execution; a task on the Tk-driven loop"""
+        import asyncio
+
+        from launcher.macros import is_macro, lookup, run_macro_async
+
+        script_name = job.script_name
+        job.output = self._output_buffer(job)
+        run_start = time.monotonic()
+        spawned_at = []
+        error = result = None
+        usage = self.resources.track() if self.resources is not None else None
+
+        def on_start(process):
+            spawned_at.append(time.monotonic())
+            if usage is not None:
+                usage.add(process)
+            job.attach(process)
 
-    def run_script(self, script_name: str, module_path: str):
-        """Execute script in background thread"""
-        self.set_status(f"Launching {script_name}...", "running")
-        threading.Thread(
-            target=self._run_script_worker,
-            args=(script_name, module_path),
-            daemon=True,
-        ).start()
-
-    def _run_script_worker(self, script_name: str, module_path: str):
-        """Background worker for script execution"""
         try:
             self.set_status(f"Running {script_name}...", "running")
 
-            subprocess.run(
-                [sys.executable, "-m", module_path],
-                cwd=BASE_DIR,
-                capture_output=True,
-                text=True,
-                timeout=60,
-                check=True,
-            )
+            if is_macro(job.module):
+                result = await run_macro_async(
+                    lookup(self.config, job.module),
+                    self.scripts,
+                    self.pool,
+                    timeout=60,
+                    on_start=on_start,
+                    on_output=lambda data: self._on_job_output(job, data),
+                    on_step=self._record_step,
+                    monitor=self.resources,
+                )
+            else:
+                result = await self.pool.run(
+                    job.module,
+                    timeout=60,
+                    on_start=on_start,
+                    on_output=lambda data: self._on_job_output(job, data),
+                )
+            result.check_returncode()
+
+            if is_macro(job.module):
+                self.set_status(f"✓ {script_name}: {result.summary}", "success")
+                self.notify("info", "Success", f"{script_name}: {result.summary}")
+            else:
+                self.set_status(f"✓ {script_name} completed", "success")
+                self.notify("info", "Success", f"{script_name} completed successfully!")
+            return result
+
+        except asyncio.CancelledError as e:
+            error = e
+            if job.cancelled:
+                self._report_failure(job, None)
+            # Otherwise the launcher is closing; either way it's no error
+            job.cancelled = True
+            raise
 
-            self.set_status(f"✓ {script_name} completed", "success")
+        except Exception as e:
+            error = e
+            self._report_failure(job, e)
+            raise
+
+        finally:
+            job.output.close()
+            if usage is not None:
+                job.resources = usage.stop()
+            self._record_run(job, run_start, spawned_at, error, result)
+
+    def _record_run(self, job, run_start, spawned_at, error, result):
+        """Add a finished run to the metrics and the run history"""
+        from launcher.history import Run
+        from launcher.metrics import run_status
+
+        timings = {
+            "queue_wait": job.started - job.created,
+            "spawn": spawned_at[0] - run_start if spawned_at else None,
+            "first_output": job.output.first_output,
+            "wall": time.monotonic() - run_start,
+        }
+        self.metrics.record_run(
+            job.script_name, run_status(error, job.cancelled), **timings
+        )
+        spill_path = job.output.spill_path
+        run = Run.from_job(
+            job,
+            "gui",
+            error,
+            result,
+            output_path=str(spill_path) if spill_path else None,
+            **timings,
+        )
+        if self.runlog is not None:
+            run.output_path = self.runlog.finish(job, run)
+        self.history.record(run)
+        if self._closing:
+            self.metrics.write_file(self.metrics_file)
+        else:
+            self.pump.post("metrics", self._publish_metrics)
+
+    def _record_step(self, step):
+        """Add one finished step of a macro to the metrics and the run history"""
+        self.metrics.record_run(
+            step.script.name,
+            step.status,
+            first_output=step.first_output,
+            wall=step.wall,
+        )
+        self.history.record(step.run("macro"))
 
-            self.root.after(
-                0,
-                lambda: messagebox.showinfo(
-                    "Success", f"{script_name} completed successfully!"
-                ),
-            )
+    def _publish_metrics(self):
+        # Coalesced by the pump; the file and the history are for other threads
+        self.aio.loop.run_in_executor(None, self.metrics.write_file, self.metrics_file)
+        self.stats_table.refresh()
+
+    def _report_failure(self, job, error):
+        import subprocess
+
+        from launcher.macros import MacroFailed
 
-        except subprocess.TimeoutExpired:
+        script_name = job.script_name
+
+        if job.cancelled:
+            self.set_status(f"✗ {script_name} cancelled", "ready")
+
+        elif isinstance(error, subprocess.TimeoutExpired):
             self.set_status(f"✗ {script_name} timed out", "error")
-            self.root.after(
-                0,
-                lambda: messagebox.showerror(
-                    "Timeout", f"{script_name} exceeded 60 seconds"
-                ),
-            )
+            self.notify("error", "Timeout", f"{script_name} exceeded 60 seconds")
 
-        except subprocess.CalledProcessError:
+        elif isinstance(error, MacroFailed):
+            self.set_status(f"✗ {script_name}: {error}", "error")
+            self.notify("error", "Failed", f"{script_name}: {error}")
+
+        elif isinstance(error, subprocess.CalledProcessError):
             self.set_status(f"✗ {script_name} failed", "error")
-            self.root.after(
-                0,
-                lambda: messagebox.showerror("Failed", f"{script_name} failed"),
-            )
+            self.notify("error", "Failed", f"{script_name} failed")
 
-        except Exception as e:
+        else:
             self.set_status(f"✗ Error in {script_name}", "error")
-            self.root.after(
-                0,
-                lambda: messagebox.showerror("Error", f"{script_name} error:\n{e}"),
-            )
+            self.notify("error", "Error", f"{script_name} error:\n{error}")
 
 
 def main():
     root = tk.Tk()
-    ScriptLauncher(root)
-    root.mainloop()
+    launcher = ScriptLauncher(root)
+
+    # Let Tk map and draw the navigation screen before loading anything else
+    root.update()
+    STARTUP.mark("first_paint")
+    root.after(1, launcher.finish_startup)
+
+    try:
+        root.mainloop()
+    finally:
+        launcher.shutdown()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,213 @@
+"""Benchmarks for the launcher's hot paths
+
+Run from the repository root:
+
+    python -m benchmarks                      # run everything, compare to baseline
+    python -m benchmarks -k category          # only cases whose name matches
+    python -m benchmarks --save-baseline      # record this run as the baseline
+
+Tk is faked and subprocess/webbrowser are stubbed, so this runs headless and
+starts nothing; pass --real-tk to build real widgets (needs a display, e.g.
+xvfb-run). Exits 1 when a case regressed against the baseline.
+"""
+
+import argparse
+import fnmatch
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+
+RESULTS_DIR = BASE_DIR / ".cache" / "benchmarks"
+LATEST_FILE = RESULTS_DIR / "latest.json"
+BASELINE_FILE = RESULTS_DIR / "baseline.json"
+
+RESULTS_VERSION = 1
+
+# A case regressed when its median is this much slower than the baseline's,
+# and by more than a floor that absorbs timer noise on sub-millisecond cases
+REGRESSION_FACTOR = 1.25
+REGRESSION_MIN_MS = 0.05
+
+
+def _percentile(ordered, fraction):
+    index = min(len(ordered) - 1, max(0, round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def summarize(samples) -> dict:
+    ordered = sorted(s * 1000 for s in samples)
+    return {
+        "runs": len(ordered),
+        "min_ms": ordered[0],
+        "median_ms": statistics.median(ordered),
+        "p95_ms": _percentile(ordered, 0.95),
+        "max_ms": ordered[-1],
+    }
+
+
+def _git_commit():
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=BASE_DIR,
+            capture_output=True,
+            text=True,
+            timeout=5,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return result.stdout.strip() or None
+
+
+def run_cases(names, harness, repeat, warmup) -> dict:
+    from benchmarks.cases import CASES
+
+    results = {}
+    for name in names:
+        CASES[name](harness, warmup)
+        results[name] = summarize(CASES[name](harness, repeat))
+        print(
+            f"  {name:<32} {results[name]['median_ms']:9.3f} ms"
+            f"  (p95 {results[name]['p95_ms']:.3f})",
+            file=sys.stderr,
+        )
+    return results
+
+
+def compare(results, baseline, factor) -> list:
+    """Names of cases whose median regressed against ``baseline``"""
+    regressed = []
+    print(
+        f"\n  {'case':<32} {'median ms':>10} {'baseline':>10} {'change':>8}",
+        file=sys.stderr,
+    )
+    for name, result in results.items():
+        previous = baseline.get("results", {}).get(name)
+        if previous is None:
+            print(
+                f"  {name:<32} {result['median_ms']:10.3f} {'-':>10}", file=sys.stderr
+            )
+            continue
+        now, then = result["median_ms"], previous["median_ms"]
+        change = (now / then - 1) * 100 if then else 0.0
+        flag = ""
+        if now > then * factor and now - then > REGRESSION_MIN_MS:
+            regressed.append(name)
+            flag = "  REGRESSED"
+        print(
+            f"  {name:<32} {now:10.3f} {then:10.3f} {change:+7.1f}%{flag}",
+            file=sys.stderr,
+        )
+    return regressed
+
+
+def _write(path, data):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+        f.write("\n")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks", description="Benchmark the launcher's hot paths"
+    )
+    parser.add_argument(
+        "-k", dest="pattern", default="*", help="only cases matching this glob"
+    )
+    parser.add_argument("--list", action="store_true", help="list cases and exit")
+    parser.add_argument("-n", "--repeat", type=int, default=30)
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--output", type=Path, default=LATEST_FILE)
+    parser.add_argument("--baseline", type=Path, default=BASELINE_FILE)
+    parser.add_argument(
+        "--save-baseline",
+        action="store_true",
+        help="write the results to the baseline file instead of comparing",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=REGRESSION_FACTOR,
+        help=f"slowdown factor that counts as a regression (default {REGRESSION_FACTOR})",
+    )
+    parser.add_argument(
+        "--real-tk", action="store_true", help="use real Tk widgets (needs a display)"
+    )
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+
+    # Fakes go in before anything imports tkinter or starts a process
+    from benchmarks import stubs
+
+    if args.real_tk:
+        import tkinter as tk
+    else:
+        tk = stubs.install_fake_tk()
+    from benchmarks.cases import CASES, Harness
+
+    names = [name for name in CASES if fnmatch.fnmatchcase(name, f"*{args.pattern}*")]
+    if args.list:
+        print("\n".join(names))
+        return 0
+    if not names:
+        print(f"No benchmark matches {args.pattern!r}", file=sys.stderr)
+        return 2
+
+    meta = {
+        "version": RESULTS_VERSION,
+        "time": time.time(),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "tk": "real" if args.real_tk else "fake",
+        "repeat": args.repeat,
+    }
+    harness = Harness(tk)
+    print(f"Running {len(names)} benchmarks ({meta['tk']} Tk)", file=sys.stderr)
+    try:
+        with stubs.stub_process_backends():
+            results = run_cases(names, harness, args.repeat, args.warmup)
+    finally:
+        harness.close()
+
+    data = {**meta, "results": results}
+    _write(args.output, data)
+    if args.save_baseline:
+        _write(args.baseline, data)
+        print(f"\nSaved baseline to {args.baseline}", file=sys.stderr)
+        return 0
+
+    try:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+    except (OSError, ValueError):
+        print(f"\nNo baseline at {args.baseline}; see --save-baseline", file=sys.stderr)
+        return 0
+    if baseline.get("tk") != meta["tk"]:
+        print(
+            "\nBaseline was recorded with a different Tk; not comparing",
+            file=sys.stderr,
+        )
+        return 0
+
+    regressed = compare(results, baseline, args.tolerance)
+    if regressed:
+        print(f"\n{len(regressed)} benchmark(s) regressed", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,580 @@
+import contextlib
+import dataclasses
+import functools
+import importlib.util
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.stubs import FakeTk, StubAsyncPool, run_until
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+# Registry sizes for the parameterised cases
+SIZES = (10, 100, 1000)
+
+# name -> function(harness, repeat) returning a list of seconds
+CASES = {}
+
+
+def case(name):
+    def register(func):
+        CASES[name] = func
+        return func
+
+    return register
+
+
+def timed(action, repeat, setup=None, teardown=None) -> list:
+    """Wall time of ``repeat`` calls to ``action``; ``setup()`` and
+    ``teardown(result)`` run around each call, outside the measurement"""
+    samples = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        result = action()
+        samples.append(time.perf_counter() - start)
+        if teardown:
+            teardown(result)
+    return samples
+
+
+def synthetic_registry(size, category="coding") -> dict:
+    from launcher.config import ScriptEntry
+
+    return {
+        category: tuple(
+            ScriptEntry(f"Script {i:04d}", f"bench.script_{i:04d}", category)
+            for i in range(size)
+        )
+    }
+
+
+def synthetic_scripts_list(size) -> str:
+    categories = ("coding", "finances", "morning", "study", "planning")
+    data = {category: [] for category in categories}
+    for i in range(size):
+        data[categories[i % len(categories)]].append(
+            {"name": f"Script {i:04d}", "module": f"bench.script_{i:04d}"}
+        )
+    return json.dumps(data)
+
+
+def write_script_tree(root: Path, size):
+    """A scripts package of ``size`` modules spread over five subpackages"""
+    (root / "__init__.py").parent.mkdir(parents=True, exist_ok=True)
+    (root / "__init__.py").write_text("")
+    for i in range(size):
+        package = root / f"group_{i % 5}"
+        package.mkdir(exist_ok=True)
+        (package / "__init__.py").write_text("")
+        (package / f"script_{i:04d}.py").write_text(
+            f'SCRIPT_INFO = {{"name": "Script {i:04d}"}}\n\n\n'
+            "def main():\n"
+            "    print('hello')\n\n\n"
+            'if __name__ == "__main__":\n'
+            "    main()\n"
+        )
+
+
+class Harness:
+    """Shared state for the cases: a scratch directory, the launcher's GUI
+    module and the settings that keep runs out of the real .cache"""
+
+    def __init__(self, tk):
+        import launcher.apps
+        import launcher.config
+
+        self.tk = tk
+        self.tmp = Path(tempfile.mkdtemp(prefix="launcher-bench-"))
+        launcher.config.CACHE_DIR = self.tmp / "cache"
+        launcher.apps.registry.path = self.tmp / "apps.json"
+        os.environ.update(
+            {
+                "LAUNCHER_POOL_SIZE": "0",
+                "LAUNCHER_METRICS_PORT": "",
+                "LAUNCHER_METRICS_FILE": str(self.tmp / "metrics.prom"),
+                "LAUNCHER_HISTORY_DB": str(self.tmp / "history.db"),
+                "LAUNCHER_LOG_DIR": str(self.tmp / "logs"),
+                "LAUNCHER_SPILL_OUTPUT": "0",
+                "BROWSER_OPEN_RATE": "0",
+            }
+        )
+        self.app_module = self._load_app()
+        self.app_module.STARTUP_HISTORY = self.tmp / "startup.jsonl"
+
+    @staticmethod
+    def _load_app():
+        """The GUI module (the package's __main__.py) under an importable name"""
+        spec = importlib.util.spec_from_file_location(
+            "launcher_app", BASE_DIR / "__main__.py"
+        )
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[spec.name] = module
+        spec.loader.exec_module(module)
+        return module
+
+    def new_root(self):
+        return self.tk.Tk()
+
+    def close_root(self, root):
+        if not isinstance(root, FakeTk):
+            root.destroy()
+
+    def new_app(self, ready=True):
+        root = self.new_root()
+        app = self.app_module.ScriptLauncher(root)
+        if ready:
+            app.finish_startup()
+        return app
+
+    def close_app(self, app):
+        app.shutdown()
+        self.close_root(app.root)
+
+    def close(self):
+        import shutil
+
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+
+@contextlib.contextmanager
+def _app(harness, **kwargs):
+    app = harness.new_app(**kwargs)
+    try:
+        yield app
+    finally:
+        harness.close_app(app)
+
+
+@case("startup.first_paint")
+def startup_first_paint(harness, repeat):
+    return timed(
+        lambda: harness.new_app(ready=False), repeat, teardown=harness.close_app
+    )
+
+
+@case("startup.ready")
+def startup_ready(harness, repeat):
+    return timed(harness.new_app, repeat, teardown=harness.close_app)
+
+
+@case("navigation.build")
+def navigation_build(harness, repeat):
+    with _app(harness) as app:
+
+        def setup():
+            app._pages.pop("navigation").destroy()
+            app.current_page = None
+
+        return timed(app.show_navigation, repeat, setup=setup)
+
+
+def category_build(size, harness, repeat):
+    registry = synthetic_registry(size)
+    key = ("category", "coding")
+    with _app(harness) as app:
+        app.scripts = registry
+        app.load_scripts = lambda: registry
+        app._index_scripts()
+
+        def setup():
+            page = app._pages.pop(key, None)
+            if page is not None:
+                page.destroy()
+            app.show_navigation()
+
+        return timed(
+            lambda: app.show_category("coding", "💻 Coding"), repeat, setup=setup
+        )
+
+
+def parse_scripts(size, harness, repeat):
+    from launcher.config import parse_scripts
+
+    raw = synthetic_scripts_list(size)
+    return timed(lambda: parse_scripts(raw), repeat)
+
+
+def load_config(mode, harness, repeat):
+    from launcher import config
+
+    env_file = harness.tmp / "bench.env"
+    if not env_file.exists():
+        env_file.write_text(f"SCRIPTS_LIST='{synthetic_scripts_list(100)}'\n")
+    env_file = env_file.resolve()
+    cache = config._cache_path(env_file)
+
+    def setup():
+        if mode != "warm":
+            config._loaded.pop(env_file, None)
+        if mode == "cold":
+            cache.unlink(missing_ok=True)
+
+    config.load_config(env_file)
+    return timed(lambda: config.load_config(env_file), repeat, setup=setup)
+
+
+def discover_scripts(mode, size, harness, repeat):
+    from launcher.discovery import discover_scripts
+
+    root = harness.tmp / f"scripts_{size}"
+    if not root.exists():
+        write_script_tree(root, size)
+    index = harness.tmp / f"index-{size}.json"
+
+    def setup():
+        if mode == "cold":
+            index.unlink(missing_ok=True)
+
+    discover_scripts(root, index)
+    return timed(lambda: discover_scripts(root, index), repeat, setup=setup)
+
+
+for size in SIZES:
+    CASES[f"category.build[{size}]"] = functools.partial(category_build, size)
+for size in SIZES:
+    CASES[f"scripts.parse[{size}]"] = functools.partial(parse_scripts, size)
+for mode in ("cold", "cached", "warm"):
+    CASES[f"config.load.{mode}"] = functools.partial(load_config, mode)
+for mode in ("cold", "warm"):
+    CASES[f"scripts.discover.{mode}[100]"] = functools.partial(
+        discover_scripts, mode, 100
+    )
+
+
+def _dispatch(harness, repeat, until_done):
+    from launcher.jobs import FINISHED_STATES
+
+    with _app(harness) as app:
+        pool = app.pool = StubAsyncPool()
+        # The stub pool runs anything, so the script needn't exist
+        (script,) = synthetic_registry(1)["coding"]
+        samples = []
+        for _ in range(repeat):
+            runs = len(pool.started)
+            start = time.perf_counter()
+            app.run_script(script.name, script.module, script.category)
+            job = app.jobs.jobs()[0]
+            if until_done:
+                run_until(app.root, lambda: job.state in FINISHED_STATES)
+                samples.append(time.perf_counter() - start)
+            else:
+                run_until(app.root, lambda: len(pool.started) > runs)
+                samples.append(pool.started[-1] - start)
+                run_until(app.root, lambda: job.state in FINISHED_STATES)
+        return samples
+
+
+@case("dispatch.run_script")
+def dispatch_run_script(harness, repeat):
+    """Click to the run reaching the worker pool"""
+    return _dispatch(harness, repeat, until_done=False)
+
+
+@case("dispatch.complete")
+def dispatch_complete(harness, repeat):
+    """Click to the job finishing, with a run that returns straight away"""
+    return _dispatch(harness, repeat, until_done=True)
+
+
+@case("dispatch.macro[3]")
+def dispatch_macro(harness, repeat):
+    """Click to a macro of one step then a parallel pair finishing"""
+    from launcher.jobs import FINISHED_STATES
+    from launcher.macros import parse_macros
+
+    registry = synthetic_registry(3)
+    steps = [script.module for script in registry["coding"]]
+    macros = parse_macros(
+        json.dumps([{"name": "Routine", "steps": [steps[0], steps[1:]]}])
+    )
+    with _app(harness) as app:
+        app.pool = StubAsyncPool()
+        app.load_scripts = lambda: registry
+        app.config = dataclasses.replace(app.config, macros=macros)
+        macro = macros["Routine"]
+        samples = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            app.run_script(macro.name, macro.module, macro.category)
+            job = app.jobs.jobs()[0]
+            run_until(app.root, lambda: job.state in FINISHED_STATES)
+            samples.append(time.perf_counter() - start)
+        return samples
+
+
+@case("dispatch.burst[50]")
+def dispatch_burst(harness, repeat):
+    """Fifty clicks at once until every job finished, UI updates included"""
+    from launcher.jobs import FINISHED_STATES
+
+    scripts = synthetic_registry(50)["coding"]
+    with _app(harness) as app:
+        app.pool = StubAsyncPool()
+        samples = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for script in scripts:
+                app.run_script(script.name, script.module, script.category)
+            jobs = app.jobs.jobs()[: len(scripts)]
+            run_until(
+                app.root,
+                lambda: all(job.state in FINISHED_STATES for job in jobs)
+                and not app.pump._pending,
+            )
+            samples.append(time.perf_counter() - start)
+        return samples
+
+
+def _workspace(harness):
+    from template.workspace import WorkspaceEnvironment
+
+    path = harness.tmp / "workspace"
+    path.mkdir(exist_ok=True)
+    (path / "notes.md").write_text("")
+    os.environ["BENCH_WEBSITES"] = json.dumps(
+        [f"https://example.com/{i}" for i in range(5)]
+    )
+
+    class BenchWorkspace(WorkspaceEnvironment):
+        kind = "benchmark"
+
+        def get_workspace_path(self):
+            return str(path)
+
+    return BenchWorkspace(harness.tmp / "bench.env").workspace(
+        editor=True,
+        file_manager=True,
+        websites="BENCH_WEBSITES",
+        documents=("notes.md",),
+    )
+
+
+def workspace_launch(reuse, harness, repeat):
+    os.environ["LAUNCHER_REUSE_APPS"] = "1" if reuse else "0"
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            workspace = _workspace(harness)
+            workspace.run()  # leaves the apps registered for the reuse case
+            return timed(workspace.run, repeat)
+    finally:
+        del os.environ["LAUNCHER_REUSE_APPS"]
+
+
+CASES["workspace.launch.fresh"] = functools.partial(workspace_launch, False)
+CASES["workspace.launch.reuse"] = functools.partial(workspace_launch, True)
+
+
+def write_transactions(path: Path, rows):
+    symbols = [f"SYM{i}" for i in range(40)]
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("Date,Symbol,Action,Quantity,Price,Fees\n")
+        for i in range(rows):
+            action = "Sell" if i % 4 == 3 else "Buy"
+            f.write(
+                f"2020-01-01,{symbols[i % 40]},{action},{i % 7 + 1},{50 + i % 90}.25,1\n"
+            )
+
+
+def portfolio_summary(mode, rows, harness, repeat):
+    from launcher import portfolio
+
+    portfolio.CACHE_DIR = harness.tmp / "cache"
+    path = harness.tmp / f"transactions-{rows}.csv"
+    if not path.exists():
+        write_transactions(path, rows)
+
+    def setup():
+        portfolio._memory.clear()
+        if mode == "cold":
+            portfolio._cache_path(path).unlink(missing_ok=True)
+
+    portfolio.load_summary(path)
+    return timed(lambda: portfolio.load_summary(path), repeat, setup=setup)
+
+
+for mode in ("cold", "cached"):
+    CASES[f"portfolio.summary.{mode}[20000]"] = functools.partial(
+        portfolio_summary, mode, 20000
+    )
+
+
+def _history_store(harness, rows):
+    """A run store holding ``rows`` runs of 50 scripts over the past year"""
+    from launcher import history
+
+    path = harness.tmp / f"history-{rows}.db"
+    if not path.exists():
+        conn = history.connect(path)
+        with conn:
+            conn.executescript(history.SCHEMA)
+            now = time.time()
+            conn.executemany(
+                history._INSERT,
+                (
+                    history._row(
+                        history.Run(
+                            f"Script {i % 50}",
+                            f"scripts_list.script_{i % 50}",
+                            "coding",
+                            "gui",
+                            "failed" if i % 20 == 0 else "success",
+                            1 if i % 20 == 0 else 0,
+                            now - 360 * 86400 * (1 - i / rows),
+                            finished_at=now - 360 * 86400 * (1 - i / rows) + 1,
+                            wall=1.0,
+                            cpu_time=0.5,
+                            peak_rss=(40 + i % 7) * 2**20,
+                            read_bytes=0,
+                            write_bytes=4096,
+                        )
+                    )
+                    for i in range(rows)
+                ),
+            )
+        conn.close()
+    return history.RunStore(path)
+
+
+def history_query(query, rows, harness, repeat):
+    from launcher.history import week_start
+
+    store = _history_store(harness, rows)
+    action = {
+        "last_runs": lambda: store.last_runs("scripts_list.script_7", 20),
+        "failures_week": lambda: store.failures(week_start()),
+        "stats": store.stats,
+        "resource_trends": lambda: store.resource_trends(20),
+    }[query]
+    try:
+        return timed(action, repeat)
+    finally:
+        store.close()
+
+
+@case("history.record")
+def history_record(harness, repeat):
+    from launcher.history import Run
+
+    store = _history_store(harness, 0)
+    run = Run("Script", "scripts_list.script", "coding", "gui", "success")
+    try:
+        return timed(lambda: store.record(run), repeat)
+    finally:
+        store.close()
+
+
+for query in ("last_runs", "failures_week", "stats", "resource_trends"):
+    CASES[f"history.{query}[100000]"] = functools.partial(history_query, query, 100000)
+
+
+@case("schedule.next_after")
+def schedule_next_after(harness, repeat):
+    from datetime import datetime
+
+    from launcher.cron import CronExpression
+
+    cron = CronExpression("30 7 * * mon-fri")
+    now = datetime.now()
+    return timed(lambda: cron.next_after(now), repeat)
+
+
+@case("schedule.run_due[1000]")
+def schedule_run_due(harness, repeat):
+    """One due entry among a thousand, including saving the schedule state"""
+    from launcher.cron import CronScheduler, parse_schedule
+
+    entries = parse_schedule(
+        json.dumps(
+            [
+                {"name": f"e{i}", "cron": f"{i % 60} {i // 60} * * *", "run": "x"}
+                for i in range(1000)
+            ]
+        )
+    )
+    cron = CronScheduler(
+        lambda entry: [],
+        state_path=harness.tmp / "schedule-state.json",
+        lock_path=harness.tmp / "schedule.lock",
+    )
+    cron.update(entries)
+    try:
+        return timed(lambda: cron.run_due(cron.next_due()), repeat)
+    finally:
+        cron.close()
+
+
+@case("resources.sample")
+def resources_sample(harness, repeat):
+    """One sampling pass over a process tree, as the monitor thread takes
+    every interval"""
+    import os
+
+    from launcher.resources import _trees
+
+    root = os.getpid() if os.name == "nt" else os.getpgrp()
+    known = {}
+    return timed(lambda: _trees([root], known), repeat)
+
+
+class _LogJob:
+    def __init__(self, job_id):
+        self.id = job_id
+
+
+@case("runlog.write")
+def runlog_write(harness, repeat):
+    """Queueing one line of output, as a runner thread does per chunk"""
+    from launcher.runlog import RunLog
+
+    log = RunLog(harness.tmp / "runlog-write")
+    job = _LogJob(1)
+    line = "x" * 79 + "\n"
+    try:
+        return timed(lambda: log.write(job, line), repeat)
+    finally:
+        log.close()
+
+
+@case("runlog.read[2000]")
+def runlog_read(harness, repeat):
+    """One run's output out of 2000 runs spread over compressed segments"""
+    from launcher.history import Run
+    from launcher.runlog import RunLog, read_run
+
+    directory = harness.tmp / "runlog-read"
+    log = RunLog(directory, segment_bytes=256 * 1024)
+    now = time.time()
+    keys = []
+    for i in range(2000):
+        job = _LogJob(i)
+        log.write(job, f"line of output from run {i}\n" * 40)
+        keys.append(
+            log.finish(
+                job,
+                Run(
+                    "Script",
+                    "scripts_list.script",
+                    "coding",
+                    "gui",
+                    "success",
+                    0,
+                    now,
+                    now,
+                    now,
+                ),
+            )
+        )
+    log.close()
+    # Seal the last segment too, and wait for the background compression
+    RunLog(directory).close()
+    while any(directory.glob("*.log")):
+        time.sleep(0.01)
+    key = keys[len(keys) // 3]
+    return timed(lambda: read_run(directory, key), repeat)
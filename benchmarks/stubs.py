@@ -0,0 +1,371 @@
+import asyncio
+import contextlib
+import heapq
+import io
+import itertools
+import os
+import subprocess
+import sys
+import time
+import types
+import webbrowser
+
+
+class TclError(Exception):
+    pass
+
+
+def _noop(*args, **kwargs):
+    return None
+
+
+class FakeWidget:
+    """Stands in for any Tk widget: keeps options and children, draws nothing
+
+    Methods the launcher calls but that only matter on screen (pack, bind,
+    focus_set, ...) are accepted and ignored.
+    """
+
+    WIDTH = 580
+    HEIGHT = 600
+    REQ_HEIGHT = 40
+
+    def __init__(self, master=None, cnf=None, **kw):
+        self.master = master
+        self.children = {}
+        self._options = {**(cnf or {}), **kw}
+        self._root = master._root if master is not None else self
+        if master is not None:
+            master.children[id(self)] = self
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return _noop
+
+    def __getitem__(self, key):
+        return self._options.get(key, "")
+
+    def __setitem__(self, key, value):
+        self._options[key] = value
+
+    def configure(self, cnf=None, **kw):
+        self._options.update(cnf or {}, **kw)
+
+    config = configure
+
+    def cget(self, key):
+        return self._options.get(key, "")
+
+    def destroy(self):
+        for child in list(self.children.values()):
+            child.destroy()
+        if self.master is not None:
+            self.master.children.pop(id(self), None)
+
+    def winfo_children(self):
+        return list(self.children.values())
+
+    def winfo_exists(self):
+        return True
+
+    def winfo_width(self):
+        return self.WIDTH
+
+    def winfo_height(self):
+        return self.HEIGHT
+
+    def winfo_reqwidth(self):
+        return self.WIDTH
+
+    def winfo_reqheight(self):
+        return self.REQ_HEIGHT
+
+    def after(self, ms, func=None, *args):
+        return self._root.after(ms, func, *args)
+
+    def after_idle(self, func, *args):
+        return self._root.after(0, func, *args)
+
+    def after_cancel(self, after_id):
+        self._root.after_cancel(after_id)
+
+
+class FakeTk(FakeWidget):
+    """Root window whose ``after`` timers run on a virtual clock
+
+    Nothing fires on its own: ``run_until`` runs due timers in order, jumping
+    the clock forward instead of sleeping, so what gets measured is the
+    launcher's own work rather than Tk's scheduling delays.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__()
+        self.now = 0.0
+        self._timers = []
+        self._cancelled = set()
+        self._ids = itertools.count(1)
+
+    def after(self, ms, func=None, *args):
+        if func is None:
+            self.now += ms / 1000
+            return None
+        after_id = f"after#{next(self._ids)}"
+        heapq.heappush(self._timers, (self.now + ms / 1000, after_id, func, args))
+        return after_id
+
+    def after_cancel(self, after_id):
+        self._cancelled.add(after_id)
+
+    def run_until(self, predicate, max_timers=100_000) -> bool:
+        """Fire timers until ``predicate()`` holds; False if it never did"""
+        for _ in range(max_timers):
+            if predicate():
+                return True
+            if not self._timers:
+                return False
+            due, after_id, func, args = heapq.heappop(self._timers)
+            if after_id in self._cancelled:
+                self._cancelled.discard(after_id)
+                continue
+            self.now = max(self.now, due)
+            func(*args)
+        return predicate()
+
+
+class FakeVariable:
+    def __init__(self, master=None, value=None, name=None):
+        self._value = value
+
+    def get(self):
+        return self._value
+
+    def set(self, value):
+        self._value = value
+
+    def trace_add(self, mode, callback):
+        return "trace"
+
+
+class FakeTreeview(FakeWidget):
+    def __init__(self, master=None, **kw):
+        super().__init__(master, **kw)
+        self._items = {}
+
+    def insert(self, parent, index, iid=None, **kw):
+        iid = iid if iid is not None else f"I{len(self._items) + 1}"
+        self._items[iid] = kw
+        return iid
+
+    def item(self, iid, **kw):
+        self._items.setdefault(iid, {}).update(kw)
+
+    def delete(self, *iids):
+        for iid in iids:
+            self._items.pop(iid, None)
+
+    def exists(self, iid):
+        return iid in self._items
+
+    def get_children(self, item=""):
+        return tuple(self._items)
+
+    def selection(self):
+        return ()
+
+
+def _module(name, **attrs):
+    module = types.ModuleType(name)
+    module.__dict__.update(attrs)
+    return module
+
+
+def install_fake_tk():
+    """Register fake tkinter, tkinter.ttk and tkinter.messagebox modules
+
+    Must run before anything imports tkinter, so the launcher's widget classes
+    subclass the fakes.
+    """
+    if "tkinter" in sys.modules and not getattr(sys.modules["tkinter"], "FAKE", False):
+        raise RuntimeError("the real tkinter was imported before the fake")
+
+    widgets = {
+        name: type(name, (FakeWidget,), {})
+        for name in (
+            "Button",
+            "Canvas",
+            "Entry",
+            "Frame",
+            "Label",
+            "Listbox",
+            "PanedWindow",
+            "Scrollbar",
+            "Text",
+            "Toplevel",
+        )
+    }
+    variables = {
+        name: type(name, (FakeVariable,), {})
+        for name in ("StringVar", "IntVar", "DoubleVar", "BooleanVar")
+    }
+    messagebox = _module(
+        "tkinter.messagebox",
+        showinfo=_noop,
+        showwarning=_noop,
+        showerror=_noop,
+        askyesno=lambda *a, **k: True,
+        askokcancel=lambda *a, **k: True,
+    )
+    ttk = _module(
+        "tkinter.ttk",
+        Treeview=FakeTreeview,
+        Style=type("Style", (FakeWidget,), {}),
+        Progressbar=type("Progressbar", (FakeWidget,), {}),
+        **{name: widgets[name] for name in ("Button", "Entry", "Frame", "Label")},
+        Scrollbar=widgets["Scrollbar"],
+    )
+    tkinter = _module(
+        "tkinter",
+        FAKE=True,
+        Tk=FakeTk,
+        TclError=TclError,
+        Misc=FakeWidget,
+        Widget=FakeWidget,
+        END="end",
+        INSERT="insert",
+        messagebox=messagebox,
+        ttk=ttk,
+        **widgets,
+        **variables,
+    )
+    sys.modules.update(
+        {"tkinter": tkinter, "tkinter.ttk": ttk, "tkinter.messagebox": messagebox}
+    )
+    return tkinter
+
+
+def run_until(root, predicate, timeout=10.0) -> bool:
+    """Let ``root`` process events until ``predicate()`` holds"""
+    if isinstance(root, FakeTk):
+        return root.run_until(predicate)
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            return False
+        root.update()
+    return True
+
+
+# Above the largest pid Linux hands out, so killing it can never hit anything
+UNUSED_PID = (1 << 22) + 1
+
+
+class StubPopen:
+    """subprocess.Popen that starts nothing and has already exited with 0
+
+    Its pid is the benchmark's own, so anything that checks whether the
+    process is alive (the app registry) sees a live process.
+    """
+
+    launched = []
+
+    def __init__(self, args, *popen_args, **kwargs):
+        self.args = args
+        self.pid = os.getpid()
+        self.returncode = 0
+        self.stdin = self.stdout = self.stderr = None
+        if kwargs.get("stdin") == subprocess.PIPE:
+            self.stdin = io.StringIO()
+        StubPopen.launched.append(args)
+
+    def poll(self):
+        return self.returncode
+
+    def wait(self, timeout=None):
+        return self.returncode
+
+    def communicate(self, input=None, timeout=None):
+        return "", ""
+
+    def send_signal(self, sig):
+        pass
+
+    terminate = kill = send_signal
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+def _stub_run(args, *popen_args, **kwargs):
+    StubPopen.launched.append(args)
+    return subprocess.CompletedProcess(args, 0, "", "")
+
+
+def _stub_open(url, *args, **kwargs):
+    StubPopen.launched.append(["webbrowser", url])
+    return True
+
+
+def _no_browser(*args, **kwargs):
+    raise webbrowser.Error("stubbed for benchmarks")
+
+
+@contextlib.contextmanager
+def stub_process_backends():
+    """Replace subprocess and webbrowser so nothing outside this process starts"""
+    patches = [
+        (subprocess, "Popen", StubPopen),
+        (subprocess, "run", _stub_run),
+        (webbrowser, "open", _stub_open),
+        (webbrowser, "open_new", _stub_open),
+        (webbrowser, "open_new_tab", _stub_open),
+        (webbrowser, "get", _no_browser),
+    ]
+    saved = [(obj, name, getattr(obj, name)) for obj, name, _ in patches]
+    for obj, name, value in patches:
+        setattr(obj, name, value)
+    try:
+        yield
+    finally:
+        for obj, name, value in saved:
+            setattr(obj, name, value)
+
+
+class StubAsyncPool:
+    """AsyncWorkerPool stand-in whose runs finish as soon as they start
+
+    ``started`` holds the perf_counter() time each run reached the pool.
+    """
+
+    def __init__(self):
+        self.started = []
+
+    async def run(self, module_path, timeout=None, on_start=None, on_output=None):
+        self.started.append(time.perf_counter())
+        args = [sys.executable, "-m", module_path]
+        if on_start:
+            process = StubPopen(args)
+            process.pid = UNUSED_PID  # cancelling a run kills its process group
+            on_start(process)
+        if on_output:
+            on_output(f"ran {module_path}\n")
+        await asyncio.sleep(0)
+        return subprocess.CompletedProcess(args, 0, "", "")
+
+    def is_prepared(self, module_path):
+        return False
+
+    def prepare(self, module_path):
+        return False
+
+    def cancel_preparation(self, module_path):
+        pass
+
+    def reset(self, env=None):
+        pass
+
+    async def shutdown(self):
+        pass
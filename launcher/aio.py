@@ -0,0 +1,522 @@
+import asyncio
+import codecs
+import json
+import os
+import subprocess
+import sys
+
+from launcher.jobs import CANCELLED, DONE, FAILED, FINISHED_STATES, JobScheduler
+from launcher.pool import (
+    NEW_GROUP,
+    OUTPUT_DRAIN_TIMEOUT,
+    WorkerCrashed,
+    child_env,
+    kill_tree,
+)
+
+# Longest protocol line accepted from a worker; an output event carries up to
+# 64 KiB of JSON-escaped text
+STREAM_LIMIT = 1 << 22
+
+
+def new_event_loop():
+    """Event loop whose subprocesses cost no helper threads where possible"""
+    loop = asyncio.new_event_loop()
+    if (
+        sys.platform != "win32"
+        and sys.version_info < (3, 12)
+        and hasattr(os, "pidfd_open")
+    ):
+        # The default child watcher parks one thread per child in waitpid()
+        watcher = asyncio.PidfdChildWatcher()
+        watcher.attach_loop(loop)
+        asyncio.set_child_watcher(watcher)
+    return loop
+
+
+class TkEventLoop:
+    """Drives an asyncio event loop in short slices from Tk's mainloop
+
+    Each slice polls I/O without blocking and runs whatever is ready, so
+    coroutines and their callbacks execute on the Tk thread and may touch
+    widgets directly. Slices come every ``BUSY_MS`` while tasks are in flight
+    and every ``IDLE_MS`` otherwise; ``wake()`` runs one right away.
+    """
+
+    BUSY_MS = 5
+    IDLE_MS = 50
+
+    def __init__(self, root):
+        self.root = root
+        self.loop = new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self._after = None
+        self._closed = False
+
+    def start(self):
+        self._schedule(0)
+
+    def wake(self):
+        """Run a slice as soon as Tk is idle, e.g. right after submitting work"""
+        if self._after is not None:
+            self.root.after_cancel(self._after)
+        self._schedule(0)
+
+    def create_task(self, coro):
+        task = self.loop.create_task(coro)
+        self.wake()
+        return task
+
+    def _schedule(self, delay):
+        if not self._closed:
+            self._after = self.root.after(delay, self._tick)
+
+    def _tick(self):
+        self._after = None
+        # A modal dialog opened from inside a slice re-enters Tk's event loop;
+        # the outer slice is still running, so just wait for it to finish
+        if not self.loop.is_running():
+            self.loop.call_soon(self.loop.stop)
+            self.loop.run_forever()
+        busy = any(not task.done() for task in asyncio.all_tasks(self.loop))
+        self._schedule(self.BUSY_MS if busy else self.IDLE_MS)
+
+    def close(self, final=None, timeout=5.0):
+        """Stop slicing, run ``final`` (e.g. a pool shutdown), cancel what's left"""
+        self._closed = True
+        if self._after is not None:
+            try:
+                self.root.after_cancel(self._after)
+            except Exception:
+                pass  # the root is already destroyed
+            self._after = None
+
+        loop = self.loop
+        if final is not None:
+            try:
+                loop.run_until_complete(asyncio.wait_for(final, timeout))
+            except (asyncio.TimeoutError, OSError):
+                pass
+        tasks = asyncio.all_tasks(loop)
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+        loop.run_until_complete(loop.shutdown_asyncgens())
+        loop.close()
+
+
+async def _pump(stream, on_output):
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    while True:
+        chunk = await stream.read(65536)
+        if not chunk:
+            break
+        data = decoder.decode(chunk)
+        if data:
+            on_output(data)
+
+
+class _AsyncWorker:
+    """A pre-started interpreter speaking the run-module protocol, driven by
+    coroutines instead of a reader thread"""
+
+    def __init__(self, process, generation):
+        self.process = process
+        self.generation = generation
+        self.runs = 0
+        # Processes the last run started; they live on in this worker's group
+        self.spawned = 0
+        self.ready = False
+        # Scripts this worker was asked to get ready for (see prepare())
+        self.prepared = set()
+
+    @classmethod
+    async def spawn(cls, cwd, env, generation=0):
+        process = await asyncio.create_subprocess_exec(
+            sys.executable,
+            "-m",
+            "launcher.worker",
+            cwd=cwd,
+            env=env,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+            limit=STREAM_LIMIT,
+            **NEW_GROUP,
+        )
+        return cls(process, generation)
+
+    def alive(self) -> bool:
+        return self.process.returncode is None
+
+    async def _next_message(self):
+        while True:
+            try:
+                line = await self.process.stdout.readline()
+            except (ValueError, asyncio.LimitOverrunError):
+                continue
+            if not line:
+                raise WorkerCrashed(f"worker {self.process.pid} exited unexpectedly")
+            try:
+                return json.loads(line)
+            except ValueError:
+                continue
+
+    async def run(self, module_path: str, on_output):
+        """Send a run request, stream its output and wait for the exit event"""
+        while not self.ready:
+            if (await self._next_message()).get("event") == "ready":
+                self.ready = True
+
+        self.runs += 1
+        request = {"module": module_path, "run": self.runs}
+        try:
+            self.process.stdin.write((json.dumps(request) + "\n").encode("utf-8"))
+            await self.process.stdin.drain()
+        except (OSError, ConnectionError):
+            raise WorkerCrashed(f"worker {self.process.pid} is gone") from None
+
+        while True:
+            message = await self._next_message()
+            if message.get("run") != self.runs:
+                # Late output from an earlier run's leftover processes
+                continue
+            if message.get("event") == "output":
+                on_output(message["data"])
+            elif message.get("event") == "exit":
+                self.spawned = message.get("spawned", 0)
+                return message["returncode"]
+
+    def _send(self, request):
+        """Queue a request without waiting; the worker being gone is ignored"""
+        try:
+            self.process.stdin.write((json.dumps(request) + "\n").encode("utf-8"))
+        except (OSError, ConnectionError):
+            pass
+
+    def prepare(self, module_path):
+        """Have the idle worker compile ``module_path`` and import its imports"""
+        self.prepared.add(module_path)
+        self._send({"cmd": "prepare", "module": module_path})
+
+    def cancel_prepare(self):
+        self._send({"cmd": "cancel"})
+
+    async def wait_prepared(self):
+        """Wait for the worker to report that a preparation has ended"""
+        while True:
+            event = (await self._next_message()).get("event")
+            if event == "ready":
+                self.ready = True
+            elif event == "prepared":
+                return
+
+    async def stop(self):
+        """Ask the worker to exit, killing it if it doesn't"""
+        try:
+            self.process.stdin.write(b'{"cmd": "exit"}\n')
+            self.process.stdin.close()
+            await asyncio.wait_for(self.process.wait(), 2)
+        except (OSError, ConnectionError, asyncio.TimeoutError):
+            await self.kill()
+
+    async def kill(self):
+        try:
+            self.process.kill()
+            await asyncio.wait_for(self.process.wait(), 2)
+        except (OSError, asyncio.TimeoutError):
+            pass
+
+
+class AsyncWorkerPool:
+    """asyncio counterpart of WorkerPool with the same protocol and recycling
+    rules; a run is a coroutine on ``loop`` and holds no thread while it waits
+
+    Cancelling a run kills its process tree, unless the pool has been shut
+    down: runs still in flight then are left to finish on their own, like the
+    threaded pool's busy workers.
+    """
+
+    def __init__(self, loop, cwd, size: int = 2, max_runs: int = 20, env=None):
+        self.loop = loop
+        self.cwd = cwd
+        self.size = size
+        self.max_runs = max_runs
+        self.env = child_env(env)
+        self._idle = []
+        # Workers taken out of _idle while they prepare, with the script
+        self._preparing = {}
+        self._closed = False
+        self._generation = 0
+        self._filling = None
+        # Strong references to fire-and-forget tasks (worker stops)
+        self._background = set()
+
+    def start(self):
+        """Spawn the workers in the background so startup never waits on them"""
+        self._replenish()
+
+    def _background_task(self, coro):
+        task = self.loop.create_task(coro)
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    def _replenish(self):
+        if self.size > 0 and not self._closed and self._filling is None:
+            self._filling = self.loop.create_task(self._fill())
+
+    async def _fill(self):
+        try:
+            while not self._closed and self._warm() < self.size:
+                self._release(await self._spawn())
+        except OSError:
+            pass  # can't start interpreters right now; runs fall back to fresh ones
+        finally:
+            self._filling = None
+
+    def _spawn(self):
+        return _AsyncWorker.spawn(self.cwd, self.env, self._generation)
+
+    def _warm(self) -> int:
+        return len(self._idle) + len(self._preparing)
+
+    async def _acquire(self, module_path=None):
+        # A preparation still running is at idle priority; rather than wait
+        # on it, cut it short and run in another worker
+        self.cancel_preparation(module_path)
+        # Prefer a worker that was prepared for this script
+        for worker in reversed(self._idle):
+            if module_path in worker.prepared and worker.alive():
+                self._idle.remove(worker)
+                return worker
+        while self._idle:
+            worker = self._idle.pop()
+            if worker.alive():
+                return worker
+        # Every warm worker is busy: a fresh one costs no more than a cold start
+        return await self._spawn()
+
+    def _release(self, worker):
+        keep = (
+            not self._closed
+            and worker.generation == self._generation
+            and worker.alive()
+            and worker.runs < self.max_runs
+            and not worker.spawned
+            and self._warm() < self.size
+        )
+        if keep:
+            self._idle.append(worker)
+        else:
+            self._background_task(worker.stop())
+
+    def _abandon(self, process):
+        """A run failed, timed out or was cancelled: take its processes down"""
+        if not self._closed:
+            kill_tree(process)
+
+    async def run(
+        self, module_path: str, timeout=None, on_start=None, on_output=None
+    ) -> subprocess.CompletedProcess:
+        """Run ``module_path`` as __main__ and return its exit status
+
+        Same contract as WorkerPool.run(); raises subprocess.TimeoutExpired
+        after ``timeout`` seconds and CancelledError if the task is cancelled.
+        """
+        chunks = []
+        if on_output is None:
+            on_output = chunks.append
+        args = [sys.executable, "-m", module_path]
+
+        if self.size <= 0 or self._closed:
+            returncode = await self._run_cold(args, timeout, on_start, on_output)
+        else:
+            worker = await self._acquire(module_path)
+            if on_start:
+                on_start(worker.process)
+            try:
+                returncode = await asyncio.wait_for(
+                    worker.run(module_path, on_output), timeout
+                )
+            except asyncio.TimeoutError:
+                self._abandon(worker.process)
+                self._replenish()
+                raise subprocess.TimeoutExpired(args, timeout) from None
+            except BaseException:
+                self._abandon(worker.process)
+                self._replenish()
+                raise
+            self._release(worker)
+            self._replenish()
+
+        return subprocess.CompletedProcess(args, returncode, "".join(chunks), "")
+
+    async def _run_cold(self, args, timeout, on_start, on_output):
+        process = await asyncio.create_subprocess_exec(
+            *args,
+            cwd=self.cwd,
+            env=self.env,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.STDOUT,
+            **NEW_GROUP,
+        )
+        if on_start:
+            on_start(process)
+
+        reader = self.loop.create_task(_pump(process.stdout, on_output))
+        try:
+            return await asyncio.wait_for(process.wait(), timeout)
+        except asyncio.TimeoutError:
+            self._abandon(process)
+            raise subprocess.TimeoutExpired(args, timeout) from None
+        except BaseException:
+            self._abandon(process)
+            raise
+        finally:
+            try:
+                await asyncio.wait_for(reader, OUTPUT_DRAIN_TIMEOUT)
+            except (asyncio.TimeoutError, asyncio.CancelledError):
+                pass
+
+    def is_prepared(self, module_path) -> bool:
+        return module_path in self._preparing.values() or any(
+            module_path in worker.prepared for worker in self._idle
+        )
+
+    def prepare(self, module_path) -> bool:
+        """Get an idle warm worker ready to run ``module_path``, without waiting
+
+        The worker compiles the script and imports its dependencies at idle
+        priority. It leaves the idle list until it reports back, so no run
+        shares the process with the preparation, and the next run of the
+        script goes to it. False when no warm worker is idle.
+        """
+        if self._closed or self.is_prepared(module_path):
+            return not self._closed
+        idle = [worker for worker in self._idle if worker.alive()]
+        if not idle:
+            return False
+        worker = min(idle, key=lambda worker: len(worker.prepared))
+        self._idle.remove(worker)
+        self._preparing[worker] = module_path
+        worker.prepare(module_path)
+        self._background_task(self._finish_preparing(worker))
+        return True
+
+    async def _finish_preparing(self, worker):
+        try:
+            await worker.wait_prepared()
+        except WorkerCrashed:
+            pass
+        finally:
+            # Gone already if the pool was shut down meanwhile
+            if self._preparing.pop(worker, None) is not None:
+                self._release(worker)
+
+    def cancel_preparation(self, module_path):
+        """Stop preparing ``module_path`` if still in progress; what's already
+        imported stays"""
+        for worker, preparing in self._preparing.items():
+            if preparing == module_path:
+                worker.cancel_prepare()
+
+    def reset(self, env=None):
+        """Replace every worker, e.g. after the resolved environment changed"""
+        self.env = child_env(env)
+        self._generation += 1
+        workers, self._idle = self._idle, []
+        for worker in workers:
+            self._background_task(worker.stop())
+        self._replenish()
+
+    async def shutdown(self):
+        """Stop idle workers; runs still in flight are left to finish"""
+        self._closed = True
+        workers = self._idle + list(self._preparing)
+        self._idle, self._preparing = [], {}
+        await asyncio.gather(*(worker.stop() for worker in workers))
+        if self._background:
+            await asyncio.gather(*self._background, return_exceptions=True)
+
+
+class AsyncJobScheduler(JobScheduler):
+    """JobScheduler whose runs are tasks on an asyncio loop instead of threads
+
+    ``run(job)`` is a coroutine function. Priorities and the worker, category
+    and script limits behave as in JobScheduler; every method, and
+    ``on_change``, runs on the loop's thread.
+    """
+
+    def __init__(self, run, loop, **limits):
+        super().__init__(run, **limits)
+        self.loop = loop
+        self._tasks = {}
+
+    def submit(self, script_name, module, category="", priority=0, context=None):
+        job = self._new_job(script_name, module, category, priority, context)
+        self._changed(job)
+        self._dispatch()
+        return job
+
+    def cancel(self, job_id) -> bool:
+        with self._cond:
+            job = self._jobs.get(job_id)
+            if job is None or job.state in FINISHED_STATES:
+                return False
+            task = self._tasks.get(job_id)
+            if task is None:
+                self._pending.remove(job)
+                self._finish(job, CANCELLED)
+        if task is None:
+            self._changed(job)
+        else:
+            job.cancel()
+            task.cancel()
+        return True
+
+    def shutdown(self, cancel_running=False):
+        with self._cond:
+            self._closed = True
+            pending, self._pending = self._pending, []
+            for job in pending:
+                self._finish(job, CANCELLED)
+        if cancel_running:
+            for task in list(self._tasks.values()):
+                task.cancel()
+
+    async def wait(self):
+        """Wait until the task of every started job has ended"""
+        if self._tasks:
+            await asyncio.gather(*self._tasks.values(), return_exceptions=True)
+
+    def _dispatch(self):
+        """Start queued jobs while the limits allow"""
+        while not self._closed and len(self._tasks) < self.max_workers:
+            with self._cond:
+                job = self._next_job()
+                if job is None:
+                    return
+                self._start(job)
+            self._tasks[job.id] = self.loop.create_task(self._run_job(job))
+
+    async def _run_job(self, job):
+        self._changed(job)
+        try:
+            job.result = await self.run(job)
+            state = DONE
+        except asyncio.CancelledError:
+            job.cancelled = True
+            state = CANCELLED
+        except Exception as e:
+            job.error = e
+            state = FAILED
+        if job.cancelled:
+            state = CANCELLED
+
+        with self._cond:
+            self._finish(job, state)
+            self._stop(job)
+            del self._tasks[job.id]
+        self._changed(job)
+        self._dispatch()
@@ -0,0 +1,230 @@
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+
+from launcher.config import CACHE_DIR
+
+REGISTRY_PATH = CACHE_DIR / "apps.json"
+
+
+def _start_token(pid):
+    """Something that identifies this particular process, so a recycled PID
+    isn't mistaken for the app we launched; None if the process is gone"""
+    if sys.platform == "win32":
+        return _win_start_token(pid)
+    try:
+        with open(f"/proc/{pid}/stat", encoding="ascii", errors="replace") as f:
+            # Fields after the command name (which may contain spaces): state
+            # first, start time 20th
+            fields = f.read().rsplit(")", 1)[1].split()
+        return None if fields[0] in ("Z", "X") else fields[19]
+    except FileNotFoundError:
+        pass
+    except (OSError, IndexError):
+        return None
+    # No /proc (macOS): existence is the best we can do
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return None
+    except PermissionError:
+        pass
+    return "alive"
+
+
+def _win_start_token(pid):
+    import ctypes
+    from ctypes import wintypes
+
+    kernel32 = ctypes.windll.kernel32
+    handle = kernel32.OpenProcess(0x1000, False, pid)  # QUERY_LIMITED_INFORMATION
+    if not handle:
+        return None
+    try:
+        code = wintypes.DWORD()
+        if not kernel32.GetExitCodeProcess(handle, ctypes.byref(code)):
+            return None
+        if code.value != 259:  # STILL_ACTIVE
+            return None
+        created, exited, kernel, user = (wintypes.FILETIME() for _ in range(4))
+        kernel32.GetProcessTimes(
+            handle,
+            ctypes.byref(created),
+            ctypes.byref(exited),
+            ctypes.byref(kernel),
+            ctypes.byref(user),
+        )
+        return f"{created.dwHighDateTime}:{created.dwLowDateTime}"
+    finally:
+        kernel32.CloseHandle(handle)
+
+
+def is_alive(entry) -> bool:
+    token = _start_token(entry["pid"])
+    return token is not None and token == entry["started"]
+
+
+def _windows():
+    """(hwnd, pid, class name, title) of visible top-level windows (Windows)"""
+    import ctypes
+    from ctypes import wintypes
+
+    user32 = ctypes.windll.user32
+    found = []
+
+    @ctypes.WINFUNCTYPE(wintypes.BOOL, wintypes.HWND, wintypes.LPARAM)
+    def callback(hwnd, _):
+        if user32.IsWindowVisible(hwnd):
+            pid = wintypes.DWORD()
+            user32.GetWindowThreadProcessId(hwnd, ctypes.byref(pid))
+            title = ctypes.create_unicode_buffer(512)
+            user32.GetWindowTextW(hwnd, title, 512)
+            class_name = ctypes.create_unicode_buffer(256)
+            user32.GetClassNameW(hwnd, class_name, 256)
+            found.append((hwnd, pid.value, class_name.value, title.value))
+        return True
+
+    user32.EnumWindows(callback, 0)
+    return found
+
+
+def focus(pid=None, window=None) -> bool:
+    """Bring the app's window to the front: one owned by ``pid``, or the first
+    for which ``window(class_name, title)`` is true. Best effort; False when no
+    window was found or the platform has no way to do it."""
+    if sys.platform == "win32":
+        import ctypes
+
+        user32 = ctypes.windll.user32
+        for hwnd, owner, class_name, title in _windows():
+            if (pid is not None and owner == pid) or (
+                window is not None and window(class_name, title)
+            ):
+                if user32.IsIconic(hwnd):
+                    user32.ShowWindow(hwnd, 9)  # SW_RESTORE
+                user32.SetForegroundWindow(hwnd)
+                return True
+        return False
+
+    # X11 desktops with wmctrl installed; elsewhere the app simply stays put
+    try:
+        listing = subprocess.run(
+            ["wmctrl", "-l", "-p", "-x"], capture_output=True, text=True, timeout=2
+        ).stdout
+    except (OSError, subprocess.SubprocessError):
+        return False
+    for line in listing.splitlines():
+        parts = line.split(None, 5)
+        if len(parts) < 5:
+            continue
+        window_id, owner, class_name = parts[0], parts[2], parts[3]
+        title = parts[5] if len(parts) > 5 else ""
+        if (pid is not None and owner == str(pid)) or (
+            window is not None and window(class_name, title)
+        ):
+            subprocess.run(["wmctrl", "-i", "-a", window_id], timeout=2)
+            return True
+    return False
+
+
+def vscode_window(path):
+    """Matches VS Code titles such as: main.py - <folder> - Visual Studio Code"""
+    folder = os.path.basename(os.path.normpath(path))
+
+    def match(class_name, title):
+        parts = title.split(" - ")
+        return parts[-1] == "Visual Studio Code" and folder in parts[:-1]
+
+    return match
+
+
+def folder_window(path):
+    """Matches a file manager window titled with the folder's name or path"""
+    names = (os.path.basename(os.path.normpath(path)), os.path.normpath(path))
+    return lambda class_name, title: title in names
+
+
+class AppRegistry:
+    """External apps launched per (kind, workspace path), persisted across runs
+
+    ``launch`` reuses a tracked app that is still running, or a matching open
+    window, instead of spawning a duplicate. Dead entries are dropped whenever
+    the registry is read. Writes are atomic; concurrent launchers may lose an
+    entry, which only costs one extra app later.
+    """
+
+    def __init__(self, path=REGISTRY_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def _load(self) -> dict:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return {key: entry for key, entry in entries.items() if is_alive(entry)}
+
+    def _save(self, entries):
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(".tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(entries, f)
+            os.replace(tmp, self.path)
+        except OSError:
+            pass
+
+    @staticmethod
+    def key(kind, target) -> str:
+        target = os.path.normcase(os.path.abspath(target)) if target else ""
+        return f"{kind}:{target}"
+
+    def running(self) -> dict:
+        """Live entries by key, pruning dead ones from the file"""
+        with self._lock:
+            entries = self._load()
+            self._save(entries)
+            return entries
+
+    def launch(self, kind, target, argv, window=None, **popen_kwargs) -> bool:
+        """Start ``argv`` for ``target`` unless that app is already open
+
+        Returns True when an existing app was reused (and focused if possible).
+        ``window(class_name, title)`` recognises the app's window for launchers
+        that hand off to another process and exit, like VS Code's ``code``,
+        explorer or xdg-open; their pid would only track the stub, so such apps
+        are found by their window alone. Set LAUNCHER_REUSE_APPS=0 to always
+        start a new one.
+        """
+        reuse = os.getenv("LAUNCHER_REUSE_APPS", "1") != "0"
+        key = self.key(kind, target)
+        with self._lock:
+            entries = self._load()
+            entry = entries.get(key) if reuse else None
+            if entry is not None:
+                focus(pid=entry["pid"], window=window)
+                self._save(entries)
+                return True
+            if reuse and window is not None and focus(window=window):
+                self._save(entries)
+                return True
+
+            process = subprocess.Popen(argv, **popen_kwargs)
+            started = None if window is not None else _start_token(process.pid)
+            if started is not None:
+                entries[key] = {
+                    "pid": process.pid,
+                    "started": started,
+                    "argv": [str(arg) for arg in argv],
+                    "launched": time.time(),
+                }
+            self._save(entries)
+            return False
+
+
+# Shared by every launch in this process
+registry = AppRegistry()
@@ -0,0 +1,210 @@
+import json
+import os
+import shlex
+import subprocess
+import sys
+import threading
+import time
+import webbrowser
+from pathlib import Path
+
+# Stay well under the Windows command-line limit when batching URLs
+MAX_COMMAND_LENGTH = 8000
+
+# Tabs opened per second, and at once, unless BROWSER_OPEN_RATE/_BURST say
+DEFAULT_RATE = 2.0
+DEFAULT_BURST = 1
+
+# Where `python -m launcher.browser` is importable from
+PACKAGE_DIR = Path(__file__).resolve().parent.parent
+
+# The opener runs on in its own session, apart from the script's process group
+if sys.platform == "win32":
+    DETACHED = {
+        "creationflags": subprocess.DETACHED_PROCESS
+        | subprocess.CREATE_NEW_PROCESS_GROUP
+    }
+else:
+    DETACHED = {"start_new_session": True}
+
+# Windows' choice of default browser for https links
+HTTPS_CHOICE_KEY = (
+    r"Software\Microsoft\Windows\Shell\Associations\UrlAssociations"
+    r"\https\UserChoice"
+)
+
+# Default browsers on Windows that open every URL given on their command line
+MULTI_URL_BROWSERS = {
+    "brave.exe",
+    "chrome.exe",
+    "firefox.exe",
+    "msedge.exe",
+    "opera.exe",
+    "vivaldi.exe",
+}
+
+
+class RateLimiter:
+    """Token bucket that paces how fast URLs are handed to the browser"""
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        if self.rate > 0:
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._last) * self.rate
+            )
+        else:
+            self._tokens = self.burst
+        self._last = now
+
+    def acquire(self):
+        """Block until a token is available, then take it"""
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+    def try_acquire(self) -> bool:
+        """Take a token if one is available right now"""
+        with self._lock:
+            self._refill()
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
+
+
+def _browser_command():
+    """Return a command that accepts many URLs at once, if one is known"""
+    browser_path = os.getenv("BROWSER_PATH")
+    if browser_path:
+        return [browser_path]
+    if sys.platform == "win32":
+        return _windows_browser_command()
+
+    try:
+        controller = webbrowser.get()
+    except webbrowser.Error:
+        return None
+
+    # Chrome, Firefox and friends take any number of URLs on one command line
+    if isinstance(controller, webbrowser.UnixBrowser):
+        return [controller.name]
+    return None
+
+
+def _windows_browser_command():
+    """The default browser's executable, if it's one that takes many URLs"""
+    import winreg
+
+    try:
+        with winreg.OpenKey(winreg.HKEY_CURRENT_USER, HTTPS_CHOICE_KEY) as key:
+            prog_id = winreg.QueryValueEx(key, "ProgId")[0]
+        with winreg.OpenKey(
+            winreg.HKEY_CLASSES_ROOT, rf"{prog_id}\shell\open\command"
+        ) as key:
+            command = winreg.QueryValueEx(key, "")[0]
+    except OSError:
+        return None
+
+    # e.g. "C:\...\chrome.exe" --single-argument %1; only the executable is kept
+    executable = shlex.split(command, posix=False)[0].strip('"')
+    if os.path.basename(executable).lower() in MULTI_URL_BROWSERS:
+        return [executable]
+    return None
+
+
+def _batches(command, urls):
+    batch, length = [], len(" ".join(command))
+    for url in urls:
+        if batch and length + len(url) + 1 > MAX_COMMAND_LENGTH:
+            yield batch
+            batch, length = [], len(" ".join(command))
+        batch.append(url)
+        length += len(url) + 1
+    if batch:
+        yield batch
+
+
+def _open_all(urls, limiter):
+    try:
+        command = _browser_command()
+        if command:
+            for batch in _batches(command, urls):
+                limiter.acquire()
+                subprocess.Popen(command + batch)
+        else:
+            for url in urls:
+                limiter.acquire()
+                webbrowser.open_new_tab(url)
+    except Exception as e:
+        print(f"Error opening websites: {e}")
+
+
+def _env_number(name, default, kind):
+    """``kind(os.environ[name])``, or ``default`` with a warning if it's unusable"""
+    raw = os.getenv(name)
+    if raw is None:
+        return default
+    try:
+        value = kind(raw)
+        if value < 0:
+            raise ValueError(raw)
+    except ValueError:
+        print(
+            f"Warning: {name}={raw!r} is not a valid number; using {default}",
+            file=sys.stderr,
+        )
+        return default
+    return value
+
+
+def open_urls(urls, rate=None, burst=None):
+    """Open ``urls`` from a detached opener process and return that process
+
+    URLs are passed to the browser in as few invocations as possible, paced by a
+    rate limiter (``BROWSER_OPEN_RATE`` per second, ``BROWSER_OPEN_BURST`` at
+    once) instead of a fixed sleep. The opener outlives the caller, so a script
+    can exit right away without its run waiting on the pacing, and nothing it
+    starts is counted against the run or killed with its process group.
+    """
+    if rate is None:
+        rate = _env_number("BROWSER_OPEN_RATE", DEFAULT_RATE, float)
+    if burst is None:
+        burst = _env_number("BROWSER_OPEN_BURST", DEFAULT_BURST, int)
+
+    process = subprocess.Popen(
+        [sys.executable, "-m", "launcher.browser", str(rate), str(burst)],
+        cwd=PACKAGE_DIR,
+        stdin=subprocess.PIPE,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        text=True,
+        encoding="utf-8",
+        **DETACHED,
+    )
+    # On stdin rather than the command line, which has a length limit
+    with process.stdin:
+        process.stdin.write(json.dumps(list(urls)))
+    return process
+
+
+def main(argv=None):
+    """Opener process: URLs as a JSON list on stdin, rate and burst as args"""
+    rate, burst = (argv if argv is not None else sys.argv[1:])[:2]
+    _open_all(json.load(sys.stdin), RateLimiter(float(rate), int(burst)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,700 @@
+import argparse
+import os
+import sys
+import threading
+
+COMMANDS = ("run", "run-many", "list", "daemon", "history", "schedule", "log")
+
+# Exit codes besides the scripts' own
+EXIT_FAILED = 1
+EXIT_USAGE = 2
+EXIT_INTERRUPTED = 130
+
+
+class LinePrinter:
+    """Writes a job's output to stdout a line at a time, optionally prefixed,
+    so parallel runs don't interleave mid-line"""
+
+    _lock = threading.Lock()
+
+    def __init__(self, prefix=""):
+        self.prefix = prefix
+        self._partial = ""
+
+    def write(self, text):
+        lines = (self._partial + text).split("\n")
+        self._partial = lines.pop()
+        if lines:
+            self._emit(lines)
+
+    def close(self):
+        if self._partial:
+            self._emit([self._partial])
+            self._partial = ""
+
+    def _emit(self, lines):
+        with self._lock:
+            for line in lines:
+                sys.stdout.write(f"{self.prefix}{line}\n")
+            sys.stdout.flush()
+
+
+def resolve(scripts: dict, ref: str):
+    """Find the ScriptEntry for ``category/name`` (case-insensitive) or a module"""
+    for entries in scripts.values():
+        for script in entries:
+            if script.module == ref:
+                return script
+
+    category, _, name = ref.partition("/")
+    if not name:
+        return None
+    for key, entries in scripts.items():
+        if key.casefold() != category.strip().casefold():
+            continue
+        for script in entries:
+            if script.name.casefold() == name.strip().casefold():
+                return script
+    return None
+
+
+def resolve_all(scripts: dict, refs):
+    """ScriptEntry objects for ``refs``; raises LookupError naming the first unknown"""
+    selected = []
+    for ref in refs:
+        script = resolve(scripts, ref)
+        if script is None:
+            raise LookupError(f"Unknown script: {ref} (see `list`)")
+        selected.append(script)
+    return selected
+
+
+def outcome(job) -> dict:
+    """Plain summary of a finished job, as printed or sent to daemon clients"""
+    import subprocess
+
+    error = job.error
+    if job.cancelled:
+        status = "cancelled"
+    elif error is None:
+        status = "ok"
+    elif isinstance(error, subprocess.TimeoutExpired):
+        status = "timed out"
+    elif isinstance(error, subprocess.CalledProcessError):
+        status = f"exit {error.returncode}"
+    else:
+        status = f"error: {error}"
+
+    if error is None and job.result is not None:
+        returncode = job.result.returncode
+    elif isinstance(error, subprocess.CalledProcessError):
+        returncode = error.returncode
+    else:
+        returncode = EXIT_FAILED
+
+    return {
+        "script": f"{job.category}/{job.script_name}",
+        "ok": error is None and not job.cancelled,
+        "status": status,
+        "returncode": returncode,
+        "elapsed": job.elapsed,
+    }
+
+
+def record_run(history, runlog, job, source):
+    """Add a finished job to the run history, and its output to the run log"""
+    from launcher.history import Run
+
+    run = Run.from_job(job, source)
+    if runlog is not None:
+        run.output_path = runlog.finish(job, run)
+    history.record(run)
+
+
+def output_handler(job, printer, runlog):
+    """on_output callback sending a job's output to ``printer`` and the run log"""
+
+    def on_output(data):
+        printer.write(data)
+        if runlog is not None:
+            runlog.write(job, data)
+
+    return on_output
+
+
+def run_job(job, config, scripts, pool, timeout, on_output, history, monitor=None):
+    """Run a script or macro job on ``pool``; a macro's steps are recorded in
+    ``history`` as runs of their own. With a ResourceMonitor the job's usage
+    ends up in ``job.resources``."""
+    from launcher.macros import is_macro, lookup, run_macro
+
+    on_start = job.attach
+    if monitor is not None:
+        usage = monitor.track()
+
+        def on_start(process):
+            usage.add(process)
+            job.attach(process)
+
+    try:
+        if not is_macro(job.module):
+            return pool.run(
+                job.module, timeout=timeout, on_start=on_start, on_output=on_output
+            )
+        return run_macro(
+            job,
+            lookup(config, job.module),
+            scripts,
+            pool,
+            timeout=timeout,
+            on_start=on_start,
+            on_output=on_output,
+            on_step=lambda step: history.record(step.run("macro")),
+            monitor=monitor,
+        )
+    finally:
+        if monitor is not None:
+            job.resources = usage.stop()
+
+
+def report(outcomes, many) -> int:
+    """Print the result of a run or run-many and return the exit code"""
+    if not many:
+        result = outcomes[0]
+        if not result["ok"]:
+            print(f"{result['script']}: {result['status']}", file=sys.stderr)
+        return result["returncode"]
+
+    failed = [result for result in outcomes if not result["ok"]]
+    print(f"\n{len(outcomes) - len(failed)}/{len(outcomes)} succeeded", file=sys.stderr)
+    for result in outcomes:
+        print(
+            f"  {result['status']:<12} {result['elapsed']:7.2f}s  {result['script']}",
+            file=sys.stderr,
+        )
+    return EXIT_FAILED if failed else 0
+
+
+def run_scripts(
+    config, scripts, selected, parallel, timeout, prefix_output, priority=0
+):
+    """Run ``selected`` scripts through the job scheduler; returns their outcomes"""
+    from launcher.config import BASE_DIR
+    from launcher.history import open_store
+    from launcher.jobs import FINISHED_STATES, JobScheduler
+    from launcher.macros import is_macro, lookup
+    from launcher.pool import WorkerPool
+    from launcher.resources import open_monitor
+    from launcher.runlog import open_run_log
+
+    # One-shot runs don't benefit from warm workers, so run cold children;
+    # a macro's later steps do, as workers warm up while earlier ones run
+    warm = max(
+        (lookup(config, s.module).width for s in selected if is_macro(s.module)),
+        default=0,
+    )
+    pool = WorkerPool(BASE_DIR, size=warm, env=config.child_env())
+    pool.start()
+    history = open_store(config)
+    runlog = open_run_log(config)
+    problems = []
+    monitor = open_monitor(config, problems)
+    for problem in problems:
+        print(f"Warning: {problem}", file=sys.stderr)
+    done = threading.Condition()
+    finished = []
+
+    def execute(job):
+        printer = LinePrinter(f"[{job.script_name}] " if prefix_output else "")
+        try:
+            result = run_job(
+                job,
+                config,
+                scripts,
+                pool,
+                timeout,
+                output_handler(job, printer, runlog),
+                history,
+                monitor,
+            )
+        finally:
+            printer.close()
+        result.check_returncode()
+        return result
+
+    def on_change(job):
+        if job.state in FINISHED_STATES:
+            record_run(history, runlog, job, "cli")
+            with done:
+                finished.append(job)
+                done.notify()
+
+    scheduler = JobScheduler(
+        execute,
+        max_workers=parallel,
+        script_limit=parallel,
+        on_change=on_change,
+    )
+    jobs = [scheduler.submit(s.name, s.module, s.category, priority) for s in selected]
+    try:
+        with done:
+            while len(finished) < len(jobs):
+                # Timed waits keep Ctrl+C responsive on Windows
+                done.wait(0.5)
+    except KeyboardInterrupt:
+        scheduler.shutdown(cancel_running=True)
+        raise
+    finally:
+        if runlog is not None:
+            runlog.close()
+        history.close()
+        pool.shutdown()
+    scheduler.shutdown()
+    return [outcome(job) for job in jobs]
+
+
+def run_via_daemon(conn, refs, parallel, timeout, prefix_output, priority=0):
+    """Have the resident daemon run ``refs``; returns outcomes like run_scripts"""
+    printers = {}
+    conn.send(
+        {
+            "cmd": "run",
+            "scripts": refs,
+            "parallel": parallel,
+            "timeout": timeout,
+            "priority": priority,
+        }
+    )
+    while True:
+        message = conn.recv()
+        event = message["event"]
+        if event == "output":
+            name = message["script"]
+            if name not in printers:
+                printers[name] = LinePrinter(f"[{name}] " if prefix_output else "")
+            printers[name].write(message["data"])
+        elif event == "error":
+            raise LookupError(message["message"])
+        elif event == "done":
+            for printer in printers.values():
+                printer.close()
+            return message["outcomes"]
+
+
+def cmd_list(args):
+    conn = None if args.local else _daemon_connection()
+    if conn is not None:
+        with conn:
+            conn.send({"cmd": "list"})
+            rows = conn.recv()["scripts"]
+    else:
+        rows = [
+            (category, script.name, script.module)
+            for category, entries in _local_registry()[1].items()
+            for script in entries
+        ]
+    for category, name, module in rows:
+        print(f"{category}/{name}\t{module}")
+    return 0
+
+
+def cmd_run(args, refs):
+    many = args.command == "run-many"
+    parallel = max(1, args.parallel) if many else 1
+    prefix_output = many and len(refs) > 1
+
+    conn = None if args.local else _daemon_connection()
+    try:
+        if conn is not None:
+            with conn:
+                outcomes = run_via_daemon(
+                    conn, refs, parallel, args.timeout, prefix_output, args.priority
+                )
+        else:
+            config, scripts = _local_registry()
+            selected = resolve_all(scripts, refs)
+            outcomes = run_scripts(
+                config,
+                scripts,
+                selected,
+                parallel,
+                args.timeout,
+                prefix_output,
+                args.priority,
+            )
+    except LookupError as e:
+        print(e.args[0], file=sys.stderr)
+        return EXIT_USAGE
+    except BrokenPipeError:
+        raise  # our stdout was closed, which main() handles
+    except (EOFError, OSError) as e:
+        print(f"Lost connection to the launcher daemon: {e}", file=sys.stderr)
+        return EXIT_FAILED
+    except KeyboardInterrupt:
+        print("Interrupted", file=sys.stderr)
+        return EXIT_INTERRUPTED
+    return report(outcomes, many)
+
+
+def _format_run(run) -> str:
+    import time
+
+    when = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(run.finished_at))
+    exit_code = "" if run.exit_code is None else f"exit {run.exit_code}"
+    wall = "" if run.wall is None else f"{run.wall:.2f}s"
+    line = (
+        f"{when}  {run.status:<9} {exit_code:<7} {wall:>8}  {run.category}/{run.script}"
+    )
+    if run.cpu_time is not None:
+        line += f"  cpu {run.cpu_time:.2f}s rss {run.peak_rss / 2**20:.0f} MB"
+    if run.output_path:
+        line += f"  {run.output_path}"
+    return line
+
+
+def cmd_history(args):
+    import time
+
+    from launcher.history import open_store, week_start
+
+    config, scripts = _local_registry()
+    since = time.time() - args.days * 86400 if args.days is not None else None
+    store = open_store(config)
+    try:
+        if args.stats:
+            for (
+                module,
+                script,
+                runs,
+                failures,
+                mean,
+                longest,
+                last,
+                status,
+                cpu,
+                rss,
+            ) in store.stats():
+                line = (
+                    f"{script:<30} {runs:>6} runs {failures:>5} failed  "
+                    f"mean {mean:7.2f}s  max {longest:7.2f}s  last {status}"
+                )
+                if cpu is not None:
+                    line += f"  cpu {cpu:.2f}s  rss {rss / 2**20:.0f} MB"
+                print(line)
+            return 0
+
+        if args.failures:
+            runs = store.failures(week_start() if since is None else since, args.limit)
+        elif args.script:
+            script = resolve(scripts, args.script)
+            module = script.module if script is not None else args.script
+            runs = store.last_runs(module, args.limit)
+        else:
+            runs = store.recent(since or 0, args.limit)
+    finally:
+        store.close()
+
+    for run in runs:
+        print(_format_run(run))
+    return 0
+
+
+def cmd_log(args):
+    from pathlib import Path
+
+    from launcher.history import open_store
+    from launcher.runlog import LOG_DIR, read_run
+
+    config, scripts = _local_registry()
+    key = args.run
+    script = resolve(scripts, args.run)
+    if script is not None:
+        store = open_store(config)
+        try:
+            runs = store.last_runs(script.module, args.back + 1)
+        finally:
+            store.close()
+        if len(runs) <= args.back or not runs[args.back].output_path:
+            print(f"No logged run of {args.run}", file=sys.stderr)
+            return EXIT_FAILED
+        key = runs[args.back].output_path
+        if Path(key).is_file():
+            # Spilled with LAUNCHER_SPILL_OUTPUT while the run log was off
+            sys.stdout.write(Path(key).read_text(encoding="utf-8", errors="replace"))
+            return 0
+
+    record = read_run(Path(config.get("LAUNCHER_LOG_DIR", LOG_DIR)), key)
+    if record is None:
+        print(f"No run {key} in the run log", file=sys.stderr)
+        return EXIT_FAILED
+    header, output = record
+    print(
+        f"{header['category']}/{header['script']}  {header['status']}  {key}",
+        file=sys.stderr,
+    )
+    sys.stdout.write(output)
+    return 0
+
+
+def cmd_schedule(args):
+    from datetime import datetime
+
+    from launcher.config import BASE_DIR, load_config
+    from launcher.cron import CronScheduler, parse_schedule, resolve_targets
+    from launcher.discovery import load_scripts
+    from launcher.history import open_store
+    from launcher.jobs import FINISHED_STATES, JobScheduler
+    from launcher.pool import WorkerPool
+    from launcher.resources import open_monitor
+    from launcher.runlog import open_run_log
+
+    config, scripts = _local_registry()
+    problems = []
+    entries = parse_schedule(config.get("LAUNCHER_SCHEDULE"), problems)
+    monitor = open_monitor(config, problems)
+    for problem in problems:
+        print(f"Warning: {problem}", file=sys.stderr)
+
+    if args.list:
+        now = datetime.now()
+        for entry in entries:
+            when = entry.cron.next_after(now)
+            print(f"{when:%Y-%m-%d %H:%M}  {entry.cron.text:<20} {entry.name}")
+        return 0
+    if not entries:
+        print("LAUNCHER_SCHEDULE has no entries to run", file=sys.stderr)
+        return EXIT_USAGE
+
+    # Resident, so warm workers pay off as they do in the GUI
+    pool = WorkerPool(
+        BASE_DIR,
+        size=int(config.get("LAUNCHER_POOL_SIZE", "2")),
+        max_runs=int(config.get("LAUNCHER_POOL_MAX_RUNS", "20")),
+        env=config.child_env(),
+    )
+    history = open_store(config)
+    runlog = open_run_log(config)
+    current = {"config": config, "scripts": scripts}
+
+    def execute(job):
+        printer = LinePrinter(f"[{job.script_name}] ")
+        try:
+            result = run_job(
+                job,
+                current["config"],
+                current["scripts"],
+                pool,
+                args.timeout,
+                output_handler(job, printer, runlog),
+                history,
+                monitor,
+            )
+        finally:
+            printer.close()
+        result.check_returncode()
+        return result
+
+    def on_change(job):
+        if job.state in FINISHED_STATES:
+            record_run(history, runlog, job, "schedule")
+            print(f"{job.category}/{job.script_name}: {outcome(job)['status']}")
+
+    jobs = JobScheduler(
+        execute,
+        max_workers=int(config.get("LAUNCHER_MAX_JOBS", "0")) or None,
+        category_limit=int(config.get("LAUNCHER_CATEGORY_LIMIT", "0")) or None,
+        script_limit=int(config.get("LAUNCHER_SCRIPT_LIMIT", "1")),
+        on_change=on_change,
+    )
+
+    def submit(entry):
+        selected = resolve_targets(current["scripts"], entry.run)
+        print(f"{datetime.now():%Y-%m-%d %H:%M:%S} {entry.name}", file=sys.stderr)
+        return [jobs.submit(s.name, s.module, s.category) for s in selected]
+
+    def on_wake():
+        config = load_config()
+        if config.digest != current["config"].digest:
+            current["config"] = config
+            pool.reset(env=config.child_env())
+            cron.update(parse_schedule(config.get("LAUNCHER_SCHEDULE")))
+        current["scripts"] = load_scripts(config)
+
+    cron = CronScheduler(submit)
+    cron.update(entries)
+    if cron.blocked:
+        print("Another launcher is already running the schedule", file=sys.stderr)
+        if runlog is not None:
+            runlog.close()
+        history.close()
+        return EXIT_FAILED
+
+    pool.start()
+    stop = threading.Event()
+    thread = threading.Thread(target=cron.serve, args=(stop, on_wake), daemon=True)
+    thread.start()
+    print(f"Running {len(entries)} schedule entries; Ctrl+C stops", file=sys.stderr)
+    try:
+        while thread.is_alive():
+            # Timed joins keep Ctrl+C responsive on Windows
+            thread.join(0.5)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop.set()
+        thread.join()
+        jobs.shutdown(cancel_running=True)
+        pool.shutdown()
+        if runlog is not None:
+            runlog.close()
+        history.close()
+    return 0
+
+
+def cmd_daemon(args):
+    from launcher import daemon
+
+    if args.stop:
+        conn = _daemon_connection()
+        if conn is None:
+            print("No launcher daemon is running", file=sys.stderr)
+            return EXIT_FAILED
+        with conn:
+            conn.send({"cmd": "stop"})
+            conn.recv()
+        return 0
+
+    try:
+        server = daemon.LauncherDaemon()
+    except RuntimeError as e:
+        print(e, file=sys.stderr)
+        return EXIT_FAILED
+    print(f"Launcher daemon listening on {daemon.ADDRESS}", file=sys.stderr)
+    try:
+        server.serve()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+    return 0
+
+
+def _daemon_connection():
+    from launcher.daemon import connect
+
+    return connect()
+
+
+def _local_registry():
+    from launcher.config import load_config
+    from launcher.discovery import load_scripts
+
+    config = load_config()
+    for problem in config.problems:
+        print(f"Warning: {problem}", file=sys.stderr)
+    return config, load_scripts(config)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m script_launcher",
+        description="Run launcher scripts without the GUI",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    def command(name, help_text):
+        sub = commands.add_parser(name, help=help_text)
+        if name not in ("daemon", "history", "schedule", "log"):
+            sub.add_argument(
+                "--local",
+                action="store_true",
+                help="run in this process even if a launcher daemon is running",
+            )
+        return sub
+
+    command("list", "List every known script as category/name")
+    priority_help = (
+        "start before queued jobs of lower priority, e.g. when a daemon is busy"
+    )
+
+    run = command("run", "Run one script and return its exit code")
+    run.add_argument("script", help="category/name, or a module path")
+    run.add_argument("--timeout", type=float, default=None)
+    run.add_argument("--priority", type=int, default=0, help=priority_help)
+
+    many = command("run-many", "Run several scripts, optionally in parallel")
+    many.add_argument("scripts", nargs="+", help="category/name, or module paths")
+    many.add_argument("-j", "--parallel", type=int, default=1)
+    many.add_argument("--timeout", type=float, default=None)
+    many.add_argument("--priority", type=int, default=0, help=priority_help)
+
+    daemon = command(
+        "daemon", "Stay resident and serve run requests from other invocations"
+    )
+    daemon.add_argument("--stop", action="store_true", help="stop a running daemon")
+
+    history = command("history", "Show past runs from the run history")
+    history.add_argument(
+        "script", nargs="?", help="only this category/name or module, newest first"
+    )
+    history.add_argument("-n", "--limit", type=int, default=20)
+    history.add_argument(
+        "--failures",
+        action="store_true",
+        help="runs that didn't succeed, this week unless --days is given",
+    )
+    history.add_argument("--days", type=float, help="only runs in the last DAYS days")
+    history.add_argument(
+        "--stats", action="store_true", help="lifetime totals per script"
+    )
+
+    schedule = command(
+        "schedule", "Run the scripts in LAUNCHER_SCHEDULE at their set times"
+    )
+    schedule.add_argument(
+        "--list", action="store_true", help="show each entry's next run and exit"
+    )
+    schedule.add_argument("--timeout", type=float, default=None)
+
+    log = command("log", "Print a run's output from the run log")
+    log.add_argument(
+        "run", help="a run key from `history`, or category/name for its latest run"
+    )
+    log.add_argument(
+        "-b",
+        "--back",
+        type=int,
+        default=0,
+        help="with a script, the run this many before its latest",
+    )
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    try:
+        returncode = dispatch(args)
+        # Output still buffered must hit a closed pipe here, not at exit
+        sys.stdout.flush()
+    except BrokenPipeError:
+        # The reader went away, e.g. `list | head`: stop quietly, pointing
+        # stdout at devnull so the flush at interpreter exit doesn't fail too
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return EXIT_FAILED
+    return returncode
+
+
+def dispatch(args) -> int:
+    if args.command == "list":
+        return cmd_list(args)
+    if args.command == "daemon":
+        return cmd_daemon(args)
+    if args.command == "history":
+        return cmd_history(args)
+    if args.command == "schedule":
+        return cmd_schedule(args)
+    if args.command == "log":
+        return cmd_log(args)
+    if args.command == "run":
+        return cmd_run(args, [args.script])
+    return cmd_run(args, args.scripts)
@@ -0,0 +1,191 @@
+import hashlib
+import json
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+ENV_FILE = BASE_DIR / ".env"
+CACHE_DIR = BASE_DIR / ".cache"
+
+# Set in a child's environment to the env file the launcher resolved for it
+RESOLVED_MARKER = "LAUNCHER_ENV_RESOLVED"
+
+CACHE_VERSION = 1
+
+
+@dataclass(frozen=True)
+class ScriptEntry:
+    """A runnable script from the SCRIPTS_LIST registry"""
+
+    name: str
+    module: str
+    category: str
+
+
+@dataclass
+class Config:
+    """Validated snapshot of .env and the script registry"""
+
+    env: dict
+    scripts: dict
+    digest: str
+    problems: list = field(default_factory=list)
+    macros: dict = field(default_factory=dict)
+    env_file: Path = ENV_FILE
+
+    def get(self, key, default=None):
+        """Look up a setting, letting the real environment win like load_dotenv"""
+        return os.environ.get(key, self.env.get(key, default))
+
+    def child_env(self) -> dict:
+        """Resolved environment to hand to a child so it skips parsing .env"""
+        env = dict(os.environ)
+        for key, value in self.env.items():
+            env.setdefault(key, value)
+        env[RESOLVED_MARKER] = str(self.env_file)
+        return env
+
+
+def parse_scripts(raw, problems=None) -> dict:
+    """Validate SCRIPTS_LIST JSON into ScriptEntry tuples per category"""
+    problems = [] if problems is None else problems
+    if not raw:
+        return {}
+
+    try:
+        data = json.loads(raw)
+    except ValueError as e:
+        problems.append(f"SCRIPTS_LIST is not valid JSON: {e}")
+        return {}
+    if not isinstance(data, dict):
+        problems.append("SCRIPTS_LIST must be an object of category -> scripts")
+        return {}
+
+    scripts = {}
+    for category, entries in data.items():
+        if not isinstance(entries, list):
+            problems.append(f"SCRIPTS_LIST[{category!r}] must be a list")
+            continue
+        valid = []
+        for entry in entries:
+            module = entry.get("module") if isinstance(entry, dict) else None
+            if not isinstance(module, str) or not module:
+                problems.append(f"Skipping entry without a module in {category!r}")
+                continue
+            name = entry.get("name") or "Unnamed Script"
+            valid.append(ScriptEntry(str(name), module, category))
+        scripts[category] = tuple(valid)
+    return scripts
+
+
+def _resolve(env_file) -> Path:
+    return Path(env_file).resolve() if env_file else ENV_FILE
+
+
+def _stamp(path: Path):
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def _cache_path(env_file: Path) -> Path:
+    tag = hashlib.sha1(str(env_file).encode("utf-8")).hexdigest()[:10]
+    return CACHE_DIR / f"config-{tag}.json"
+
+
+def _read_cache(path: Path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if data.get("version") != CACHE_VERSION:
+        return None
+    return data
+
+
+def _write_cache(path: Path, data):
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp, path)
+    except OSError:
+        pass
+
+
+def _parse_env_file(env_file: Path) -> dict:
+    from dotenv import dotenv_values
+
+    return {k: v for k, v in dotenv_values(env_file).items() if v is not None}
+
+
+# Per-process memo so repeated loads only cost a stat()
+_loaded = {}
+
+
+def load_config(env_file=None) -> Config:
+    """Return the config for ``env_file``, rebuilding the snapshot only if stale
+
+    The compiled snapshot in .cache/ is keyed by the file's mtime and size; when
+    those change the content hash decides whether a full re-parse is needed.
+    """
+    env_file = _resolve(env_file)
+    stamp = _stamp(env_file)
+
+    memo = _loaded.get(env_file)
+    if memo and memo[0] == stamp:
+        return memo[1]
+
+    cache_path = _cache_path(env_file)
+    cached = _read_cache(cache_path)
+
+    if stamp is None:
+        env, digest = {}, "missing"
+    elif cached and cached["stamp"] == stamp:
+        env, digest = cached["env"], cached["digest"]
+    else:
+        digest = hashlib.sha256(env_file.read_bytes()).hexdigest()
+        if cached and cached["digest"] == digest:
+            # Touched but unchanged: keep the snapshot, refresh the key
+            env = cached["env"]
+        else:
+            env = _parse_env_file(env_file)
+        _write_cache(
+            cache_path,
+            {"version": CACHE_VERSION, "stamp": stamp, "digest": digest, "env": env},
+        )
+
+    problems = []
+    raw_scripts = os.environ.get("SCRIPTS_LIST", env.get("SCRIPTS_LIST"))
+    config = Config(
+        env, parse_scripts(raw_scripts, problems), digest, problems, env_file=env_file
+    )
+    raw_macros = config.get("LAUNCHER_MACROS")
+    if raw_macros:
+        from launcher.macros import parse_macros
+
+        config.macros = parse_macros(raw_macros, problems)
+    _loaded[env_file] = (stamp, config)
+    return config
+
+
+def load_env(env_file=None):
+    """Drop-in replacement for load_dotenv() in scripts and templates
+
+    When started by the launcher with the same file already resolved this
+    returns immediately; otherwise the cached snapshot is applied without
+    overriding variables that are already set.
+    """
+    env_file = _resolve(env_file)
+    if os.environ.get(RESOLVED_MARKER) == str(env_file):
+        return
+
+    config = load_config(env_file)
+    for key, value in config.env.items():
+        os.environ.setdefault(key, value)
+    os.environ[RESOLVED_MARKER] = str(env_file)
@@ -0,0 +1,410 @@
+import heapq
+import itertools
+import json
+import os
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from launcher.config import CACHE_DIR
+from launcher.jobs import FINISHED_STATES
+from launcher.locks import acquire_lock
+
+STATE_PATH = CACHE_DIR / "schedule-state.json"
+LOCK_PATH = CACHE_DIR / "schedule.lock"
+
+# A run this late (seconds) still counts as on time rather than missed
+LATE_GRACE = 60
+# Most missed runs replayed by the "all" catch-up policy
+MAX_CATCH_UP = 24
+# Longest single sleep, so a changed clock or a suspended machine is noticed
+MAX_SLEEP = 300
+
+CATCH_UP_POLICIES = ("once", "all", "skip")
+OVERLAP_POLICIES = ("skip", "queue", "cancel")
+
+MACROS = {
+    "@yearly": "0 0 1 1 *",
+    "@annually": "0 0 1 1 *",
+    "@monthly": "0 0 1 * *",
+    "@weekly": "0 0 * * 0",
+    "@daily": "0 0 * * *",
+    "@midnight": "0 0 * * *",
+    "@hourly": "0 * * * *",
+}
+MONTH_NAMES = "jan feb mar apr may jun jul aug sep oct nov dec".split()
+DAY_NAMES = "sun mon tue wed thu fri sat".split()
+
+
+def _field(text, low, high, names=()):
+    """Values of one cron field as a sorted tuple"""
+    values = set()
+    for part in text.lower().split(","):
+        spec, _, step = part.partition("/")
+        step = int(step) if step else 1
+        if spec == "*":
+            start, end = low, high
+        else:
+            bounds = [
+                names.index(b) + low if b in names else int(b)
+                for b in spec.split("-", 1)
+            ]
+            start, end = bounds[0], bounds[-1]
+            if step > 1 and len(bounds) == 1:
+                end = high  # "5/15" means from 5 on, every 15
+        if not low <= start <= end <= high or step < 1:
+            raise ValueError(f"{part!r} is out of range {low}-{high}")
+        values.update(range(start, end + 1, step))
+    return tuple(sorted(values))
+
+
+class CronExpression:
+    """Standard five-field cron expression: minute hour day month weekday
+
+    Fields take ``*``, lists, ranges and steps, month and day names, and the
+    @daily style macros. As in cron, when both day of month and weekday are
+    restricted, i.e. neither starts with ``*``, a day matching either one
+    counts.
+    """
+
+    def __init__(self, text):
+        self.text = text
+        fields = MACROS.get(text.strip().lower(), text).split()
+        if len(fields) != 5:
+            raise ValueError(f"{text!r} needs 5 fields, got {len(fields)}")
+        try:
+            self.minutes = _field(fields[0], 0, 59)
+            self.hours = _field(fields[1], 0, 23)
+            self.days = _field(fields[2], 1, 31)
+            self.months = _field(fields[3], 1, 12, MONTH_NAMES)
+            # 7 is Sunday too
+            weekdays = _field(fields[4], 0, 7, DAY_NAMES)
+        except ValueError as e:
+            raise ValueError(f"Bad cron expression {text!r}: {e}") from None
+        self.weekdays = frozenset(d % 7 for d in weekdays)
+        # As in cron, a field starting with * (like */2) doesn't restrict
+        self.any_day = fields[2].startswith("*")
+        self.any_weekday = fields[4].startswith("*")
+
+    def _day_matches(self, day) -> bool:
+        in_month = day.day in self.days
+        in_week = (day.weekday() + 1) % 7 in self.weekdays
+        if self.any_day or self.any_weekday:
+            return in_month and in_week
+        return in_month or in_week
+
+    def next_after(self, when: datetime) -> datetime:
+        """First matching minute strictly after ``when`` (naive local time)"""
+        t = when.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        # Each step jumps to the next candidate month, day, hour or minute
+        for _ in range(10000):
+            if t.month not in self.months:
+                year, month = (
+                    (t.year + 1, 1) if t.month == 12 else (t.year, t.month + 1)
+                )
+                t = datetime(year, month, 1)
+            elif not self._day_matches(t):
+                t = datetime(t.year, t.month, t.day) + timedelta(days=1)
+            elif t.hour not in self.hours:
+                later = [h for h in self.hours if h > t.hour]
+                if later:
+                    t = t.replace(hour=later[0], minute=0)
+                else:
+                    t = datetime(t.year, t.month, t.day) + timedelta(days=1)
+            elif t.minute not in self.minutes:
+                later = [m for m in self.minutes if m > t.minute]
+                if later:
+                    t = t.replace(minute=later[0])
+                else:
+                    t = t.replace(minute=0) + timedelta(hours=1)
+            else:
+                return t
+        raise ValueError(f"{self.text!r} never matches")
+
+
+@dataclass
+class ScheduleEntry:
+    """Scripts to run at the times of a cron expression"""
+
+    name: str
+    cron: CronExpression
+    run: tuple
+    catch_up: str = "once"
+    overlap: str = "skip"
+
+
+def parse_schedule(raw, problems=None) -> list:
+    """Validate LAUNCHER_SCHEDULE JSON into ScheduleEntry objects
+
+    The setting is a list of objects with ``cron``, ``run`` (a category, a
+    category/name or module, or a list of those) and optionally ``name``,
+    ``catch_up`` and ``overlap``. Expressions that never match, such as
+    February 30th, are reported rather than accepted.
+    """
+    problems = [] if problems is None else problems
+    if not raw:
+        return []
+
+    try:
+        data = json.loads(raw)
+    except ValueError as e:
+        problems.append(f"LAUNCHER_SCHEDULE is not valid JSON: {e}")
+        return []
+    if not isinstance(data, list):
+        problems.append("LAUNCHER_SCHEDULE must be a list of entries")
+        return []
+
+    entries = []
+    for item in data:
+        if not isinstance(item, dict):
+            problems.append(f"Skipping schedule entry {item!r}: not an object")
+            continue
+        run = item.get("run")
+        run = (run,) if isinstance(run, str) else tuple(run or ())
+        name = str(item.get("name") or f"{item.get('cron')} {' '.join(run)}")
+        catch_up = item.get("catch_up", "once")
+        overlap = item.get("overlap", "skip")
+        try:
+            cron = CronExpression(str(item.get("cron", "")))
+            cron.next_after(datetime.now())
+        except ValueError as e:
+            problems.append(f"Skipping schedule entry {name!r}: {e}")
+            continue
+        if not run or not all(isinstance(ref, str) for ref in run):
+            problems.append(f"Skipping schedule entry {name!r}: nothing to run")
+        elif catch_up not in CATCH_UP_POLICIES:
+            problems.append(f"Skipping schedule entry {name!r}: catch_up {catch_up!r}")
+        elif overlap not in OVERLAP_POLICIES:
+            problems.append(f"Skipping schedule entry {name!r}: overlap {overlap!r}")
+        else:
+            entries.append(ScheduleEntry(name, cron, run, catch_up, overlap))
+    return entries
+
+
+def resolve_targets(scripts: dict, refs) -> list:
+    """ScriptEntry objects for schedule refs; a category name means all of it"""
+    from launcher.cli import resolve
+
+    selected = []
+    for ref in refs:
+        category = next(
+            (key for key in scripts if key.casefold() == ref.strip().casefold()), None
+        )
+        if category is not None:
+            selected.extend(scripts[category])
+            continue
+        script = resolve(scripts, ref)
+        if script is None:
+            raise LookupError(f"Unknown script or category: {ref}")
+        selected.append(script)
+    return selected
+
+
+def _epoch(when: datetime) -> float:
+    return time.mktime(when.timetuple())
+
+
+def _local(epoch: float) -> datetime:
+    return datetime.fromtimestamp(epoch)
+
+
+class CronScheduler:
+    """Fires schedule entries at their cron times from a heap of due times
+
+    ``submit(entry)`` starts an entry's runs and returns their Jobs, which
+    the overlap policy checks the next time the entry is due. The last
+    handled time of each entry is saved to ``state_path``, so runs missed
+    while no launcher was running (or the machine slept) are caught up
+    according to the entry's policy. Only one process runs the schedule at
+    a time; the others stay idle while ``lock_path`` is held.
+
+    ``attach(root)`` drives it from Tk's mainloop and ``serve(stop)`` from a
+    thread; either way it sleeps until the earliest entry is due.
+    """
+
+    def __init__(self, submit, state_path=STATE_PATH, lock_path=LOCK_PATH):
+        self.submit = submit
+        self.state_path = state_path
+        self.lock_path = lock_path
+        self.entries = []
+        self.blocked = False
+        self._heap = []
+        self._seq = itertools.count()
+        self._jobs = {}
+        self._state = self._load_state()
+        self._lock = None
+        self._root = None
+        self._after = None
+
+    def _load_state(self) -> dict:
+        try:
+            with open(self.state_path, encoding="utf-8") as f:
+                return {k: float(v) for k, v in json.load(f).items()}
+        except (OSError, ValueError, TypeError, AttributeError):
+            return {}
+
+    def _save_state(self):
+        try:
+            self.state_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.state_path.with_suffix(".tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                # dumps uses the C encoder; dump to a file doesn't
+                f.write(json.dumps(self._state))
+            os.replace(tmp, self.state_path)
+        except OSError:
+            pass
+
+    def update(self, entries, now=None):
+        """Replace the schedule; missed runs since the last save are caught up"""
+        now = time.time() if now is None else now
+        if entries and self._lock is None:
+            self._lock = acquire_lock(self.lock_path)
+            self.blocked = self._lock is None
+        self.entries = []
+
+        self._heap = []
+        for entry in () if self.blocked else entries:
+            # New entries start from now rather than replaying history
+            last = self._state.get(entry.name, now)
+            try:
+                due = _epoch(entry.cron.next_after(_local(last)))
+            except ValueError as e:
+                # parse_schedule rejects these; entries may come from elsewhere
+                print(f"Schedule {entry.name!r}: {e}", file=sys.stderr)
+                continue
+            self._state[entry.name] = last
+            self.entries.append(entry)
+            heapq.heappush(self._heap, (due, next(self._seq), entry))
+        if self.entries:
+            self._save_state()
+        self._reschedule()
+
+    def next_due(self):
+        """Epoch seconds at which the earliest entry is due; None if none"""
+        return self._heap[0][0] if self._heap else None
+
+    def run_due(self, now=None) -> int:
+        """Fire every entry due by ``now``; returns how many runs started"""
+        now = time.time() if now is None else now
+        started = 0
+        fired = False
+        while self._heap and self._heap[0][0] <= now:
+            due, _, entry = heapq.heappop(self._heap)
+            started += self._fire(entry, due, now)
+            fired = True
+            after = max(due, now)
+            nxt = _epoch(entry.cron.next_after(_local(after)))
+            heapq.heappush(self._heap, (nxt, next(self._seq), entry))
+        if fired:
+            self._save_state()
+        return started
+
+    def _missed(self, entry, due, now) -> list:
+        """Occurrences of ``entry`` from ``due`` up to ``now``, oldest first"""
+        times = [due]
+        while len(times) <= MAX_CATCH_UP:
+            nxt = _epoch(entry.cron.next_after(_local(times[-1])))
+            if nxt > now:
+                break
+            times.append(nxt)
+        return times
+
+    def _fire(self, entry, due, now) -> int:
+        times = self._missed(entry, due, now)
+        self._state[entry.name] = now
+        on_time = now - times[-1] <= LATE_GRACE
+
+        if len(times) == 1 and on_time:
+            count = 1
+        elif entry.catch_up == "all":
+            count = min(len(times), MAX_CATCH_UP)
+        elif entry.catch_up == "once" or on_time:
+            count = 1
+        else:
+            count = 0
+
+        started = 0
+        for _ in range(count):
+            if self._overlaps(entry):
+                break
+            try:
+                jobs = self.submit(entry)
+            except LookupError as e:
+                print(f"Schedule {entry.name!r}: {e}", file=sys.stderr)
+                break
+            self._jobs.setdefault(entry.name, []).extend(jobs)
+            started += len(jobs)
+        return started
+
+    def _overlaps(self, entry) -> bool:
+        """Apply the overlap policy; True if this run should be skipped"""
+        running = [
+            job
+            for job in self._jobs.get(entry.name, ())
+            if job.state not in FINISHED_STATES
+        ]
+        self._jobs[entry.name] = running
+        if not running or entry.overlap == "queue":
+            return False
+        if entry.overlap == "cancel":
+            for job in running:
+                job.cancel()
+            return False
+        return True
+
+    def attach(self, root):
+        """Fire entries from Tk's mainloop"""
+        self._root = root
+        self._reschedule()
+
+    def _reschedule(self):
+        if self._root is None:
+            return
+        if self._after is not None:
+            self._root.after_cancel(self._after)
+            self._after = None
+        due = self.next_due()
+        if due is not None:
+            delay = min(max(0.0, due - time.time()), MAX_SLEEP)
+            self._after = self._root.after(int(delay * 1000) + 1, self._tick)
+
+    def _tick(self):
+        self._after = None
+        self.run_due()
+        self._reschedule()
+
+    def serve(self, stop: threading.Event, on_wake=None):
+        """Fire entries on this thread until ``stop`` is set
+
+        ``on_wake()`` runs each time the thread wakes up, e.g. to pick up a
+        changed schedule with ``update``.
+        """
+        while not stop.is_set():
+            if on_wake is not None:
+                on_wake()
+            self.run_due()
+            due = self.next_due()
+            delay = MAX_SLEEP if due is None else due - time.time()
+            stop.wait(min(max(0.0, delay), MAX_SLEEP))
+        self.close()
+
+    def close(self):
+        if self._after is not None:
+            try:
+                self._root.after_cancel(self._after)
+            except Exception:
+                pass  # the root is already destroyed
+            self._after = None
+        if self.entries:
+            self._save_state()
+        if self._lock is not None:
+            self._lock.close()
+            self._lock = None
+
+    def describe(self) -> list:
+        """(name, cron text, next run as epoch seconds) per entry, soonest first"""
+        return [
+            (entry.name, entry.cron.text, due) for due, _, entry in sorted(self._heap)
+        ]
@@ -0,0 +1,260 @@
+import hashlib
+import os
+import secrets
+import sys
+import threading
+from multiprocessing.connection import AuthenticationError, Client, Listener
+
+from launcher.config import BASE_DIR, CACHE_DIR
+
+KEY_FILE = CACHE_DIR / "daemon.key"
+
+# One daemon per checkout, reachable only by the user who can read KEY_FILE
+_TAG = hashlib.sha1(str(BASE_DIR).encode("utf-8")).hexdigest()[:10]
+if sys.platform == "win32":
+    FAMILY = "AF_PIPE"
+    ADDRESS = rf"\\.\pipe\script_launcher-{_TAG}"
+else:
+    FAMILY = "AF_UNIX"
+    ADDRESS = str(CACHE_DIR / "daemon.sock")
+    if len(ADDRESS) > 100:  # sun_path limit
+        import tempfile
+
+        ADDRESS = os.path.join(tempfile.gettempdir(), f"script_launcher-{_TAG}.sock")
+
+
+def _read_key(create=False):
+    try:
+        return KEY_FILE.read_bytes()
+    except OSError:
+        if not create:
+            return None
+    key = secrets.token_bytes(32)
+    KEY_FILE.parent.mkdir(parents=True, exist_ok=True)
+    fd = os.open(KEY_FILE, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "wb") as f:
+        f.write(key)
+    return key
+
+
+def connect():
+    """Connection to the running daemon, or None if there isn't one"""
+    key = _read_key()
+    if key is None:
+        return None
+    try:
+        return Client(ADDRESS, FAMILY, authkey=key)
+    except (OSError, AuthenticationError):
+        return None
+
+
+class LauncherDaemon:
+    """Resident launcher owning the config, script registry, warm workers and
+    job scheduler; thin clients submit runs over a local socket or named pipe
+
+    Requests are dicts with a ``cmd`` of ping, list, run or stop. A run streams
+    ``output`` events back and finishes with a ``done`` event carrying outcomes.
+    """
+
+    def __init__(self):
+        from launcher.config import load_config
+        from launcher.discovery import load_scripts
+        from launcher.history import open_store
+        from launcher.jobs import JobScheduler
+        from launcher.pool import WorkerPool
+        from launcher.resources import open_monitor
+        from launcher.runlog import open_run_log
+
+        probe = connect()
+        if probe is not None:
+            probe.close()
+            raise RuntimeError(f"A launcher daemon is already running on {ADDRESS}")
+
+        self.config = load_config()
+        self.scripts = load_scripts(self.config)
+        self._lock = threading.Lock()
+        self._finished = threading.Condition()
+        self._closing = False
+        self._listener = None
+
+        self.pool = WorkerPool(
+            BASE_DIR,
+            size=int(self.config.get("LAUNCHER_POOL_SIZE", "2")),
+            max_runs=int(self.config.get("LAUNCHER_POOL_MAX_RUNS", "20")),
+            env=self.config.child_env(),
+        )
+        self.pool.start()
+        self.history = open_store(self.config)
+        self.runlog = open_run_log(self.config)
+        problems = []
+        self.resources = open_monitor(self.config, problems)
+        for problem in problems:
+            print(f"Warning: {problem}", file=sys.stderr)
+        self.jobs = JobScheduler(
+            self._execute,
+            max_workers=int(self.config.get("LAUNCHER_MAX_JOBS", "0")) or None,
+            category_limit=(
+                int(self.config.get("LAUNCHER_CATEGORY_LIMIT", "0")) or None
+            ),
+            script_limit=int(self.config.get("LAUNCHER_SCRIPT_LIMIT", "1")),
+            on_change=self._on_job_change,
+        )
+
+    def refresh(self):
+        """Pick up .env edits and script changes, as the GUI does before a run"""
+        from launcher.config import load_config
+        from launcher.discovery import load_scripts
+
+        with self._lock:
+            config = load_config()
+            if config.digest != self.config.digest:
+                self.config = config
+                self.pool.reset(env=config.child_env())
+            self.scripts = load_scripts(self.config)
+            return self.scripts
+
+    def serve(self):
+        """Accept clients until a stop request; each client gets its own thread"""
+        if FAMILY == "AF_UNIX" and os.path.exists(ADDRESS):
+            os.unlink(ADDRESS)  # stale socket; __init__ found nobody listening
+        self._listener = Listener(ADDRESS, FAMILY, authkey=_read_key(create=True))
+        with self._listener:
+            while not self._closing:
+                try:
+                    conn = self._listener.accept()
+                except (OSError, EOFError, AuthenticationError):
+                    continue
+                threading.Thread(target=self._handle, args=(conn,), daemon=True).start()
+
+    def stop(self):
+        self._closing = True
+        # Wake the accept() call so serve() notices
+        conn = connect()
+        if conn is not None:
+            conn.close()
+
+    def close(self):
+        self.jobs.shutdown(cancel_running=True)
+        self.pool.shutdown()
+        if self.runlog is not None:
+            self.runlog.close()
+        self.history.close()
+        if FAMILY == "AF_UNIX":
+            try:
+                os.unlink(ADDRESS)
+            except OSError:
+                pass
+
+    def _handle(self, conn):
+        with conn:
+            try:
+                request = conn.recv()
+            except (EOFError, OSError):
+                return
+            cmd = request.get("cmd") if isinstance(request, dict) else None
+            try:
+                if cmd == "ping":
+                    conn.send({"event": "pong", "pid": os.getpid()})
+                elif cmd == "list":
+                    rows = [
+                        (category, script.name, script.module)
+                        for category, entries in self.refresh().items()
+                        for script in entries
+                    ]
+                    conn.send({"event": "scripts", "scripts": rows})
+                elif cmd == "run":
+                    self._run_request(conn, request)
+                elif cmd == "stop":
+                    conn.send({"event": "stopping"})
+                    self.stop()
+                else:
+                    conn.send({"event": "error", "message": f"Unknown command {cmd!r}"})
+            except (EOFError, OSError):
+                pass  # client went away
+
+    def _run_request(self, conn, request):
+        from launcher.cli import outcome, resolve_all
+        from launcher.jobs import FINISHED_STATES
+
+        try:
+            selected = resolve_all(self.refresh(), request.get("scripts", []))
+        except LookupError as e:
+            conn.send({"event": "error", "message": e.args[0]})
+            return
+
+        send_lock = threading.Lock()
+        context = {"timeout": request.get("timeout"), "send": None, "gone": False}
+
+        def send(message):
+            with send_lock:
+                if context["gone"]:
+                    return
+                try:
+                    conn.send(message)
+                except (EOFError, OSError):
+                    context["gone"] = True
+
+        context["send"] = send
+        parallel = max(1, int(request.get("parallel") or 1))
+        priority = int(request.get("priority") or 0)
+        pending = list(selected)
+        jobs = []
+
+        def active():
+            return sum(job.state not in FINISHED_STATES for job in jobs)
+
+        with self._finished:
+            while pending or active():
+                if context["gone"]:
+                    # Client disconnected: nobody is waiting for these runs
+                    for job in jobs:
+                        self.jobs.cancel(job.id)
+                    return
+                while pending and active() < parallel:
+                    script = pending.pop(0)
+                    jobs.append(
+                        self.jobs.submit(
+                            script.name,
+                            script.module,
+                            script.category,
+                            priority,
+                            context,
+                        )
+                    )
+                self._finished.wait(0.5)
+
+        send({"event": "done", "outcomes": [outcome(job) for job in jobs]})
+
+    def _execute(self, job):
+        from launcher.cli import run_job
+
+        send = job.context["send"]
+
+        def on_output(data):
+            send({"event": "output", "script": job.script_name, "data": data})
+            if self.runlog is not None:
+                self.runlog.write(job, data)
+
+        with self._lock:
+            config, scripts = self.config, self.scripts
+        result = run_job(
+            job,
+            config,
+            scripts,
+            self.pool,
+            job.context["timeout"],
+            on_output,
+            self.history,
+            self.resources,
+        )
+        result.check_returncode()
+        return result
+
+    def _on_job_change(self, job):
+        from launcher.cli import record_run
+        from launcher.jobs import FINISHED_STATES
+
+        if job.state in FINISHED_STATES:
+            record_run(self.history, self.runlog, job, "daemon")
+        with self._finished:
+            self._finished.notify_all()
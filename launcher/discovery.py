@@ -0,0 +1,189 @@
+import ast
+import json
+import os
+from pathlib import Path
+
+from launcher.config import BASE_DIR, CACHE_DIR, ScriptEntry
+
+SCRIPTS_PACKAGE = "scripts_list"
+INDEX_PATH = CACHE_DIR / "script-index.json"
+INDEX_VERSION = 2
+
+# Optional module-level metadata, read with ast and never executed, e.g.
+# SCRIPT_INFO = {"name": "Study AI", "category": "Study", "hidden": False}
+METADATA_NAME = "SCRIPT_INFO"
+
+# Category for modules directly inside scripts_list/; a subpackage's name is
+# the category of the modules in it, matching the SCRIPTS_LIST keys
+DEFAULT_CATEGORY = "general"
+
+
+def _title(identifier: str) -> str:
+    return identifier.replace("_", " ").title()
+
+
+# Top-level statements that only define things; a module made of nothing
+# else is a library, not a script
+DEFINITIONS = (
+    ast.Import,
+    ast.ImportFrom,
+    ast.FunctionDef,
+    ast.AsyncFunctionDef,
+    ast.ClassDef,
+    ast.Assign,
+    ast.AnnAssign,
+)
+
+
+def _is_runnable(tree) -> bool:
+    """True if the module does something when run, e.g. a __main__ block"""
+    for node in tree.body:
+        if isinstance(node, DEFINITIONS):
+            continue
+        if isinstance(node, ast.Expr) and isinstance(node.value, ast.Constant):
+            continue  # docstring
+        return True
+    return False
+
+
+def _read_metadata(tree) -> dict:
+    for node in tree.body:
+        if (
+            isinstance(node, ast.Assign)
+            and len(node.targets) == 1
+            and isinstance(node.targets[0], ast.Name)
+            and node.targets[0].id == METADATA_NAME
+        ):
+            try:
+                value = ast.literal_eval(node.value)
+            except ValueError:
+                return {}
+            return value if isinstance(value, dict) else {}
+    return {}
+
+
+def inspect_module(path: Path, module: str, package: str):
+    """Describe a script module from its source, or None if it isn't runnable
+
+    Modules that only define functions, classes and constants are skipped.
+    """
+    try:
+        tree = ast.parse(path.read_bytes(), filename=str(path))
+    except (OSError, SyntaxError, ValueError):
+        return None
+    if not _is_runnable(tree):
+        return None
+
+    info = _read_metadata(tree)
+    if info.get("hidden"):
+        return None
+    default_category = package or DEFAULT_CATEGORY
+    return {
+        "name": str(info.get("name") or _title(path.stem)),
+        "module": module,
+        "category": str(info.get("category") or default_category),
+    }
+
+
+def _walk(directory: Path, module_prefix: str, package: str):
+    """Yield (path, module, package) for every module in a package tree"""
+    try:
+        entries = sorted(os.scandir(directory), key=lambda e: e.name)
+    except OSError:
+        return
+    for entry in entries:
+        if entry.name.startswith((".", "_")):
+            continue
+        path = Path(entry.path)
+        if entry.is_dir():
+            if (path / "__init__.py").exists():
+                yield from _walk(path, f"{module_prefix}.{entry.name}", entry.name)
+        elif entry.name.endswith(".py"):
+            yield path, f"{module_prefix}.{path.stem}", package
+
+
+def _read_index(path: Path) -> dict:
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if data.get("version") != INDEX_VERSION:
+        return {}
+    return data.get("files", {})
+
+
+def _write_index(path: Path, files: dict):
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"version": INDEX_VERSION, "files": files}, f)
+        os.replace(tmp, path)
+    except OSError:
+        pass
+
+
+def discover_scripts(root=None, index_path=INDEX_PATH) -> list:
+    """Scan the scripts package and return ScriptEntry objects for its scripts
+
+    The index maps each file to its mtime and size, so a rescan costs one
+    stat() per file and only parses the ones that changed.
+    """
+    root = Path(root) if root else BASE_DIR / SCRIPTS_PACKAGE
+    previous = _read_index(index_path)
+    files = {}
+
+    for path, module, package in _walk(root, root.name, ""):
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        stamp = [stat.st_mtime_ns, stat.st_size]
+        key = str(path.relative_to(root))
+        cached = previous.get(key)
+        if cached and cached["stamp"] == stamp:
+            files[key] = cached
+        else:
+            files[key] = {
+                "stamp": stamp,
+                "script": inspect_module(path, module, package),
+            }
+
+    if files != previous:
+        _write_index(index_path, files)
+
+    return [
+        ScriptEntry(**entry["script"]) for entry in files.values() if entry["script"]
+    ]
+
+
+def merge_scripts(manual: dict, discovered) -> dict:
+    """Add discovered scripts to the manual registry
+
+    The manual list wins: a module it already names keeps its name, category
+    and position, and discovered scripts are appended after it.
+    """
+    known = {script.module for scripts in manual.values() for script in scripts}
+    merged = {category: list(scripts) for category, scripts in manual.items()}
+    for script in discovered:
+        if script.module not in known:
+            merged.setdefault(script.category, []).append(script)
+            known.add(script.module)
+    return {category: tuple(scripts) for category, scripts in merged.items()}
+
+
+def load_scripts(config) -> dict:
+    """The script registry: SCRIPTS_LIST plus discovered scripts, then the
+    LAUNCHER_MACROS routines in their categories
+
+    Set LAUNCHER_DISCOVER=0 to use only the manual list.
+    """
+    scripts = config.scripts
+    if config.get("LAUNCHER_DISCOVER", "1") != "0":
+        scripts = merge_scripts(scripts, discover_scripts())
+    if config.macros:
+        scripts = merge_scripts(
+            scripts, (macro.entry for macro in config.macros.values())
+        )
+    return scripts
@@ -0,0 +1,410 @@
+from __future__ import annotations
+
+import json
+import queue
+import sqlite3
+import subprocess
+import threading
+import time
+from dataclasses import asdict, dataclass, fields
+from pathlib import Path
+
+from launcher.config import CACHE_DIR
+from launcher.metrics import run_status
+
+DB_PATH = CACHE_DIR / "history.db"
+
+# Runs are written in one transaction per batch: whatever arrives within
+# BATCH_DELAY of the first, up to BATCH_SIZE
+BATCH_SIZE = 256
+BATCH_DELAY = 0.25
+
+# Retention: runs older than this many days, or beyond this many in total,
+# are deleted; checked on open and every COMPACT_EVERY writes
+RETENTION_DAYS = 365
+RETENTION_RUNS = 200_000
+COMPACT_EVERY = 1000
+
+SCHEMA_VERSION = 2
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    script TEXT NOT NULL,
+    module TEXT NOT NULL,
+    category TEXT NOT NULL,
+    source TEXT NOT NULL,
+    status TEXT NOT NULL,
+    exit_code INTEGER,
+    queued_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL NOT NULL,
+    queue_wait REAL,
+    spawn REAL,
+    first_output REAL,
+    wall REAL,
+    output_path TEXT,
+    cpu_time REAL,
+    peak_rss INTEGER,
+    read_bytes INTEGER,
+    write_bytes INTEGER
+);
+-- Last N runs of a script
+CREATE INDEX IF NOT EXISTS runs_by_module ON runs (module, finished_at);
+-- Time ranges and retention
+CREATE INDEX IF NOT EXISTS runs_by_time ON runs (finished_at);
+-- Recent failures; successes are the bulk of the table and stay out of it
+CREATE INDEX IF NOT EXISTS failures_by_time ON runs (finished_at)
+    WHERE status != 'success';
+-- Resource trends; runs from before sampling, or with it off, stay out of it
+CREATE INDEX IF NOT EXISTS measured_by_module ON runs (module, finished_at)
+    WHERE cpu_time IS NOT NULL;
+
+-- A run's resource samples as a JSON list, apart so scans of runs stay small
+CREATE TABLE IF NOT EXISTS run_samples (
+    run_id INTEGER PRIMARY KEY,
+    samples TEXT NOT NULL
+);
+CREATE TRIGGER IF NOT EXISTS runs_samples_cleanup AFTER DELETE ON runs BEGIN
+    DELETE FROM run_samples WHERE run_id = OLD.id;
+END;
+
+-- Lifetime totals per script, kept up to date by the trigger below so stats
+-- never scan the runs table and survive retention
+CREATE TABLE IF NOT EXISTS script_stats (
+    module TEXT PRIMARY KEY,
+    script TEXT NOT NULL,
+    runs INTEGER NOT NULL,
+    failures INTEGER NOT NULL,
+    total_wall REAL NOT NULL,
+    max_wall REAL NOT NULL,
+    last_finished REAL NOT NULL,
+    last_status TEXT NOT NULL,
+    measured INTEGER NOT NULL DEFAULT 0,
+    total_cpu REAL NOT NULL DEFAULT 0,
+    max_rss INTEGER NOT NULL DEFAULT 0
+);
+CREATE TRIGGER IF NOT EXISTS runs_rollup AFTER INSERT ON runs BEGIN
+    INSERT INTO script_stats (
+        module, script, runs, failures, total_wall, max_wall,
+        last_finished, last_status, measured, total_cpu, max_rss
+    ) VALUES (
+        NEW.module, NEW.script, 1, NEW.status != 'success',
+        coalesce(NEW.wall, 0), coalesce(NEW.wall, 0),
+        NEW.finished_at, NEW.status, NEW.cpu_time IS NOT NULL,
+        coalesce(NEW.cpu_time, 0), coalesce(NEW.peak_rss, 0)
+    )
+    ON CONFLICT (module) DO UPDATE SET
+        script = NEW.script,
+        runs = runs + 1,
+        failures = failures + (NEW.status != 'success'),
+        total_wall = total_wall + coalesce(NEW.wall, 0),
+        max_wall = max(max_wall, coalesce(NEW.wall, 0)),
+        last_finished = max(last_finished, NEW.finished_at),
+        last_status = CASE WHEN NEW.finished_at >= last_finished
+            THEN NEW.status ELSE last_status END,
+        measured = measured + (NEW.cpu_time IS NOT NULL),
+        total_cpu = total_cpu + coalesce(NEW.cpu_time, 0),
+        max_rss = max(max_rss, coalesce(NEW.peak_rss, 0));
+END;
+"""
+
+# Upgrades a version 1 database in place; SCHEMA then adds what's new
+MIGRATE_V2 = """
+ALTER TABLE runs ADD COLUMN cpu_time REAL;
+ALTER TABLE runs ADD COLUMN peak_rss INTEGER;
+ALTER TABLE runs ADD COLUMN read_bytes INTEGER;
+ALTER TABLE runs ADD COLUMN write_bytes INTEGER;
+ALTER TABLE script_stats ADD COLUMN measured INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE script_stats ADD COLUMN total_cpu REAL NOT NULL DEFAULT 0;
+ALTER TABLE script_stats ADD COLUMN max_rss INTEGER NOT NULL DEFAULT 0;
+DROP TRIGGER runs_rollup;
+"""
+
+
+@dataclass
+class Run:
+    """One finished run as stored in the history database"""
+
+    script: str
+    module: str
+    category: str
+    source: str
+    status: str
+    exit_code: int | None = None
+    queued_at: float = 0.0
+    started_at: float | None = None
+    finished_at: float = 0.0
+    queue_wait: float | None = None
+    spawn: float | None = None
+    first_output: float | None = None
+    wall: float | None = None
+    output_path: str | None = None
+    # Totals over the run's process trees; None when it wasn't sampled
+    cpu_time: float | None = None
+    peak_rss: int | None = None
+    read_bytes: int | None = None
+    write_bytes: int | None = None
+    # [seconds, cpu, rss, read, written] rows; not loaded by queries
+    samples: list | None = None
+
+    @classmethod
+    def from_job(cls, job, source, error=None, result=None, **timings):
+        """Record for ``job``, which may still be finishing; ``timings`` are
+        seconds for queue_wait, spawn, first_output and wall, and the job's
+        resource usage is taken from ``job.resources`` when it was sampled"""
+        error = job.error if error is None else error
+        result = job.result if result is None else result
+        if isinstance(error, subprocess.CalledProcessError):
+            exit_code = error.returncode
+        elif error is None and result is not None:
+            exit_code = result.returncode
+        else:
+            exit_code = None
+        if timings.get("wall") is None and job.started is not None:
+            timings["wall"] = job.elapsed
+        if job.resources is not None:
+            timings.update(asdict(job.resources))
+        return cls(
+            script=job.script_name,
+            module=job.module,
+            category=job.category,
+            source=source,
+            status=run_status(error, job.cancelled),
+            exit_code=exit_code,
+            queued_at=job.created,
+            started_at=job.started,
+            finished_at=job.finished or time.time(),
+            **timings,
+        )
+
+
+COLUMNS = tuple(f.name for f in fields(Run) if f.name != "samples")
+_INSERT = (
+    f"INSERT INTO runs ({', '.join(COLUMNS)}) "
+    f"VALUES ({', '.join('?' * len(COLUMNS))})"
+)
+_SELECT = f"SELECT {', '.join(COLUMNS)} FROM runs"
+
+
+def _row(run) -> tuple:
+    """``run``'s values for _INSERT"""
+    return tuple(getattr(run, column) for column in COLUMNS)
+
+
+def open_store(config) -> "RunStore":
+    """RunStore at LAUNCHER_HISTORY_DB with the configured retention"""
+    return RunStore(
+        Path(config.get("LAUNCHER_HISTORY_DB", DB_PATH)),
+        retention_days=int(config.get("LAUNCHER_HISTORY_DAYS", RETENTION_DAYS)),
+        retention_runs=int(config.get("LAUNCHER_HISTORY_RUNS", RETENTION_RUNS)),
+    )
+
+
+def connect(path) -> sqlite3.Connection:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path, timeout=10, check_same_thread=False)
+    # auto_vacuum only takes effect before the first table is created
+    conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = NORMAL")
+    return conn
+
+
+class RunStore:
+    """Run history in SQLite, written in batches by a background thread
+
+    ``record(run)`` only queues the run, so callers on the Tk thread or a
+    runner thread never wait on the disk. Queries read through their own
+    connection; WAL mode lets them run while a batch is being written.
+    """
+
+    def __init__(
+        self,
+        path=DB_PATH,
+        retention_days=RETENTION_DAYS,
+        retention_runs=RETENTION_RUNS,
+    ):
+        self.path = path
+        self.retention_days = retention_days
+        self.retention_runs = retention_runs
+        self._queue = queue.Queue()
+        self._reader = None
+        self._reader_lock = threading.Lock()
+
+        conn = connect(path)
+        with conn:
+            if conn.execute("PRAGMA user_version").fetchone()[0] == 1:
+                conn.executescript(MIGRATE_V2)
+            conn.executescript(SCHEMA)
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self._writer = threading.Thread(target=self._write_loop, args=(conn,))
+        self._writer.daemon = True
+        self._writer.start()
+
+    def record(self, run: Run):
+        self._queue.put(run)
+
+    def flush(self, timeout=None):
+        """Wait until everything recorded so far is on disk"""
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def close(self):
+        self._queue.put(None)
+        self._writer.join()
+        with self._reader_lock:
+            if self._reader is not None:
+                self._reader.close()
+                self._reader = None
+
+    def _write_loop(self, conn):
+        try:
+            self._compact(conn)
+        except sqlite3.Error:
+            pass
+        written = 0
+        closing = False
+        while not closing:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + BATCH_DELAY
+            # A flush or close request ends the batch early
+            while isinstance(batch[-1], Run) and len(batch) < BATCH_SIZE:
+                try:
+                    batch.append(
+                        self._queue.get(timeout=max(0, deadline - time.monotonic()))
+                    )
+                except queue.Empty:
+                    break
+
+            runs = [item for item in batch if isinstance(item, Run)]
+            closing = batch[-1] is None
+            try:
+                if runs:
+                    with conn:
+                        for run in runs:
+                            run_id = conn.execute(_INSERT, _row(run)).lastrowid
+                            if run.samples:
+                                conn.execute(
+                                    "INSERT INTO run_samples VALUES (?, ?)",
+                                    (run_id, json.dumps(run.samples)),
+                                )
+                    written += len(runs)
+                if written >= COMPACT_EVERY:
+                    written = 0
+                    self._compact(conn)
+            except sqlite3.Error:
+                pass  # history is best effort; a locked or full disk loses a batch
+            for item in batch:
+                if isinstance(item, threading.Event):
+                    item.set()
+
+        try:
+            conn.execute("PRAGMA optimize")
+        except sqlite3.Error:
+            pass
+        conn.close()
+
+    def _compact(self, conn):
+        """Apply the retention policy and give freed pages back to the disk"""
+        with conn:
+            deleted = conn.execute(
+                "DELETE FROM runs WHERE finished_at < ?",
+                (time.time() - self.retention_days * 86400,),
+            ).rowcount
+            deleted += conn.execute(
+                "DELETE FROM runs WHERE id <= "
+                "(SELECT id FROM runs ORDER BY id DESC LIMIT 1 OFFSET ?)",
+                (self.retention_runs,),
+            ).rowcount
+        if deleted:
+            conn.execute("PRAGMA incremental_vacuum")
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def _query(self, sql, params=()):
+        with self._reader_lock:
+            if self._reader is None:
+                self._reader = connect(self.path)
+            return self._reader.execute(sql, params).fetchall()
+
+    def last_runs(self, module, limit=10) -> list:
+        """Most recent runs of ``module``, newest first"""
+        rows = self._query(
+            f"{_SELECT} WHERE module = ? ORDER BY finished_at DESC LIMIT ?",
+            (module, limit),
+        )
+        return [Run(*row) for row in rows]
+
+    def recent(self, since, limit=None) -> list:
+        """Runs that finished after ``since`` (epoch seconds), newest first"""
+        rows = self._query(
+            f"{_SELECT} WHERE finished_at >= ? ORDER BY finished_at DESC LIMIT ?",
+            (since, -1 if limit is None else limit),
+        )
+        return [Run(*row) for row in rows]
+
+    def failures(self, since, limit=None) -> list:
+        """Runs that didn't succeed since ``since``, newest first"""
+        rows = self._query(
+            f"{_SELECT} WHERE status != 'success' AND finished_at >= ? "
+            "ORDER BY finished_at DESC LIMIT ?",
+            (since, -1 if limit is None else limit),
+        )
+        return [Run(*row) for row in rows]
+
+    def stats(self) -> list:
+        """Lifetime rows of (module, script, runs, failures, mean wall,
+        max wall, last finished, last status, mean cpu, max rss), most
+        recently run first; mean cpu is None for scripts never sampled"""
+        return self._query(
+            "SELECT module, script, runs, failures, total_wall / runs, max_wall, "
+            "last_finished, last_status, total_cpu / nullif(measured, 0), "
+            "max_rss FROM script_stats "
+            "ORDER BY last_finished DESC"
+        )
+
+    def resource_trends(self, limit=20) -> dict:
+        """{module: [(cpu, peak rss, bytes read + written)]} of each script's
+        latest ``limit`` sampled runs, oldest first"""
+        # CROSS JOIN keeps script_stats outermost, so each script costs one
+        # index search rather than every run being checked
+        rows = self._query(
+            "SELECT runs.module, cpu_time, peak_rss, read_bytes + write_bytes "
+            "FROM script_stats CROSS JOIN runs ON runs.id IN ("
+            "SELECT id FROM runs WHERE module = script_stats.module "
+            "AND cpu_time IS NOT NULL ORDER BY finished_at DESC LIMIT ?) "
+            "ORDER BY runs.module, finished_at",
+            (limit,),
+        )
+        trends = {}
+        for module, *values in rows:
+            trends.setdefault(module, []).append(tuple(values))
+        return trends
+
+    def samples(self, module) -> list:
+        """Resource samples of the latest sampled run of ``module``"""
+        rows = self._query(
+            "SELECT samples FROM run_samples WHERE run_id = ("
+            "SELECT id FROM runs WHERE module = ? AND cpu_time IS NOT NULL "
+            "ORDER BY finished_at DESC LIMIT 1)",
+            (module,),
+        )
+        return json.loads(rows[0][0]) if rows else []
+
+    def starts(self, limit) -> list:
+        """(module, started) of the latest ``limit`` runs, oldest first"""
+        rows = self._query(
+            "SELECT module, coalesce(started_at, queued_at) FROM runs "
+            "ORDER BY id DESC LIMIT ?",
+            (limit,),
+        )
+        return rows[::-1]
+
+
+def week_start(now=None) -> float:
+    """Epoch seconds of the most recent local Monday midnight"""
+    local = time.localtime(time.time() if now is None else now)
+    # mktime normalises the day of month, and gets DST right
+    return time.mktime(
+        (local.tm_year, local.tm_mon, local.tm_mday - local.tm_wday, 0, 0, 0, 0, 0, -1)
+    )
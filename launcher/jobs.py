@@ -0,0 +1,238 @@
+import itertools
+import os
+import threading
+import time
+
+from launcher.pool import kill_tree
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+FINISHED_STATES = (DONE, FAILED, CANCELLED)
+
+# Given to Shift+clicked runs in the GUI so they start ahead of queued ones
+RUN_NEXT_PRIORITY = 10
+
+
+class Job:
+    """One requested script run, from queueing to its final state"""
+
+    def __init__(
+        self, job_id, script_name, module, category="", priority=0, context=None
+    ):
+        self.id = job_id
+        self.script_name = script_name
+        self.module = module
+        self.category = category
+        self.priority = priority
+        self.state = QUEUED
+        self.created = time.time()
+        self.started = None
+        self.finished = None
+        self.result = None
+        self.error = None
+        self.process = None
+        self.output = None
+        # Usage of the job's process trees, when a ResourceMonitor sampled it
+        self.resources = None
+        # Caller data for the runner, e.g. where a client wants output sent
+        self.context = context
+        self.cancelled = False
+        self._lock = threading.Lock()
+
+    @property
+    def elapsed(self):
+        if self.started is None:
+            return 0.0
+        return (self.finished or time.time()) - self.started
+
+    def attach(self, process):
+        """Record the process executing this job so it can be cancelled"""
+        with self._lock:
+            self.process = process
+            cancelled = self.cancelled
+        if cancelled:
+            kill_tree(process)
+
+    def cancel(self):
+        with self._lock:
+            self.cancelled = True
+            process = self.process
+        if process is not None:
+            kill_tree(process)
+
+
+class JobScheduler:
+    """Bounded pool of runner threads with priorities and concurrency limits
+
+    ``run(job)`` executes a job and returns its result, raising on failure; it
+    should call ``job.attach(process)`` once the child exists. Jobs wait in the
+    queue while the pool is full or their category or script is at its limit,
+    and higher ``priority`` jobs are started first. ``on_change(job)`` is
+    called from runner threads whenever a job changes state.
+    """
+
+    def __init__(
+        self,
+        run,
+        max_workers=None,
+        category_limit=None,
+        script_limit=1,
+        on_change=None,
+        history=200,
+    ):
+        self.run = run
+        self.max_workers = max_workers or os.cpu_count() or 2
+        self.category_limit = category_limit
+        self.script_limit = script_limit
+        self.on_change = on_change
+        self.history = history
+
+        self._jobs = {}
+        self._pending = []
+        self._running_categories = {}
+        self._running_modules = {}
+        self._threads = []
+        self._ids = itertools.count(1)
+        self._cond = threading.Condition()
+        self._closed = False
+
+    def submit(self, script_name, module, category="", priority=0, context=None) -> Job:
+        """Queue a run and return its Job"""
+        job = self._new_job(script_name, module, category, priority, context)
+        with self._cond:
+            if len(self._threads) < self.max_workers:
+                thread = threading.Thread(target=self._worker_loop, daemon=True)
+                self._threads.append(thread)
+                thread.start()
+            self._cond.notify()
+        self._changed(job)
+        return job
+
+    def _new_job(self, script_name, module, category, priority, context) -> Job:
+        with self._cond:
+            job = Job(next(self._ids), script_name, module, category, priority, context)
+            self._jobs[job.id] = job
+            self._pending.append(job)
+            self._trim_history()
+        return job
+
+    def cancel(self, job_id) -> bool:
+        """Cancel a queued or running job; False if it already finished"""
+        with self._cond:
+            job = self._jobs.get(job_id)
+            if job is None or job.state in FINISHED_STATES:
+                return False
+            if job.state == QUEUED:
+                self._pending.remove(job)
+                self._finish(job, CANCELLED)
+                notify = True
+            else:
+                notify = False
+        if notify:
+            self._changed(job)
+        else:
+            job.cancel()
+        return True
+
+    def jobs(self):
+        """Snapshot of tracked jobs, newest first"""
+        with self._cond:
+            return sorted(self._jobs.values(), key=lambda j: j.id, reverse=True)
+
+    def active(self) -> int:
+        """Number of jobs running right now"""
+        with self._cond:
+            return sum(self._running_modules.values())
+
+    def shutdown(self, cancel_running=False):
+        with self._cond:
+            self._closed = True
+            pending, self._pending = self._pending, []
+            for job in pending:
+                self._finish(job, CANCELLED)
+            running = [j for j in self._jobs.values() if j.state == RUNNING]
+            self._cond.notify_all()
+        if cancel_running:
+            for job in running:
+                job.cancel()
+
+    def _trim_history(self):
+        """Forget the oldest finished jobs beyond ``history``"""
+        excess = len(self._jobs) - self.history
+        for job in sorted(self._jobs.values(), key=lambda j: j.id):
+            if excess <= 0:
+                break
+            if job.state in FINISHED_STATES:
+                del self._jobs[job.id]
+                excess -= 1
+
+    def _allowed(self, job):
+        if self.category_limit and job.category:
+            if self._running_categories.get(job.category, 0) >= self.category_limit:
+                return False
+        if self.script_limit:
+            if self._running_modules.get(job.module, 0) >= self.script_limit:
+                return False
+        return True
+
+    def _next_job(self):
+        """Highest priority runnable job, oldest first among equals"""
+        for job in sorted(self._pending, key=lambda j: (-j.priority, j.id)):
+            if self._allowed(job):
+                return job
+        return None
+
+    def _start(self, job):
+        """Move ``job`` from the queue to running; caller holds the lock"""
+        self._pending.remove(job)
+        job.state = RUNNING
+        job.started = time.time()
+        self._running_categories[job.category] = (
+            self._running_categories.get(job.category, 0) + 1
+        )
+        self._running_modules[job.module] = self._running_modules.get(job.module, 0) + 1
+
+    def _stop(self, job):
+        self._running_categories[job.category] -= 1
+        self._running_modules[job.module] -= 1
+
+    def _finish(self, job, state):
+        job.state = state
+        job.finished = time.time()
+
+    def _changed(self, job):
+        if self.on_change:
+            self.on_change(job)
+
+    def _worker_loop(self):
+        while True:
+            with self._cond:
+                job = self._next_job()
+                while job is None and not self._closed:
+                    self._cond.wait()
+                    job = self._next_job()
+                if job is None:
+                    return
+
+                self._start(job)
+            self._changed(job)
+
+            try:
+                job.result = self.run(job)
+                state = DONE
+            except Exception as e:
+                job.error = e
+                state = FAILED
+            if job.cancelled:
+                state = CANCELLED
+
+            with self._cond:
+                self._finish(job, state)
+                self._stop(job)
+                # A finished job may unblock others held back by a limit
+                self._cond.notify_all()
+            self._changed(job)
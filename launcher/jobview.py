@@ -0,0 +1,200 @@
+import tkinter as tk
+from tkinter import ttk
+
+from launcher.jobs import FINISHED_STATES
+from launcher.widgets import ModernButton, Theme
+
+# (column id, heading, width)
+COLUMNS = (
+    ("id", "#", 40),
+    ("script", "Script", 190),
+    ("category", "Category", 90),
+    ("state", "State", 80),
+    ("priority", "Priority", 60),
+    ("elapsed", "Time", 70),
+)
+
+REFRESH_MS = 1000
+
+# Lines kept in the output pane; older ones scroll off the top
+MAX_PANE_LINES = 2000
+
+
+class JobTable:
+    """Window listing queued, running and finished jobs, with cancellation
+
+    With an UpdatePump, output notifications are applied on its frames.
+    """
+
+    def __init__(self, root, scheduler, pump=None):
+        self.root = root
+        self.scheduler = scheduler
+        self.pump = pump
+        self.window = None
+        self._tick = None
+        self._shown = None
+        self._seen = 0
+        # Unfinished last line shown at the bottom of the output pane
+        self._partial = ""
+        self._output_pending = False
+
+    def open(self, event=None):
+        if self.window is not None:
+            self.window.lift()
+            return "break"
+
+        self.window = tk.Toplevel(self.root, bg=Theme.BG_PRIMARY)
+        self.window.title("Jobs")
+        self.window.geometry("560x360")
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+
+        toolbar = tk.Frame(self.window, bg=Theme.BG_PRIMARY)
+        toolbar.pack(fill="x", padx=Theme.PADDING_M, pady=(Theme.PADDING_M, 0))
+
+        cancel_btn = ModernButton(
+            toolbar,
+            text="Cancel Selected",
+            style="secondary",
+            command=self._cancel_selected,
+            font=Theme.FONT_BUTTON,
+            pady=4,
+        )
+        cancel_btn.pack(side="right")
+
+        panes = tk.PanedWindow(
+            self.window, orient="vertical", bg=Theme.BORDER, bd=0, sashwidth=4
+        )
+        panes.pack(fill="both", expand=True, padx=Theme.PADDING_M, pady=Theme.PADDING_M)
+
+        self.tree = ttk.Treeview(
+            panes, columns=[c[0] for c in COLUMNS], show="headings", height=6
+        )
+        for column, heading, width in COLUMNS:
+            self.tree.heading(column, text=heading)
+            self.tree.column(column, width=width, anchor="w")
+        self.tree.bind("<Delete>", lambda e: self._cancel_selected())
+        self.tree.bind("<<TreeviewSelect>>", lambda e: self._on_select())
+        panes.add(self.tree, minsize=80)
+
+        # Live output of the selected job
+        self.output = tk.Text(
+            panes,
+            bg=Theme.BG_SECONDARY,
+            fg=Theme.TEXT_PRIMARY,
+            font=("Consolas", 9),
+            relief="flat",
+            wrap="none",
+            state="disabled",
+        )
+        panes.add(self.output, minsize=80)
+
+        self.refresh()
+        jobs = self.scheduler.jobs()
+        if jobs:
+            self.tree.selection_set(str(jobs[0].id))
+        return "break"
+
+    def close(self):
+        if self._tick is not None:
+            self.root.after_cancel(self._tick)
+            self._tick = None
+        if self.window is not None:
+            self.window.destroy()
+            self.window = None
+        self._shown = None
+
+    def refresh(self):
+        """Sync the table with the scheduler; cheap enough to call on every change"""
+        if self.window is None:
+            return
+
+        jobs = self.scheduler.jobs()
+        seen = set()
+        for position, job in enumerate(jobs):
+            iid = str(job.id)
+            seen.add(iid)
+            values = (
+                job.id,
+                job.script_name,
+                job.category,
+                job.state,
+                job.priority,
+                f"{job.elapsed:.1f}s" if job.started else "",
+            )
+            if self.tree.exists(iid):
+                self.tree.item(iid, values=values)
+                self.tree.move(iid, "", position)
+            else:
+                self.tree.insert("", position, iid=iid, values=values)
+
+        for iid in self.tree.get_children():
+            if iid not in seen:
+                self.tree.delete(iid)
+
+        # Keep elapsed times ticking while anything is still in flight
+        if self._tick is not None:
+            self.root.after_cancel(self._tick)
+            self._tick = None
+        if any(job.state not in FINISHED_STATES for job in jobs):
+            self._tick = self.root.after(REFRESH_MS, self.refresh)
+        self._pull_output()
+
+    def _on_select(self):
+        selection = self.tree.selection()
+        job = None
+        if selection:
+            job = next(
+                (j for j in self.scheduler.jobs() if str(j.id) == selection[0]), None
+            )
+        if job is self._shown:
+            return
+
+        self._shown = job
+        self._seen = 0
+        self._partial = ""
+        self.output.config(state="normal")
+        self.output.delete("1.0", "end")
+        self.output.config(state="disabled")
+        self._pull_output()
+
+    def notify_output(self, job):
+        """Called from any thread when ``job`` printed something"""
+        if job is not self._shown:
+            return
+        if self.pump is not None:
+            self.pump.post("job-output", self._pull_output)
+        elif not self._output_pending:
+            self._output_pending = True
+            self.root.after(0, self._pull_output)
+
+    def _pull_output(self):
+        self._output_pending = False
+        job = self._shown
+        buffer = job.output if job is not None else None
+        if self.window is None or buffer is None:
+            return
+
+        total, lines = buffer.lines_since(self._seen)
+        partial = buffer.partial()
+        self._seen = total
+        if not lines and partial == self._partial:
+            return
+
+        at_end = self.output.yview()[1] >= 1.0
+        self.output.config(state="normal")
+        # The partial line is redrawn, complete or with what was added since
+        if self._partial:
+            self.output.delete("end-1c linestart", "end-1c")
+        self.output.insert("end", "".join(line + "\n" for line in lines) + partial)
+        self._partial = partial
+        excess = int(self.output.index("end-1c").split(".")[0]) - MAX_PANE_LINES
+        if excess > 0:
+            self.output.delete("1.0", f"{excess + 1}.0")
+        self.output.config(state="disabled")
+        if at_end:
+            self.output.see("end")
+
+    def _cancel_selected(self):
+        for iid in self.tree.selection():
+            self.scheduler.cancel(int(iid))
+        self.refresh()
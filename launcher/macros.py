@@ -0,0 +1,454 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import asdict, dataclass, field
+
+from launcher.config import ScriptEntry
+from launcher.metrics import run_status
+from launcher.pool import kill_tree
+
+# Macros join the registry as scripts whose module is this prefix plus the
+# macro's name; a real module path can't contain a colon
+MACRO_PREFIX = "macro:"
+
+# Category whose page lists a macro that doesn't name one
+DEFAULT_CATEGORY = "morning"
+
+# What a failing step does to the rest of the macro: "stop" runs nothing
+# after its stage, "skip" carries on with the next stage
+FAILURE_POLICIES = ("stop", "skip")
+
+# Status of a step that never started
+NOT_RUN = "not run"
+
+
+@dataclass(frozen=True)
+class Stage:
+    """Scripts run side by side; the next stage starts when all have ended"""
+
+    refs: tuple
+    on_failure: str = "stop"
+
+
+@dataclass(frozen=True)
+class Macro:
+    """A routine of registry scripts in sequential stages, run as one job"""
+
+    name: str
+    category: str
+    stages: tuple
+    timeout: float | None = None
+
+    @property
+    def module(self) -> str:
+        return MACRO_PREFIX + self.name
+
+    @property
+    def entry(self) -> ScriptEntry:
+        return ScriptEntry(self.name, self.module, self.category)
+
+    @property
+    def width(self) -> int:
+        """Most steps running at once"""
+        return max(len(stage.refs) for stage in self.stages)
+
+
+def is_macro(module) -> bool:
+    return module.startswith(MACRO_PREFIX)
+
+
+def _parse_stage(item, on_failure):
+    if isinstance(item, dict):
+        on_failure = item.get("on_failure", on_failure)
+        item = item.get("run")
+    refs = (item,) if isinstance(item, str) else tuple(item or ())
+    if not refs or not all(isinstance(ref, str) and ref for ref in refs):
+        raise ValueError(f"step {item!r} names no scripts")
+    if on_failure not in FAILURE_POLICIES:
+        raise ValueError(f"on_failure {on_failure!r}")
+    return Stage(refs, on_failure)
+
+
+def parse_macros(raw, problems=None) -> dict:
+    """Validate LAUNCHER_MACROS JSON into Macro objects by name
+
+    The setting is a list of objects with ``name`` and ``steps``, and
+    optionally ``category``, ``on_failure`` and a per-step ``timeout`` in
+    seconds. A step is a script (category/name or module), a list of scripts
+    to run in parallel, or an object with ``run`` and its own ``on_failure``.
+    """
+    problems = [] if problems is None else problems
+    if not raw:
+        return {}
+
+    try:
+        data = json.loads(raw)
+    except ValueError as e:
+        problems.append(f"LAUNCHER_MACROS is not valid JSON: {e}")
+        return {}
+    if not isinstance(data, list):
+        problems.append("LAUNCHER_MACROS must be a list of macros")
+        return {}
+
+    macros = {}
+    for item in data:
+        if not isinstance(item, dict) or not item.get("name"):
+            problems.append(f"Skipping macro {item!r}: it needs a name")
+            continue
+        name = str(item["name"])
+        on_failure = item.get("on_failure", "stop")
+        timeout = item.get("timeout")
+        try:
+            stages = tuple(
+                _parse_stage(step, on_failure) for step in item.get("steps") or ()
+            )
+            if not stages:
+                raise ValueError("no steps")
+            if timeout is not None:
+                timeout = float(timeout)
+        except (TypeError, ValueError) as e:
+            problems.append(f"Skipping macro {name!r}: {e}")
+            continue
+        if name in macros:
+            problems.append(f"Skipping macro {name!r}: defined twice")
+            continue
+        category = str(item.get("category") or DEFAULT_CATEGORY)
+        macros[name] = Macro(name, category, stages, timeout)
+    return macros
+
+
+def lookup(config, module) -> Macro:
+    """The macro ``module`` stands for in ``config``; LookupError if gone"""
+    macro = config.macros.get(module[len(MACRO_PREFIX) :])
+    if macro is None:
+        raise LookupError(f"Unknown macro: {module[len(MACRO_PREFIX) :]}")
+    return macro
+
+
+@dataclass
+class StepResult:
+    """One script of a macro run, with its timings"""
+
+    script: ScriptEntry
+    stage: int
+    status: str = NOT_RUN
+    exit_code: int | None = None
+    started_at: float | None = None
+    finished_at: float | None = None
+    first_output: float | None = None
+    wall: float | None = None
+    # With a ResourceMonitor: its RunUsage while running, then the Usage
+    resources: object = None
+
+    def run(self, source):
+        """The step as a run history record"""
+        from launcher.history import Run
+
+        return Run(
+            script=self.script.name,
+            module=self.script.module,
+            category=self.script.category,
+            source=source,
+            status=self.status,
+            exit_code=self.exit_code,
+            queued_at=self.started_at,
+            started_at=self.started_at,
+            finished_at=self.finished_at,
+            first_output=self.first_output,
+            wall=self.wall,
+            **(asdict(self.resources) if self.resources is not None else {}),
+        )
+
+
+class MacroFailed(subprocess.CalledProcessError):
+    """A step failed, under either policy; str() is the combined status"""
+
+    def __init__(self, result):
+        super().__init__(result.returncode, result.macro.module)
+        self.result = result
+
+    def __str__(self):
+        return self.result.summary
+
+
+@dataclass
+class MacroResult:
+    """Outcome of a macro run; quacks like CompletedProcess for the callers"""
+
+    macro: Macro
+    steps: list
+    stopped: bool = False
+    wall: float = 0.0
+    args: list = field(default_factory=list)
+
+    @property
+    def failed(self) -> bool:
+        """Whether any step that ran didn't succeed"""
+        return any(step.status not in ("success", NOT_RUN) for step in self.steps)
+
+    @property
+    def returncode(self) -> int:
+        """The first failing step's exit code, 1 if none had one, else 0"""
+        if not self.failed:
+            return 0
+        codes = [step.exit_code for step in self.steps if step.exit_code]
+        return codes[0] if codes else 1
+
+    @property
+    def summary(self) -> str:
+        """One combined status, e.g. "3/4 steps succeeded, 1 failed" """
+        counts = {}
+        for step in self.steps:
+            counts[step.status] = counts.get(step.status, 0) + 1
+        ok = counts.pop("success", 0)
+        text = f"{ok}/{len(self.steps)} steps succeeded"
+        for status, count in counts.items():
+            text += f", {count} {status}"
+        if self.stopped:
+            text += "; stopped"
+        return text
+
+    def table(self) -> str:
+        """Per-step timings, one line each"""
+        lines = []
+        for step in self.steps:
+            wall = "" if step.wall is None else f"{step.wall:.2f}s"
+            exit_code = f" (exit {step.exit_code})" if step.exit_code else ""
+            lines.append(f"  {step.status:<9} {wall:>8}  {step.script.name}{exit_code}")
+        return "\n".join(lines)
+
+    def check_returncode(self):
+        if self.failed:
+            raise MacroFailed(self)
+
+
+class _StepOutput:
+    """Passes a step's output on a line at a time, prefixed with its name"""
+
+    def __init__(self, step, on_output, lock):
+        self.step = step
+        self.prefix = f"[{step.script.name}] "
+        self.on_output = on_output
+        self.lock = lock
+        self._partial = ""
+        self._started = time.monotonic()
+
+    def write(self, text):
+        if self.step.first_output is None:
+            self.step.first_output = time.monotonic() - self._started
+        lines = (self._partial + text).split("\n")
+        self._partial = lines.pop()
+        if lines:
+            self._emit(lines)
+
+    def close(self):
+        if self._partial:
+            self._emit([self._partial])
+            self._partial = ""
+
+    def _emit(self, lines):
+        with self.lock:
+            self.on_output("".join(f"{self.prefix}{line}\n" for line in lines))
+
+
+class MacroRun:
+    """Bookkeeping of one macro run, shared by the thread and asyncio drivers
+
+    Refs are resolved against the registry up front, so a typo fails the job
+    before anything has run. ``stages()`` yields the steps of each stage in
+    turn and ends early once a failure under the "stop" policy was seen.
+    With a ResourceMonitor each step's process trees are sampled on their
+    own, for the step's history record.
+    """
+
+    def __init__(self, macro, scripts, on_output=None, on_step=None, monitor=None):
+        from launcher.cli import resolve
+
+        self.macro = macro
+        self.on_output = on_output
+        self.on_step = on_step
+        self.monitor = monitor
+        self.steps = []
+        self._stage_steps = []
+        self._lock = threading.Lock()
+        self.stopped = False
+        self.started = time.monotonic()
+        for index, stage in enumerate(macro.stages):
+            group = []
+            for ref in stage.refs:
+                script = resolve(scripts, ref)
+                if script is None:
+                    raise LookupError(f"{macro.name}: unknown script {ref}")
+                if is_macro(script.module):
+                    raise LookupError(f"{macro.name}: can't run macro {ref}")
+                group.append(StepResult(script, index))
+            self.steps.extend(group)
+            self._stage_steps.append((stage, group))
+
+    def stages(self):
+        for stage, group in self._stage_steps:
+            if self.stopped:
+                return
+            yield group
+            if stage.on_failure == "stop" and any(
+                step.status != "success" for step in group
+            ):
+                self.stopped = True
+
+    def output(self, step):
+        if self.on_output is None:
+            return None
+        return _StepOutput(step, self.on_output, self._lock)
+
+    def begin(self, step, output, on_start):
+        """Mark ``step`` started; returns the on_start callback for its run"""
+        step.started_at = time.time()
+        self._write(f"-- {step.script.name} started\n")
+        if self.monitor is None:
+            return on_start
+        step.resources = usage = self.monitor.track()
+
+        def start(process):
+            usage.add(process)
+            if on_start is not None:
+                on_start(process)
+
+        return start
+
+    def end(self, step, output, error=None, result=None, cancelled=False):
+        if output is not None:
+            output.close()
+        if step.resources is not None:
+            step.resources = step.resources.stop()
+        step.finished_at = time.time()
+        step.wall = step.finished_at - step.started_at
+        step.status = run_status(error, cancelled)
+        if isinstance(error, subprocess.CalledProcessError):
+            step.exit_code = error.returncode
+        elif result is not None:
+            step.exit_code = result.returncode
+        self._write(f"-- {step.script.name}: {step.status} in {step.wall:.2f}s\n")
+        if self.on_step is not None:
+            self.on_step(step)
+
+    def finish(self) -> MacroResult:
+        result = MacroResult(
+            self.macro,
+            self.steps,
+            stopped=self.stopped,
+            wall=time.monotonic() - self.started,
+            args=[self.macro.module],
+        )
+        self._write(f"-- {self.macro.name}: {result.summary}\n{result.table()}\n")
+        return result
+
+    def _write(self, text):
+        if self.on_output is not None:
+            with self._lock:
+                self.on_output(text)
+
+
+def run_macro(
+    job,
+    macro,
+    scripts,
+    pool,
+    timeout=None,
+    on_start=None,
+    on_output=None,
+    on_step=None,
+    monitor=None,
+) -> MacroResult:
+    """Run ``macro`` as ``job`` on a WorkerPool, a thread per parallel step
+
+    Every step gets the pool's resolved environment, and warm workers when
+    the pool has them. ``on_start`` defaults to ``job.attach``, and
+    ``on_step(step)`` is called as each step ends.
+    """
+    run = MacroRun(macro, scripts, on_output, on_step, monitor)
+    timeout = timeout if macro.timeout is None else macro.timeout
+    attach = job.attach if on_start is None else on_start
+    processes = []
+
+    def started(process):
+        processes.append(process)
+        attach(process)
+
+    def run_step(step):
+        output = run.output(step)
+        step_started = run.begin(step, output, started)
+        try:
+            result = pool.run(
+                step.script.module,
+                timeout=timeout,
+                on_start=step_started,
+                on_output=output.write if output is not None else None,
+            )
+            result.check_returncode()
+        except Exception as e:
+            run.end(step, output, e, cancelled=job.cancelled)
+        else:
+            run.end(step, output, result=result)
+
+    for group in run.stages():
+        if job.cancelled:
+            break
+        if len(group) == 1:
+            run_step(group[0])
+            continue
+        with ThreadPoolExecutor(len(group)) as executor:
+            futures = [executor.submit(run_step, step) for step in group]
+            # Job.cancel() only kills the last process attached; take down
+            # the rest of the group too
+            while wait(futures, 0.25).not_done:
+                if job.cancelled:
+                    for process in processes:
+                        kill_tree(process)
+    return run.finish()
+
+
+async def run_macro_async(
+    macro,
+    scripts,
+    pool,
+    timeout=None,
+    on_start=None,
+    on_output=None,
+    on_step=None,
+    monitor=None,
+) -> MacroResult:
+    """Run ``macro`` on an AsyncWorkerPool; parallel steps are gathered
+
+    Cancelling the task cancels the steps in flight, which kills their
+    process trees, and propagates CancelledError.
+    """
+    run = MacroRun(macro, scripts, on_output, on_step, monitor)
+    timeout = timeout if macro.timeout is None else macro.timeout
+
+    async def run_step(step):
+        output = run.output(step)
+        step_started = run.begin(step, output, on_start)
+        try:
+            result = await pool.run(
+                step.script.module,
+                timeout=timeout,
+                on_start=step_started,
+                on_output=output.write if output is not None else None,
+            )
+            result.check_returncode()
+        except asyncio.CancelledError:
+            run.end(step, output, cancelled=True)
+            raise
+        except Exception as e:
+            run.end(step, output, e)
+        else:
+            run.end(step, output, result=result)
+
+    for group in run.stages():
+        await asyncio.gather(*(run_step(step) for step in group))
+    return run.finish()
@@ -0,0 +1,195 @@
+import math
+import os
+import subprocess
+import threading
+from collections import deque
+
+# Histogram bucket upper bounds, in seconds
+BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+    math.inf,
+)
+
+# Recent samples kept per histogram for exact-ish percentiles
+SAMPLE_WINDOW = 1000
+
+# name -> help text, in export order
+RUN_METRICS = {
+    "queue_wait": "Time a run waited in the job queue",
+    "spawn": "Time from dispatch until the run's process was executing it",
+    "first_output": "Time from dispatch until the run printed its first output",
+    "wall": "Total wall time of the run from dispatch to exit",
+}
+
+
+def run_status(error=None, cancelled=False) -> str:
+    """Exit status label for a finished run"""
+    if cancelled:
+        return "cancelled"
+    if error is None:
+        return "success"
+    if isinstance(error, subprocess.TimeoutExpired):
+        return "timeout"
+    if isinstance(error, subprocess.CalledProcessError):
+        return "failed"
+    return "error"
+
+
+class Histogram:
+    """Cumulative buckets for export plus a window of samples for percentiles"""
+
+    def __init__(self):
+        self.counts = [0] * len(BUCKETS)
+        self.count = 0
+        self.sum = 0.0
+        self.samples = deque(maxlen=SAMPLE_WINDOW)
+
+    def observe(self, value: float):
+        self.count += 1
+        self.sum += value
+        self.samples.append(value)
+        for i, bound in enumerate(BUCKETS):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+
+    def quantile(self, q: float):
+        """Nearest-rank percentile over the recent samples; None when empty"""
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        rank = max(0, math.ceil(q * len(ordered)) - 1)
+        return ordered[rank]
+
+
+class ScriptStats:
+    def __init__(self):
+        self.histograms = {name: Histogram() for name in RUN_METRICS}
+        self.statuses = {}
+
+    @property
+    def runs(self):
+        return sum(self.statuses.values())
+
+
+class MetricsRegistry:
+    """Per-script run latency histograms and exit statuses"""
+
+    def __init__(self):
+        self._scripts = {}
+        self._lock = threading.Lock()
+        # Writes share a temp file, so one at a time
+        self._file_lock = threading.Lock()
+
+    def record_run(self, script: str, status: str, **timings):
+        """Record one finished run; ``timings`` are seconds keyed by RUN_METRICS"""
+        with self._lock:
+            stats = self._scripts.setdefault(script, ScriptStats())
+            stats.statuses[status] = stats.statuses.get(status, 0) + 1
+            for name, value in timings.items():
+                if value is not None:
+                    stats.histograms[name].observe(value)
+
+    def summary(self):
+        """Rows of (script, runs, failures, {metric: (p50, p95, p99)})"""
+        rows = []
+        with self._lock:
+            for script, stats in sorted(self._scripts.items()):
+                percentiles = {
+                    name: tuple(h.quantile(q) for q in (0.5, 0.95, 0.99))
+                    for name, h in stats.histograms.items()
+                }
+                failures = stats.runs - stats.statuses.get("success", 0)
+                rows.append((script, stats.runs, failures, percentiles))
+        return rows
+
+    def to_openmetrics(self) -> str:
+        """Render every metric in the OpenMetrics text format"""
+        lines = []
+        with self._lock:
+            scripts = sorted(self._scripts.items())
+
+            for name, help_text in RUN_METRICS.items():
+                metric = f"launcher_run_{name}_seconds"
+                lines.append(f"# TYPE {metric} histogram")
+                lines.append(f"# UNIT {metric} seconds")
+                lines.append(f"# HELP {metric} {help_text}.")
+                for script, stats in scripts:
+                    histogram = stats.histograms[name]
+                    label = f'script="{_escape(script)}"'
+                    cumulative = 0
+                    for bound, count in zip(BUCKETS, histogram.counts):
+                        cumulative += count
+                        le = "+Inf" if bound == math.inf else repr(bound)
+                        lines.append(
+                            f'{metric}_bucket{{{label},le="{le}"}} {cumulative}'
+                        )
+                    lines.append(f"{metric}_count{{{label}}} {histogram.count}")
+                    lines.append(f"{metric}_sum{{{label}}} {histogram.sum:.6f}")
+
+            lines.append("# TYPE launcher_runs counter")
+            lines.append("# HELP launcher_runs Finished runs by exit status.")
+            for script, stats in scripts:
+                for status, count in sorted(stats.statuses.items()):
+                    lines.append(
+                        f'launcher_runs_total{{script="{_escape(script)}",'
+                        f'status="{status}"}} {count}'
+                    )
+
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+    def write_file(self, path):
+        """Atomically write the OpenMetrics export to ``path``"""
+        text = self.to_openmetrics()
+        with self._file_lock:
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                tmp = path.with_suffix(".tmp")
+                tmp.write_text(text, encoding="utf-8")
+                os.replace(tmp, path)
+            except OSError:
+                pass
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def serve(registry, port: int, host: str = "127.0.0.1"):
+    """Expose ``registry`` at http://host:port/metrics from a daemon thread"""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.rstrip("/") not in ("", "/metrics"):
+                self.send_error(404)
+                return
+            body = registry.to_openmetrics().encode("utf-8")
+            self.send_response(200)
+            self.send_header(
+                "Content-Type",
+                "application/openmetrics-text; version=1.0.0; charset=utf-8",
+            )
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
@@ -0,0 +1,90 @@
+import itertools
+import threading
+import time
+from collections import deque
+
+# Longest line kept; longer ones are truncated, and output without newlines,
+# like a binary dump, is cut into lines of this many characters
+MAX_LINE_CHARS = 4096
+
+
+def _shown(line: str) -> str:
+    """What a terminal shows of ``line``: the text after its last carriage
+    return, so progress bars redrawn with \r keep only their final state"""
+    return line.rstrip("\r").rpartition("\r")[2]
+
+
+class OutputBuffer:
+    """Bounded ring buffer holding the most recent output lines of one job
+
+    Memory stays fixed at ``max_lines`` of at most MAX_LINE_CHARS however
+    much a script prints; with a ``spill_path`` the complete output is also
+    appended to that file. Lines are numbered from the start of the run so a
+    reader can poll for what's new, and ``partial()`` is the line still
+    being printed.
+    """
+
+    def __init__(self, max_lines: int = 2000, spill_path=None):
+        self._lines = deque(maxlen=max_lines)
+        self._partial = ""
+        self._lock = threading.Lock()
+        self.total = 0
+        self.started = time.monotonic()
+        self.first_output = None
+        self.spill_path = spill_path
+        self._spill = None
+        if spill_path is not None:
+            spill_path.parent.mkdir(parents=True, exist_ok=True)
+            self._spill = open(spill_path, "a", encoding="utf-8", errors="replace")
+
+    def write(self, text: str):
+        if not text:
+            return
+        with self._lock:
+            if self.first_output is None:
+                self.first_output = time.monotonic() - self.started
+            if self._spill is not None:
+                self._spill.write(text)
+
+            lines = (self._partial + text).split("\n")
+            partial = lines.pop()
+            # Only the last \r-separated part can still be shown; a \r at the
+            # very end may belong to a \r\n split across writes
+            partial = partial[partial.rfind("\r", 0, len(partial) - 1) + 1 :]
+            lines = [_shown(line)[:MAX_LINE_CHARS] for line in lines]
+            while len(partial) > MAX_LINE_CHARS:
+                lines.append(partial[:MAX_LINE_CHARS])
+                partial = partial[MAX_LINE_CHARS:]
+            self._partial = partial
+            self._lines.extend(lines)
+            self.total += len(lines)
+
+    def close(self):
+        """Flush a trailing partial line and close the spill file"""
+        with self._lock:
+            if self._partial:
+                self._lines.append(_shown(self._partial))
+                self.total += 1
+                self._partial = ""
+            if self._spill is not None:
+                self._spill.close()
+                self._spill = None
+
+    def lines_since(self, seen: int):
+        """Return (total, lines) for every complete line after the first ``seen``
+
+        Lines that already fell out of the ring are skipped, so a slow reader
+        simply misses the oldest output instead of holding it in memory.
+        """
+        with self._lock:
+            available = self.total - len(self._lines)
+            start = max(seen, available) - available
+            return self.total, list(itertools.islice(self._lines, start, None))
+
+    def partial(self) -> str:
+        """The line being printed, not yet ended by a newline"""
+        with self._lock:
+            return _shown(self._partial)
+
+    def text(self) -> str:
+        return "\n".join(self.lines_since(0)[1])
@@ -0,0 +1,100 @@
+import tkinter as tk
+
+from launcher.jobs import RUN_NEXT_PRIORITY
+from launcher.widgets import Theme, VirtualList
+
+# More than a screenful; the list is virtualized so this costs nothing to show
+MAX_RESULTS = 200
+
+
+class CommandPalette:
+    """Keyboard-activated search over every script in every category"""
+
+    def __init__(self, root, index, on_run, on_hover=None):
+        self.root = root
+        self.index = index
+        self.on_run = on_run
+        # Told about the script that would run on Enter, e.g. to prepare it
+        self.on_hover = on_hover
+        self.window = None
+
+    def open(self, event=None):
+        if self.window is not None:
+            self.window.lift()
+            self.entry.focus_set()
+            return "break"
+
+        self.window = tk.Toplevel(self.root, bg=Theme.BG_PRIMARY)
+        self.window.title("Run Script")
+        self.window.transient(self.root)
+        self.window.geometry(
+            f"520x420+{self.root.winfo_rootx() + 30}+{self.root.winfo_rooty() + 60}"
+        )
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+
+        self.query = tk.StringVar()
+        self.entry = tk.Entry(
+            self.window,
+            textvariable=self.query,
+            font=Theme.FONT_BUTTON_LARGE,
+            bg=Theme.BG_SECONDARY,
+            fg=Theme.TEXT_PRIMARY,
+            relief="flat",
+            insertbackground=Theme.TEXT_PRIMARY,
+        )
+        self.entry.pack(
+            fill="x", padx=Theme.PADDING_M, pady=Theme.PADDING_M, ipady=Theme.PADDING_S
+        )
+
+        self.results = VirtualList(
+            self.window,
+            label=lambda script: f"{script.name}  ·  {script.category}",
+            on_select=self._run,
+            on_hover=self.on_hover,
+            on_shift_select=lambda script: self._run(script, RUN_NEXT_PRIORITY),
+        )
+        self.results.pack(
+            fill="both", expand=True, padx=Theme.PADDING_M, pady=(0, Theme.PADDING_M)
+        )
+
+        self.query.trace_add("write", lambda *args: self._refresh())
+        self.entry.bind("<Return>", lambda e: self._run(self.results.selected_item()))
+        # Shift+Enter puts the run ahead of anything already queued
+        self.entry.bind(
+            "<Shift-Return>",
+            lambda e: self._run(self.results.selected_item(), RUN_NEXT_PRIORITY),
+        )
+        self.entry.bind("<Down>", lambda e: self._move(1))
+        self.entry.bind("<Up>", lambda e: self._move(-1))
+        self.window.bind("<Escape>", lambda e: self.close())
+
+        self._refresh()
+        self.entry.focus_set()
+        return "break"
+
+    def close(self):
+        if self.window is not None:
+            self.window.destroy()
+            self.window = None
+
+    def _refresh(self):
+        matches = self.index.search(self.query.get(), limit=MAX_RESULTS)
+        self.results.set_items(matches)
+        self.results.select(0 if matches else None)
+        self._highlighted()
+
+    def _move(self, step):
+        if self.results.selected is not None:
+            self.results.select(self.results.selected + step)
+            self._highlighted()
+        return "break"
+
+    def _highlighted(self):
+        if self.on_hover:
+            self.on_hover(self.results.selected_item())
+
+    def _run(self, script, priority=0):
+        if script is None:
+            return
+        self.close()
+        self.on_run(script.name, script.module, script.category, priority)
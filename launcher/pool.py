@@ -0,0 +1,292 @@
+import codecs
+import json
+import os
+import queue
+import signal
+import subprocess
+import sys
+import threading
+import time
+
+# Every run gets its own process group so cancelling can take down the whole tree
+if sys.platform == "win32":
+    NEW_GROUP = {"creationflags": subprocess.CREATE_NEW_PROCESS_GROUP}
+else:
+    NEW_GROUP = {"start_new_session": True}
+
+
+# How long to keep reading a finished run's output; an app the script started
+# may inherit the pipe and hold it open for as long as it runs
+OUTPUT_DRAIN_TIMEOUT = 0.2
+
+
+def child_env(env=None) -> dict:
+    """Environment for script processes, unbuffered so output streams promptly"""
+    env = dict(os.environ if env is None else env)
+    env["PYTHONUNBUFFERED"] = "1"
+    return env
+
+
+def kill_tree(process):
+    """Kill ``process`` together with every process in its group"""
+    try:
+        if sys.platform == "win32":
+            subprocess.run(
+                ["taskkill", "/F", "/T", "/PID", str(process.pid)],
+                capture_output=True,
+            )
+        else:
+            os.killpg(process.pid, signal.SIGKILL)
+    except OSError:
+        pass
+    try:
+        process.kill()
+    except OSError:
+        pass
+
+
+def _stream(pipe, on_output):
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    with pipe:
+        while True:
+            chunk = pipe.read1(65536)
+            if not chunk:
+                break
+            data = decoder.decode(chunk)
+            if data:
+                on_output(data)
+
+
+class WorkerCrashed(Exception):
+    """Raised when a worker interpreter dies in the middle of a run"""
+
+
+class _Worker:
+    """One pre-started interpreter speaking the run-module protocol"""
+
+    def __init__(self, cwd, env, generation=0):
+        self.generation = generation
+        self.process = subprocess.Popen(
+            [sys.executable, "-m", "launcher.worker"],
+            cwd=cwd,
+            env=env,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            encoding="utf-8",
+            **NEW_GROUP,
+        )
+        self.runs = 0
+        # Processes the last run started; they live on in this worker's group
+        self.spawned = 0
+        self.ready = False
+        self._messages = queue.Queue()
+        threading.Thread(target=self._read_loop, daemon=True).start()
+
+    def _read_loop(self):
+        for line in self.process.stdout:
+            try:
+                self._messages.put(json.loads(line))
+            except ValueError:
+                continue
+        # EOF: the interpreter exited or crashed
+        self._messages.put(None)
+
+    def _next_message(self, deadline, timeout):
+        remaining = None if deadline is None else max(0, deadline - time.monotonic())
+        try:
+            message = self._messages.get(timeout=remaining)
+        except queue.Empty:
+            raise subprocess.TimeoutExpired(self.process.args, timeout) from None
+        if message is None:
+            raise WorkerCrashed(f"worker {self.process.pid} exited unexpectedly")
+        return message
+
+    def alive(self) -> bool:
+        return self.process.poll() is None
+
+    def run(self, module_path: str, timeout=None, on_output=None):
+        """Send a run request, stream its output and wait for the exit event"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        while not self.ready:
+            if self._next_message(deadline, timeout).get("event") == "ready":
+                self.ready = True
+
+        self.runs += 1
+        request = {"module": module_path, "run": self.runs}
+        try:
+            self.process.stdin.write(json.dumps(request) + "\n")
+            self.process.stdin.flush()
+        except OSError:
+            raise WorkerCrashed(f"worker {self.process.pid} is gone") from None
+
+        while True:
+            message = self._next_message(deadline, timeout)
+            if message.get("run") != self.runs:
+                # Late output from an earlier run's leftover processes
+                continue
+            if message.get("event") == "output":
+                on_output(message["data"])
+            elif message.get("event") == "exit":
+                self.spawned = message.get("spawned", 0)
+                return message["returncode"]
+
+    def stop(self):
+        """Ask the worker to exit, killing it if it doesn't"""
+        try:
+            self.process.stdin.write(json.dumps({"cmd": "exit"}) + "\n")
+            self.process.stdin.close()
+            self.process.wait(timeout=2)
+        except (OSError, subprocess.TimeoutExpired):
+            self.kill()
+
+    def kill(self):
+        try:
+            self.process.kill()
+            self.process.wait(timeout=2)
+        except (OSError, subprocess.TimeoutExpired):
+            pass
+
+
+class WorkerPool:
+    """Pool of warm interpreters that run scripts_list modules on request
+
+    Each worker has already imported the scripts' shared dependencies and parsed
+    .env, so a run only pays for the script itself. Workers are recycled after
+    ``max_runs`` runs, on crash or on timeout, and after any run that started
+    other processes, so a later cancellation can never reach apps that an
+    earlier run left open. With ``size=0`` the pool falls back to a cold
+    ``python -m`` process per run.
+    """
+
+    def __init__(self, cwd, size: int = 2, max_runs: int = 20, env=None):
+        self.cwd = cwd
+        self.size = size
+        self.max_runs = max_runs
+        self.env = child_env(env)
+        self._idle = []
+        self._lock = threading.Lock()
+        self._closed = False
+        self._generation = 0
+
+    def start(self):
+        """Spawn the workers in the background so startup never waits on them"""
+        if self.size > 0:
+            threading.Thread(target=self._fill, daemon=True).start()
+
+    def _fill(self):
+        while True:
+            with self._lock:
+                if self._closed or len(self._idle) >= self.size:
+                    return
+            worker = self._spawn()
+            self._release(worker)
+
+    def _acquire(self):
+        with self._lock:
+            while self._idle:
+                worker = self._idle.pop()
+                if worker.alive():
+                    return worker
+        # Every warm worker is busy: a fresh one costs no more than a cold start
+        return self._spawn()
+
+    def _spawn(self):
+        return _Worker(self.cwd, self.env, self._generation)
+
+    def _release(self, worker):
+        with self._lock:
+            keep = (
+                not self._closed
+                and worker.generation == self._generation
+                and worker.alive()
+                and worker.runs < self.max_runs
+                and not worker.spawned
+                and len(self._idle) < self.size
+            )
+            if keep:
+                self._idle.append(worker)
+        if not keep:
+            worker.stop()
+
+    def _replenish(self):
+        if not self._closed:
+            threading.Thread(target=self._fill, daemon=True).start()
+
+    def run(
+        self, module_path: str, timeout=None, on_start=None, on_output=None
+    ) -> subprocess.CompletedProcess:
+        """Run ``module_path`` as __main__ and return its exit status
+
+        ``on_start`` is called with the process executing the run, e.g. so the
+        caller can cancel it with kill_tree(). Output (stdout and stderr
+        interleaved) is passed to ``on_output`` as it arrives; without it the
+        complete output is collected into the result's ``stdout``.
+        """
+        chunks = []
+        if on_output is None:
+            on_output = chunks.append
+
+        if self.size <= 0 or self._closed:
+            returncode = self._run_cold(module_path, timeout, on_start, on_output)
+        else:
+            worker = self._acquire()
+            if on_start:
+                on_start(worker.process)
+            try:
+                returncode = worker.run(module_path, timeout, on_output)
+            except (subprocess.TimeoutExpired, WorkerCrashed):
+                worker.kill()
+                self._replenish()
+                raise
+            self._release(worker)
+            self._replenish()
+
+        return subprocess.CompletedProcess(
+            [sys.executable, "-m", module_path], returncode, "".join(chunks), ""
+        )
+
+    def _run_cold(self, module_path, timeout, on_start, on_output):
+        process = subprocess.Popen(
+            [sys.executable, "-m", module_path],
+            cwd=self.cwd,
+            env=self.env,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            **NEW_GROUP,
+        )
+        if on_start:
+            on_start(process)
+
+        reader = threading.Thread(
+            target=_stream, args=(process.stdout, on_output), daemon=True
+        )
+        reader.start()
+        try:
+            returncode = process.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            raise
+        finally:
+            reader.join(OUTPUT_DRAIN_TIMEOUT)
+        return returncode
+
+    def reset(self, env=None):
+        """Replace every worker, e.g. after the resolved environment changed"""
+        with self._lock:
+            self.env = child_env(env)
+            self._generation += 1
+            workers, self._idle = self._idle, []
+        for worker in workers:
+            worker.stop()
+        self._replenish()
+
+    def shutdown(self):
+        """Stop all idle workers; busy ones exit when their run returns"""
+        with self._lock:
+            self._closed = True
+            workers, self._idle = self._idle, []
+        for worker in workers:
+            worker.stop()
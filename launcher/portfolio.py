@@ -0,0 +1,459 @@
+import csv
+import hashlib
+import json
+import math
+import os
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+from launcher.config import CACHE_DIR
+
+try:
+    import numpy as np
+except ImportError:  # in requirements.txt; pure Python gives the same numbers
+    np = None
+
+CACHE_VERSION = 1
+
+# Rows parsed before they are folded into the per-symbol totals, so memory
+# stays flat however many years of transactions the file holds
+CHUNK_ROWS = 65536
+
+# Accepted header names per field, compared case-insensitively
+COLUMNS = {
+    "symbol": ("symbol", "ticker", "asset", "security", "name"),
+    "quantity": ("quantity", "shares", "units", "qty"),
+    "price": ("price", "unit price", "price per share", "cost per share"),
+    "action": ("action", "type", "side", "transaction", "transaction type"),
+    "fees": ("fees", "fee", "commission", "commissions"),
+    "current": ("current price", "last price", "market price", "close"),
+}
+BUY_ACTIONS = {"buy", "bought", "b", "purchase", "reinvest"}
+SELL_ACTIONS = {"sell", "sold", "s", "sale"}
+
+
+@dataclass
+class Holding:
+    symbol: str
+    quantity: float
+    avg_cost: float
+    price: float
+    value: float
+    cost: float
+    unrealized: float
+    realized: float
+    return_pct: float
+    allocation: float
+
+
+@dataclass
+class Summary:
+    """Holdings, allocation and returns computed from a portfolio CSV"""
+
+    holdings: list = field(default_factory=list)
+    value: float = 0.0
+    cost: float = 0.0
+    unrealized: float = 0.0
+    realized: float = 0.0
+    return_pct: float = 0.0
+    rows: int = 0
+    skipped: int = 0
+    engine: str = ""
+    cached: bool = False
+
+    def to_dict(self) -> dict:
+        data = asdict(self)
+        data.pop("cached")
+        return data
+
+    @classmethod
+    def from_dict(cls, data):
+        holdings = [Holding(**h) for h in data.pop("holdings")]
+        return cls(holdings=holdings, **data)
+
+
+def _number(text):
+    """Parse '1,234.50', '$12', '(3.5)' and the like; NaN when empty or junk"""
+    try:
+        value = float(text)
+    except ValueError:
+        text = text.strip().replace(",", "").replace("$", "").replace("€", "")
+        negative = text.startswith("(") and text.endswith(")")
+        try:
+            value = float(text.strip("()"))
+        except ValueError:
+            return math.nan
+        if negative:
+            value = -value
+    return value if math.isfinite(value) else math.nan
+
+
+def _numbers(texts):
+    """Parse a column of a chunk; plain numbers convert in one NumPy call"""
+    if np is not None:
+        try:
+            values = np.asarray(texts, dtype=np.float64)
+        except ValueError:
+            values = np.fromiter(map(_number, texts), np.float64, len(texts))
+        return np.where(np.isfinite(values), values, np.nan)
+    return [_number(text) for text in texts]
+
+
+def _columns(header) -> dict:
+    names = [h.strip().lower() for h in header]
+    found = {}
+    for key, aliases in COLUMNS.items():
+        for alias in aliases:
+            if alias in names:
+                found[key] = names.index(alias)
+                break
+    missing = [key for key in ("symbol", "quantity", "price") if key not in found]
+    if missing:
+        raise ValueError(f"Portfolio header has no {', '.join(missing)} column")
+    return found
+
+
+class _Totals:
+    """Per-symbol running sums, folded in one chunk of rows at a time"""
+
+    def __init__(self):
+        self.symbols = {}
+        self.bought_qty = []
+        self.bought_cost = []
+        self.sold_qty = []
+        self.sold_proceeds = []
+        self.last_price = []
+
+    def code(self, symbol) -> int:
+        code = self.symbols.get(symbol)
+        if code is None:
+            code = self.symbols[symbol] = len(self.symbols)
+        return code
+
+    def add(self, codes, qty, price, sides, fees, current) -> int:
+        """Fold in one chunk of raw column text; returns the rows skipped"""
+        self._grow()
+        qty = _numbers(qty)
+        price = _numbers(price)
+        fees = _numbers(fees) if fees is not None else [0.0] * len(codes)
+        current = _numbers(current) if current is not None else [math.nan] * len(codes)
+        if np is not None:
+            return self._add_vectorized(codes, qty, price, sides, fees, current)
+        return self._add_python(codes, qty, price, sides, fees, current)
+
+    def _grow(self):
+        n = len(self.symbols)
+        for sums in (
+            self.bought_qty,
+            self.bought_cost,
+            self.sold_qty,
+            self.sold_proceeds,
+        ):
+            sums.extend([0.0] * (n - len(sums)))
+        self.last_price.extend([math.nan] * (n - len(self.last_price)))
+
+    def _add_python(self, codes, qty, price, sides, fees, current) -> int:
+        skipped = 0
+        for c, q, p, side, f, last in zip(codes, qty, price, sides, fees, current):
+            if math.isnan(q) or math.isnan(p):
+                skipped += 1
+                continue
+            if side:
+                q = math.copysign(q, side)
+            f = 0.0 if math.isnan(f) else f
+            if q >= 0:
+                self.bought_qty[c] += q
+                self.bought_cost[c] += q * p + f
+            else:
+                self.sold_qty[c] -= q
+                self.sold_proceeds[c] -= q * p + f
+            self.last_price[c] = p if math.isnan(last) else last
+        return skipped
+
+    def _add_vectorized(self, codes, qty, price, sides, fees, current) -> int:
+        n = len(self.symbols)
+        valid = ~(np.isnan(qty) | np.isnan(price))
+        sides = np.asarray(sides, dtype=np.int8)[valid]
+        codes = np.asarray(codes, dtype=np.int64)[valid]
+        qty = np.where(sides != 0, np.copysign(qty[valid], sides), qty[valid])
+        price = price[valid]
+        fees = np.nan_to_num(np.asarray(fees, dtype=np.float64)[valid])
+        current = np.asarray(current, dtype=np.float64)[valid]
+
+        buy = qty >= 0
+        gross = qty * price
+        for sums, weights in (
+            (self.bought_qty, np.where(buy, qty, 0.0)),
+            (self.bought_cost, np.where(buy, gross + fees, 0.0)),
+            (self.sold_qty, np.where(buy, 0.0, -qty)),
+            (self.sold_proceeds, np.where(buy, 0.0, -gross - fees)),
+        ):
+            chunk = np.bincount(codes, weights=weights, minlength=n)
+            sums[:] = (np.asarray(sums) + chunk).tolist()
+
+        # The last row of each symbol in this chunk sets its price
+        seen, first_from_end = np.unique(codes[::-1], return_index=True)
+        last_rows = len(codes) - 1 - first_from_end
+        latest = np.where(np.isnan(current), price, current)[last_rows]
+        for c, p in zip(seen.tolist(), latest.tolist()):
+            self.last_price[c] = p
+        return int(len(valid) - valid.sum())
+
+
+def _read(path, totals, progress=None):
+    """Stream ``path`` into ``totals``; returns (rows, skipped)"""
+    rows = skipped = 0
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return 0, 0
+        cols = _columns(header)
+        symbol_col = cols["symbol"]
+        qty_col = cols["quantity"]
+        price_col = cols["price"]
+        action_col = cols.get("action")
+        fees_col = cols.get("fees")
+        current_col = cols.get("current")
+        width = max(cols.values()) + 1
+
+        # Column text is gathered per chunk and parsed in bulk by _Totals.add
+        codes, sides, qty, price, fees, current = [], [], [], [], [], []
+
+        def fold():
+            return totals.add(
+                codes,
+                qty,
+                price,
+                sides,
+                fees if fees_col is not None else None,
+                current if current_col is not None else None,
+            )
+
+        for row in reader:
+            rows += 1
+            if len(row) < width:
+                row = row + [""] * (width - len(row))
+            symbol = row[symbol_col].strip().upper()
+            action = row[action_col].strip().lower() if action_col is not None else ""
+            if not action:
+                side = 0
+            elif action in SELL_ACTIONS:
+                side = -1
+            elif action in BUY_ACTIONS:
+                side = 1
+            else:
+                # Dividends, deposits and the like don't change a position
+                skipped += 1
+                continue
+            if not symbol:
+                skipped += 1
+                continue
+
+            codes.append(totals.code(symbol))
+            sides.append(side)
+            qty.append(row[qty_col])
+            price.append(row[price_col])
+            if fees_col is not None:
+                fees.append(row[fees_col])
+            if current_col is not None:
+                current.append(row[current_col])
+
+            if len(codes) >= CHUNK_ROWS:
+                skipped += fold()
+                codes, sides, qty, price, fees, current = [], [], [], [], [], []
+                if progress is not None:
+                    progress(rows)
+        if codes:
+            skipped += fold()
+    return rows, skipped
+
+
+def _read_prices(path) -> dict:
+    """Latest prices from a ``symbol,price`` CSV, overriding trade prices"""
+    prices = {}
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        for row in csv.reader(f):
+            if len(row) >= 2:
+                price = _number(row[1])
+                if row[0].strip() and not math.isnan(price):
+                    prices[row[0].strip().upper()] = price
+    return prices
+
+
+def _finish(totals, prices) -> Summary:
+    symbols = list(totals.symbols)
+    last_price = [
+        prices.get(symbol, p) for symbol, p in zip(symbols, totals.last_price)
+    ]
+    if np is not None:
+        columns = _finish_vectorized(totals, last_price)
+    else:
+        columns = _finish_python(totals, last_price)
+
+    holdings = [
+        Holding(symbol, *values)
+        for symbol, values in zip(symbols, zip(*columns))
+        # Fully sold positions only matter for their realized gains
+        if abs(values[0]) > 1e-9 or values[6] != 0
+    ]
+    holdings.sort(key=lambda h: h.value, reverse=True)
+
+    value = sum(h.value for h in holdings)
+    cost = sum(h.cost for h in holdings)
+    unrealized = sum(h.unrealized for h in holdings)
+    realized = sum(h.realized for h in holdings)
+    invested = sum(totals.bought_cost)
+    return Summary(
+        holdings=holdings,
+        value=value,
+        cost=cost,
+        unrealized=unrealized,
+        realized=realized,
+        return_pct=(unrealized + realized) / invested * 100 if invested else 0.0,
+        engine="numpy" if np is not None else "python",
+    )
+
+
+def _finish_vectorized(totals, last_price):
+    bought_qty = np.asarray(totals.bought_qty)
+    bought_cost = np.asarray(totals.bought_cost)
+    sold_qty = np.asarray(totals.sold_qty)
+    price = np.nan_to_num(np.asarray(last_price))
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        avg_cost = np.where(bought_qty > 0, bought_cost / bought_qty, 0.0)
+        quantity = bought_qty - sold_qty
+        value = quantity * price
+        cost = quantity * avg_cost
+        unrealized = value - cost
+        realized = np.asarray(totals.sold_proceeds) - sold_qty * avg_cost
+        return_pct = np.where(
+            bought_cost > 0, (unrealized + realized) / bought_cost * 100, 0.0
+        )
+        total = value.sum()
+        allocation = value / total * 100 if total else np.zeros_like(value)
+    return [
+        column.tolist()
+        for column in (
+            quantity,
+            avg_cost,
+            price,
+            value,
+            cost,
+            unrealized,
+            realized,
+            return_pct,
+            allocation,
+        )
+    ]
+
+
+def _finish_python(totals, last_price):
+    rows = []
+    for bought_qty, bought_cost, sold_qty, proceeds, price in zip(
+        totals.bought_qty,
+        totals.bought_cost,
+        totals.sold_qty,
+        totals.sold_proceeds,
+        last_price,
+    ):
+        price = 0.0 if math.isnan(price) else price
+        avg_cost = bought_cost / bought_qty if bought_qty > 0 else 0.0
+        quantity = bought_qty - sold_qty
+        value = quantity * price
+        cost = quantity * avg_cost
+        unrealized = value - cost
+        realized = proceeds - sold_qty * avg_cost
+        return_pct = (
+            (unrealized + realized) / bought_cost * 100 if bought_cost > 0 else 0.0
+        )
+        rows.append(
+            [quantity, avg_cost, price, value, cost, unrealized, realized, return_pct]
+        )
+
+    total = sum(row[3] for row in rows)
+    for row in rows:
+        row.append(row[3] / total * 100 if total else 0.0)
+    return [list(column) for column in zip(*rows)] or [[] for _ in range(9)]
+
+
+def summarize(path, prices_path=None, progress=None) -> Summary:
+    """Read a portfolio CSV and compute holdings, allocation and returns
+
+    Rows are transactions (or a holdings snapshot) with at least symbol,
+    quantity and price columns; a sell is a negative quantity or a sell
+    action. Positions use average cost, and are valued at the current-price
+    column, ``prices_path`` or else their latest trade, reading the file as
+    oldest first. ``progress(rows)`` is called as the file is read.
+    """
+    totals = _Totals()
+    rows, skipped = _read(path, totals, progress)
+    prices = _read_prices(prices_path) if prices_path else {}
+    summary = _finish(totals, prices)
+    summary.rows = rows
+    summary.skipped = skipped
+    return summary
+
+
+def _stamp(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def _cache_path(path) -> Path:
+    tag = hashlib.sha1(str(Path(path).resolve()).encode("utf-8")).hexdigest()[:10]
+    return CACHE_DIR / f"portfolio-{tag}.json"
+
+
+# Summaries computed in this process, by file and prices file; checked
+# before the disk cache
+_memory = {}
+
+
+def load_summary(path, prices_path=None, progress=None) -> Summary:
+    """``summarize`` cached on which prices file is used and on the files'
+    modification times and sizes"""
+    prices = str(Path(prices_path).resolve()) if prices_path else None
+    key = [
+        _stamp(path),
+        prices,
+        _stamp(prices_path) if prices_path else None,
+        np is not None,
+    ]
+    if key[0] is None:
+        raise FileNotFoundError(path)
+
+    memory_key = (str(path), prices)
+    memo = _memory.get(memory_key)
+    if memo is not None and memo[0] == key:
+        return memo[1]
+
+    cache_file = _cache_path(path)
+    try:
+        with open(cache_file, encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("version") == CACHE_VERSION and data.get("key") == key:
+            summary = Summary.from_dict(data["summary"])
+            summary.cached = True
+            _memory[memory_key] = (key, summary)
+            return summary
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+
+    summary = summarize(path, prices_path, progress)
+    _memory[memory_key] = (key, summary)
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp = cache_file.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(
+                {"version": CACHE_VERSION, "key": key, "summary": summary.to_dict()}, f
+            )
+        os.replace(tmp, cache_file)
+    except OSError:
+        pass
+    return summary
@@ -0,0 +1,189 @@
+import asyncio
+import csv
+import tkinter as tk
+from pathlib import Path
+from tkinter import ttk
+
+from launcher.portfolio import load_summary
+from launcher.widgets import ModernButton, Theme
+
+# (column id, heading, width)
+COLUMNS = (
+    ("symbol", "Symbol", 80),
+    ("quantity", "Quantity", 75),
+    ("avg_cost", "Avg cost", 75),
+    ("price", "Price", 75),
+    ("value", "Value", 95),
+    ("allocation", "Alloc", 55),
+    ("unrealized", "Unrealized", 90),
+    ("realized", "Realized", 90),
+    ("return_pct", "Return", 65),
+)
+
+
+def _money(value):
+    return f"{value:,.2f}"
+
+
+def _quantity(value):
+    return f"{value:,.4f}".rstrip("0").rstrip(".")
+
+
+def _pct(value):
+    return f"{value:.1f}%"
+
+
+class PortfolioPanel:
+    """Window with holdings, allocation and returns from the portfolio CSV
+
+    ``locate()`` returns (path, prices_path) from the current config. The file
+    is read on an executor thread so a multi-year history never blocks the UI,
+    and reopening it unchanged is served from the summary cache.
+    """
+
+    def __init__(self, root, aio, pump, locate):
+        self.root = root
+        self.aio = aio
+        self.pump = pump
+        self.locate = locate
+        self.window = None
+        self._task = None
+        self._loading = False
+
+    def open(self, event=None):
+        if self.window is not None:
+            self.window.lift()
+            self.reload()
+            return "break"
+
+        self.window = tk.Toplevel(self.root, bg=Theme.BG_PRIMARY)
+        self.window.title("Portfolio")
+        self.window.geometry("720x360")
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+
+        toolbar = tk.Frame(self.window, bg=Theme.BG_PRIMARY)
+        toolbar.pack(fill="x", padx=Theme.PADDING_M, pady=(Theme.PADDING_M, 0))
+
+        self.info_var = tk.StringVar()
+        info = tk.Label(
+            toolbar,
+            textvariable=self.info_var,
+            anchor="w",
+            bg=Theme.BG_PRIMARY,
+            fg=Theme.TEXT_SECONDARY,
+            font=Theme.FONT_STATUS,
+        )
+        info.pack(side="left", fill="x", expand=True)
+
+        reload_btn = ModernButton(
+            toolbar,
+            text="Reload",
+            style="secondary",
+            command=self.reload,
+            font=Theme.FONT_BUTTON,
+            pady=4,
+        )
+        reload_btn.pack(side="right")
+
+        self.tree = ttk.Treeview(
+            self.window, columns=[c[0] for c in COLUMNS], show="headings"
+        )
+        for column, heading, width in COLUMNS:
+            self.tree.heading(column, text=heading)
+            self.tree.column(
+                column, width=width, anchor="w" if column == "symbol" else "e"
+            )
+        self.tree.pack(
+            fill="both", expand=True, padx=Theme.PADDING_M, pady=Theme.PADDING_M
+        )
+
+        self.totals_var = tk.StringVar()
+        totals = tk.Label(
+            self.window,
+            textvariable=self.totals_var,
+            anchor="w",
+            bg=Theme.BG_PRIMARY,
+            fg=Theme.TEXT_PRIMARY,
+            font=Theme.FONT_BUTTON,
+        )
+        totals.pack(fill="x", padx=Theme.PADDING_M, pady=(0, Theme.PADDING_M))
+
+        self.reload()
+        return "break"
+
+    def close(self):
+        if self.window is not None:
+            self.window.destroy()
+            self.window = None
+
+    def reload(self):
+        """Load the portfolio file again; instant when it hasn't changed"""
+        if self.window is None or self._loading:
+            return
+        path, prices_path = self.locate()
+        if not path:
+            self.info_var.set("Set PORTFOLIO_PATH in .env to a CSV file")
+            return
+        self._loading = True
+        self.info_var.set(f"Loading {Path(path).name}...")
+        self._task = self.aio.create_task(self._load(path, prices_path))
+
+    async def _load(self, path, prices_path):
+        loop = asyncio.get_running_loop()
+        try:
+            summary = await loop.run_in_executor(
+                None, load_summary, path, prices_path, self._progress
+            )
+        except (OSError, ValueError, csv.Error) as e:
+            summary = None
+            error = e
+        finally:
+            self._loading = False
+
+        if self.window is None:
+            return
+        if summary is None:
+            self.info_var.set(f"Can't read {Path(path).name}: {error}")
+            return
+        self._show(path, summary)
+
+    def _progress(self, rows):
+        """Called from the loading thread every chunk of rows"""
+
+        def apply():
+            if self._loading and self.window is not None:
+                self.info_var.set(f"Loading... {rows:,} rows")
+
+        self.pump.post("portfolio-progress", apply)
+
+    def _show(self, path, summary):
+        self.tree.delete(*self.tree.get_children())
+        for h in summary.holdings:
+            self.tree.insert(
+                "",
+                "end",
+                values=(
+                    h.symbol,
+                    _quantity(h.quantity),
+                    _money(h.avg_cost),
+                    _money(h.price),
+                    _money(h.value),
+                    _pct(h.allocation),
+                    _money(h.unrealized),
+                    _money(h.realized),
+                    _pct(h.return_pct),
+                ),
+            )
+
+        info = f"{Path(path).name} · {summary.rows:,} rows"
+        if summary.skipped:
+            info += f" ({summary.skipped:,} skipped)"
+        if summary.cached:
+            info += " · cached"
+        self.info_var.set(info)
+        self.totals_var.set(
+            f"Value {_money(summary.value)}  ·  Cost {_money(summary.cost)}  ·  "
+            f"Unrealized {_money(summary.unrealized)}  ·  "
+            f"Realized {_money(summary.realized)}  ·  "
+            f"Return {_pct(summary.return_pct)}"
+        )
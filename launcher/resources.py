@@ -0,0 +1,325 @@
+import os
+import sys
+import threading
+import time
+from dataclasses import dataclass
+
+try:
+    import psutil
+except ImportError:  # in requirements.txt; only needed where there is no /proc
+    psutil = None
+
+# Seconds between samples of every tracked process tree
+SAMPLE_INTERVAL = 0.5
+
+# Runs are first sampled this soon after they start, and at half their age
+# until that reaches the interval, so short ones aren't missed altogether
+FIRST_SAMPLE = 0.05
+
+# Samples kept per run; beyond this every other one is dropped and the run's
+# sampling stride doubles, so an hour-long run costs the same to store
+MAX_SAMPLES = 240
+
+# Glyphs of sparkline(), lowest to highest
+SPARKS = "▁▂▃▄▅▆▇█"
+
+PROC = "/proc"
+HAVE_PROC = sys.platform.startswith("linux") and os.path.isdir(PROC)
+if HAVE_PROC:
+    CLOCK_TICKS = os.sysconf("SC_CLK_TCK")
+    PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+
+
+@dataclass
+class Usage:
+    """What one run's process trees used; each of ``samples`` is
+    [seconds since start, cpu seconds, rss bytes, bytes read, bytes written]"""
+
+    cpu_time: float
+    peak_rss: int
+    read_bytes: int
+    write_bytes: int
+    samples: list
+
+
+def sparkline(values) -> str:
+    """``values`` as a row of block characters scaled to their maximum"""
+    top = max(values, default=0)
+    if not top:
+        return SPARKS[0] * len(values)
+    return "".join(SPARKS[round(v / top * (len(SPARKS) - 1))] for v in values)
+
+
+def open_monitor(config, problems=None) -> "ResourceMonitor | None":
+    """ResourceMonitor sampling every LAUNCHER_RESOURCE_INTERVAL seconds; None
+    when that is 0, or when there is no way to measure processes here, which
+    is added to ``problems``"""
+    problems = [] if problems is None else problems
+    interval = float(config.get("LAUNCHER_RESOURCE_INTERVAL", SAMPLE_INTERVAL))
+    if interval <= 0:
+        return None
+    if not HAVE_PROC and psutil is None:
+        problems.append(
+            "Resource sampling is off: psutil is not installed "
+            "(pip install -r requirements.txt)"
+        )
+        return None
+    return ResourceMonitor(interval)
+
+
+def _proc_stat(pid):
+    """(process group, [cpu seconds, rss bytes, 0, 0]) from /proc/<pid>/stat"""
+    with open(f"{PROC}/{pid}/stat", "rb") as f:
+        data = f.read()
+    # The command name is in parentheses and may contain spaces or ")"
+    fields = data[data.rindex(b")") + 2 :].split()
+    cpu = (int(fields[11]) + int(fields[12])) / CLOCK_TICKS
+    return int(fields[2]), [cpu, int(fields[21]) * PAGE_SIZE, 0, 0]
+
+
+def _proc_groups(wanted, known) -> dict:
+    """{process group: {pid: values}} of the processes in ``wanted`` groups
+
+    ``known`` maps each pid seen by earlier calls to its process group and is
+    kept up to date, so only processes that are new, or in a wanted group,
+    have their stat read; the rest of the system costs one listing of /proc.
+    A process that moves to another group after it was first seen keeps
+    counting as its old one.
+    """
+    pids = {int(name) for name in os.listdir(PROC) if name.isdigit()}
+    for pid in known.keys() - pids:
+        del known[pid]
+    groups = {}
+    for pid in pids:
+        if pid in known and known[pid] not in wanted:
+            continue
+        try:
+            group, values = _proc_stat(pid)
+        except OSError:
+            known.pop(pid, None)
+            continue  # exited meanwhile
+        known[pid] = group
+        if group in wanted:
+            groups.setdefault(group, {})[pid] = values
+    return groups
+
+
+def _proc_io(pid, values):
+    """Fill in storage bytes read and written from /proc/<pid>/io"""
+    try:
+        with open(f"{PROC}/{pid}/io", "rb") as f:
+            for line in f:
+                if line.startswith(b"read_bytes:"):
+                    values[2] = int(line.split()[1])
+                elif line.startswith(b"write_bytes:"):
+                    values[3] = int(line.split()[1])
+    except (OSError, ValueError):
+        pass  # gone, or not ours to read
+
+
+def _psutil_values(process):
+    """[cpu seconds, rss bytes, read, written] of a psutil Process"""
+    with process.oneshot():
+        times = process.cpu_times()
+        values = [times.user + times.system, process.memory_info().rss, 0, 0]
+        try:
+            io = process.io_counters()
+            values[2:] = [io.read_bytes, io.write_bytes]
+        except (AttributeError, psutil.Error):
+            pass  # no per-process I/O counters on macOS
+    return values
+
+
+def _psutil_tree(pid) -> dict:
+    """{pid: values} of ``pid`` and its descendants, through psutil"""
+    try:
+        root = psutil.Process(pid)
+        processes = [root, *root.children(recursive=True)]
+    except psutil.Error:
+        return {}
+    tree = {}
+    for process in processes:
+        try:
+            tree[process.pid] = _psutil_values(process)
+        except psutil.Error:
+            continue
+    return tree
+
+
+def _read(pids) -> dict:
+    """{pid: values} of those of ``pids`` still running"""
+    found = {}
+    for pid in pids:
+        if not HAVE_PROC:
+            try:
+                found[pid] = _psutil_values(psutil.Process(pid))
+            except psutil.Error:
+                pass  # gone
+            continue
+        try:
+            values = found[pid] = _proc_stat(pid)[1]
+        except OSError:
+            continue  # gone
+        _proc_io(pid, values)
+    return found
+
+
+def _trees(roots, known=None) -> dict:
+    """{root pid: {pid: values}} for the process trees under ``roots``
+
+    Children are started in a session of their own, so on Linux a tree is
+    the process group named after its root, which also holds descendants
+    that were orphaned. ``known`` is the pid to group map _proc_groups keeps
+    between passes.
+    """
+    if not HAVE_PROC:
+        return {root: _psutil_tree(root) for root in roots}
+    groups = _proc_groups(set(roots), {} if known is None else known)
+    trees = {}
+    for root in roots:
+        tree = trees[root] = groups.get(root, {})
+        for pid, values in tree.items():
+            _proc_io(pid, values)
+    return trees
+
+
+class RunUsage:
+    """Samples of the process trees running one job
+
+    Counters are cumulative per process: one that exits keeps the totals it
+    last had, and a warm worker reused across runs counts from when it was
+    added. Processes that start and exit between two samples are missed.
+    """
+
+    def __init__(self, monitor):
+        self.monitor = monitor
+        self.started = time.monotonic()
+        self.roots = []
+        self.samples = []
+        self.peak_rss = 0
+        self.totals = (0.0, 0, 0)
+        self._baseline = {}
+        self._last = {}
+        self._stride = 1
+        self._ticks = 0
+
+    def add(self, process):
+        """Sample ``process`` and its descendants from now on; for on_start"""
+        self.monitor.add(self, process.pid)
+
+    def stop(self) -> "Usage | None":
+        """Take a last sample, stop sampling and return the totals; None if
+        no process was ever sampled, e.g. one that exited before the first
+        sample"""
+        if not self.roots:
+            return None
+        self.monitor.remove(self)
+        if not self._last:
+            return None
+        cpu, read, written = self.totals
+        return Usage(round(cpu, 3), self.peak_rss, read, written, self.samples)
+
+    def _baseline_from(self, tree):
+        for pid, values in tree.items():
+            self._baseline.setdefault(pid, list(values))
+
+    def _update(self, processes):
+        rss = 0
+        for pid, values in processes.items():
+            # First seen after the run started: all of it is this run's
+            self._baseline.setdefault(pid, [0.0, 0, 0, 0])
+            self._last[pid] = values
+            rss += values[1]
+
+        cpu = read = written = 0
+        for pid, values in self._last.items():
+            base = self._baseline[pid]
+            cpu += values[0] - base[0]
+            read += values[2] - base[2]
+            written += values[3] - base[3]
+        self.totals = (cpu, read, written)
+        self.peak_rss = max(self.peak_rss, rss)
+
+        self._ticks += 1
+        if self._ticks % self._stride == 0:
+            elapsed = time.monotonic() - self.started
+            self.samples.append([round(elapsed, 2), round(cpu, 3), rss, read, written])
+            if len(self.samples) > MAX_SAMPLES:
+                del self.samples[1::2]
+                self._stride *= 2
+
+
+class ResourceMonitor:
+    """Samples CPU time, RSS and disk I/O of running jobs' process trees
+
+    One background thread takes a sample of every tracked tree each
+    ``interval`` seconds, sooner while a run is young, reading /proc on
+    Linux and psutil elsewhere; it only runs while something is tracked.
+    ``track()`` returns a RunUsage whose ``add`` goes in a run's on_start
+    callback.
+    """
+
+    def __init__(self, interval=SAMPLE_INTERVAL):
+        self.interval = interval
+        self._runs = []
+        self._lock = threading.Lock()
+        # Held for a whole sampling pass, so a run's last sample comes last
+        self._sampling = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+        # pid -> process group, only used while sampling
+        self._groups = {}
+
+    def track(self) -> RunUsage:
+        return RunUsage(self)
+
+    def add(self, usage, pid):
+        # The baseline is taken here, so a warm worker's earlier runs and
+        # imports don't count towards this one. Only the root is read: this
+        # runs on the caller's thread, and a new run has no children yet.
+        usage._baseline_from(_read([pid]))
+        with self._lock:
+            usage.roots.append(pid)
+            if usage not in self._runs:
+                self._runs.append(usage)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._sample_loop, daemon=True)
+                self._thread.start()
+        self._wake.set()
+
+    def remove(self, usage):
+        with self._lock:
+            if usage not in self._runs:
+                return
+            self._runs.remove(usage)
+        # A warm worker is still alive after its run: count up to the end.
+        # Only processes already seen are read, to keep this cheap for the
+        # caller; one started since the last sample is missed.
+        with self._sampling:
+            usage._update(_read({*usage.roots, *usage._last}))
+
+    def _sample_loop(self):
+        while True:
+            with self._lock:
+                if not self._runs:
+                    self._thread = None
+                    return
+                now = time.monotonic()
+                youngest = min(now - usage.started for usage in self._runs)
+            # A run added meanwhile wakes us to start its shorter schedule
+            if self._wake.wait(min(self.interval, max(FIRST_SAMPLE, youngest / 2))):
+                self._wake.clear()
+                continue
+            with self._sampling:
+                with self._lock:
+                    runs = list(self._runs)
+                roots = {root for usage in runs for root in usage.roots}
+                trees = _trees(roots, self._groups)
+                for usage in runs:
+                    usage._update(
+                        {
+                            pid: values
+                            for root in usage.roots
+                            for pid, values in trees.get(root, {}).items()
+                        }
+                    )
@@ -0,0 +1,432 @@
+import gzip
+import json
+import os
+import queue
+import shutil
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from launcher.config import BASE_DIR
+from launcher.history import COLUMNS
+from launcher.locks import acquire_lock
+
+LOG_DIR = BASE_DIR / "logs" / "launcher"
+
+# The active segment is sealed and compressed once it reaches either limit
+SEGMENT_BYTES = 8 * 1024 * 1024
+SEGMENT_HOURS = 24
+
+# Sealed segments older than this, or beyond this much in total, are deleted
+RETENTION_DAYS = 90
+RETENTION_MB = 256
+
+# Output not yet taken by the writer is dropped beyond this rather than
+# growing without bound behind a slow disk
+MAX_QUEUED_CHARS = 16 * 1024 * 1024
+
+# A run's output is held in memory up to this, then spooled to a temp file
+SPOOL_BYTES = 1024 * 1024
+
+COPY_CHUNK = 1024 * 1024
+
+# Tells the sealer thread to stop once the segments queued before it are done
+_STOP = object()
+
+# History fields a record's header repeats; the output path is the record
+# itself, and resource samples stay in the history
+HEADER_FIELDS = tuple(column for column in COLUMNS if column != "output_path")
+
+
+def open_run_log(config) -> "RunLog | None":
+    """RunLog in LAUNCHER_LOG_DIR with the configured limits; None when
+    LAUNCHER_RUN_LOG is 0"""
+    if config.get("LAUNCHER_RUN_LOG", "1") == "0":
+        return None
+    return RunLog(
+        Path(config.get("LAUNCHER_LOG_DIR", LOG_DIR)),
+        segment_bytes=int(float(config.get("LAUNCHER_LOG_SEGMENT_MB", "8")) * 2**20),
+        segment_hours=float(config.get("LAUNCHER_LOG_SEGMENT_HOURS", SEGMENT_HOURS)),
+        retention_days=float(config.get("LAUNCHER_LOG_DAYS", RETENTION_DAYS)),
+        retention_mb=float(config.get("LAUNCHER_LOG_MB", RETENTION_MB)),
+    )
+
+
+def run_key(job, run) -> str:
+    """Key a run's record is found by: start time, process and job id"""
+    started = time.localtime(run.started_at or run.queued_at)
+    return f"{time.strftime('%Y%m%d-%H%M%S', started)}-{os.getpid()}-{job.id}"
+
+
+def _index_path(segment: Path) -> Path:
+    return segment.with_name(segment.name + ".idx")
+
+
+def _read_index(path: Path) -> list:
+    """(key, offset, length) of every complete record in a segment"""
+    entries = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            parts = line.rstrip("\n").split("\t")
+            if len(parts) == 3:
+                entries.append((parts[0], int(parts[1]), int(parts[2])))
+    return entries
+
+
+def _write_index(path: Path, entries):
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(
+            "".join(f"{key}\t{offset}\t{length}\n" for key, offset, length in entries)
+        )
+    os.replace(tmp, path)
+
+
+class _Spool:
+    """Output of one run in flight: in memory, then in a temp file if large"""
+
+    def __init__(self):
+        self.chunks = []
+        self.size = 0
+        self.file = None
+
+    def write(self, text):
+        data = text.encode("utf-8", errors="replace")
+        self.size += len(data)
+        if self.file is not None:
+            self.file.write(data)
+            return
+        self.chunks.append(data)
+        if self.size > SPOOL_BYTES:
+            self.file = tempfile.TemporaryFile()
+            self.file.writelines(self.chunks)
+            self.chunks = []
+
+    def copy_to(self, out):
+        if self.file is None:
+            out.writelines(self.chunks)
+            return
+        self.file.seek(0)
+        shutil.copyfileobj(self.file, out, COPY_CHUNK)
+        self.file.close()
+
+    def discard(self):
+        if self.file is not None:
+            self.file.close()
+
+
+class RunLog:
+    """Per-run output records in rotating, compressed, indexed segments
+
+    Each run becomes one record: a JSON header line (the run's history fields
+    but its samples, its key and output size) followed by the raw output. Records are appended
+    to the active ``<stamp>-<pid>-<n>.log`` segment and a line per record in
+    the ``.idx`` file beside it gives its offset and length, so ``read(key)``
+    seeks straight to one run. A segment past SEGMENT_BYTES or SEGMENT_HOURS
+    is sealed and a background thread rewrites it as ``.log.gz``, one gzip
+    member per record so offsets in its own index stay seekable.
+
+    ``write`` and ``finish`` only queue, so the Tk thread and runner threads
+    never touch the disk. Every process writes its own segments under a lock
+    file; segments whose lock is free were left by a process that has exited
+    and are compressed by the next one to start.
+    """
+
+    def __init__(
+        self,
+        directory=LOG_DIR,
+        segment_bytes=SEGMENT_BYTES,
+        segment_hours=SEGMENT_HOURS,
+        retention_days=RETENTION_DAYS,
+        retention_mb=RETENTION_MB,
+    ):
+        self.directory = Path(directory)
+        self.segment_bytes = segment_bytes
+        self.segment_hours = segment_hours
+        self.retention_days = retention_days
+        self.retention_mb = retention_mb
+        self.dropped = 0
+        self._queue = queue.Queue()
+        self._queued = 0
+        self._dropped = {}
+        self._lock = threading.Lock()
+
+        # Writer state, only touched by the writer thread
+        self._runs = {}
+        self._segment = None
+        self._segment_file = None
+        self._index_file = None
+        self._segment_lock = None
+        self._segment_size = 0
+        self._segment_opened = 0.0
+        self._serial = 0
+
+        self._seal_queue = queue.Queue()
+        self._seal_queue.put(None)  # sweep what earlier processes left behind
+        self._sealer = threading.Thread(target=self._seal_loop, daemon=True)
+        self._sealer.start()
+        self._writer = threading.Thread(target=self._write_loop, daemon=True)
+        self._writer.start()
+
+    def write(self, job, text):
+        """Queue output of ``job``; dropped if the writer is far behind"""
+        if not text:
+            return
+        with self._lock:
+            if self._queued + len(text) > MAX_QUEUED_CHARS:
+                self._dropped[job] = self._dropped.get(job, 0) + len(text)
+                self.dropped += len(text)
+                return
+            self._queued += len(text)
+        self._queue.put(("data", job, text))
+
+    def finish(self, job, run) -> str:
+        """Queue the record of ``job``, described by the history ``run``;
+        returns the key to read it back with"""
+        key = run_key(job, run)
+        with self._lock:
+            dropped = self._dropped.pop(job, 0)
+        self._queue.put(("end", job, (key, run, dropped)))
+        return key
+
+    def flush(self, timeout=None):
+        """Wait until everything queued so far is in the active segment"""
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def close(self):
+        """Write what's queued, finish compressing sealed segments and close
+        the active one, removing their locks; the active segment is compressed
+        by the next process to open the log"""
+        self._queue.put(None)
+        self._writer.join()
+        self._seal_queue.put(_STOP)
+        self._sealer.join()
+
+    def read(self, key):
+        return read_run(self.directory, key)
+
+    def _write_loop(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            if isinstance(item, threading.Event):
+                item.set()
+                continue
+            kind, job, payload = item
+            try:
+                if kind == "data":
+                    with self._lock:
+                        self._queued -= len(payload)
+                    spool = self._runs.get(job)
+                    if spool is None:
+                        spool = self._runs[job] = _Spool()
+                    spool.write(payload)
+                else:
+                    self._append(*payload, self._runs.pop(job, None) or _Spool())
+            except OSError:
+                pass  # the run log is best effort; a full disk loses records
+
+        for spool in self._runs.values():
+            spool.discard()
+        self._runs.clear()
+        segment = self._close_segment()
+        if segment is not None:
+            self._remove_lock(segment)
+
+    def _append(self, key, run, dropped, spool):
+        if self._segment is not None and (
+            self._segment_size >= self.segment_bytes
+            or time.time() - self._segment_opened >= self.segment_hours * 3600
+        ):
+            self._seal_queue.put(self._close_segment())
+        if self._segment is None:
+            self._open_segment()
+
+        header = {field: getattr(run, field) for field in HEADER_FIELDS}
+        header["key"] = key
+        if dropped:
+            header["dropped_chars"] = dropped
+        header["bytes"] = spool.size
+        head = (json.dumps(header) + "\n").encode("utf-8")
+        offset = self._segment_size
+        self._segment_file.write(head)
+        spool.copy_to(self._segment_file)
+        self._segment_file.write(b"\n")
+        self._segment_file.flush()
+        length = len(head) + spool.size + 1
+        # The index line goes last: a record is only visible once complete
+        self._index_file.write(f"{key}\t{offset}\t{length}\n")
+        self._index_file.flush()
+        self._segment_size += length
+
+    def _open_segment(self):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        self._serial += 1
+        stem = f"{stamp}-{os.getpid()}-{self._serial}"
+        # Locked before the segment exists, so a sweep never takes it as stale
+        self._segment_lock = acquire_lock(self.directory / f"{stem}.lock")
+        self._segment = self.directory / f"{stem}.log"
+        self._segment_file = open(self._segment, "ab")
+        self._index_file = open(_index_path(self._segment), "a", encoding="utf-8")
+        self._segment_size = self._segment_file.seek(0, os.SEEK_END)
+        self._segment_opened = time.time()
+
+    def _close_segment(self):
+        segment = self._segment
+        if segment is None:
+            return None
+        self._segment_file.close()
+        self._index_file.close()
+        if self._segment_lock is not None:
+            self._segment_lock.close()
+        self._segment = self._segment_file = self._index_file = None
+        self._segment_lock = None
+        return segment
+
+    def _seal_loop(self):
+        while True:
+            segment = self._seal_queue.get()
+            if segment is _STOP:
+                break
+            try:
+                if segment is None:
+                    self._sweep()
+                else:
+                    compress_segment(segment)
+                    self._remove_lock(segment)
+                    self._apply_retention()
+            except OSError:
+                pass  # left plain; the next sweep tries again
+
+    def _sweep(self):
+        """Compress segments whose writer has exited, then apply retention"""
+        if not self.directory.is_dir():
+            return
+        for segment in sorted(self.directory.glob("*.log")):
+            lock_path = segment.with_suffix(".lock")
+            lock = acquire_lock(lock_path)
+            if lock is None:
+                continue  # its process is still writing it
+            try:
+                compress_segment(segment)
+            except OSError:
+                pass  # gone already, or unreadable; tried again next time
+            finally:
+                lock.close()
+                self._remove_lock(segment)
+        self._apply_retention()
+
+    def _remove_lock(self, segment):
+        try:
+            segment.with_suffix(".lock").unlink()
+        except OSError:
+            pass
+
+    def _apply_retention(self):
+        sealed = sorted(self.directory.glob("*.log.gz"))
+        cutoff = time.time() - self.retention_days * 86400
+        budget = self.retention_mb * 2**20
+        sizes = []
+        for segment in sealed:
+            try:
+                stat = segment.stat()
+                sizes.append((segment, stat.st_mtime, stat.st_size))
+            except OSError:
+                pass
+        total = sum(size for _, _, size in sizes)
+        for segment, mtime, size in sizes:
+            if mtime >= cutoff and total <= budget:
+                break
+            total -= size
+            for path in (segment, _index_path(segment)):
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+
+
+def compress_segment(segment: Path):
+    """Rewrite a sealed segment as .log.gz with one gzip member per record
+
+    The compressed index is moved into place after the data, and the plain
+    files are removed last, index first, so a reader always finds one complete
+    pair and never goes back to a plain index whose data is gone.
+    """
+    index = _read_index(_index_path(segment))
+    packed = segment.with_name(segment.name + ".gz")
+    tmp = packed.with_name(packed.name + ".tmp")
+    entries = []
+    with open(segment, "rb") as src, open(tmp, "wb") as dst:
+        for key, offset, length in index:
+            src.seek(offset)
+            start = dst.tell()
+            with gzip.GzipFile(fileobj=dst, mode="wb", mtime=0) as member:
+                remaining = length
+                while remaining:
+                    chunk = src.read(min(remaining, COPY_CHUNK))
+                    if not chunk:
+                        break
+                    member.write(chunk)
+                    remaining -= len(chunk)
+            entries.append((key, start, dst.tell() - start))
+    os.replace(tmp, packed)
+    _write_index(_index_path(packed), entries)
+    _index_path(segment).unlink()
+    segment.unlink()
+
+
+def _locate(directory: Path, key):
+    """(segment, offset, length) of the record for ``key``, or None
+
+    Raises FileNotFoundError when an index vanished while looking, as its
+    compressed replacement may have appeared after the listing.
+    """
+    parts = key.split("-")
+    if len(parts) != 4:
+        return None
+    # Only segments of the process that ran it, newest first
+    indexes = sorted(
+        directory.glob(f"*-{parts[2]}-*.idx"), key=lambda p: p.name, reverse=True
+    )
+    prefix = key + "\t"
+    vanished = False
+    for index in indexes:
+        try:
+            with open(index, encoding="utf-8") as f:
+                for line in f:
+                    if line.startswith(prefix):
+                        _, offset, length = line.rstrip("\n").split("\t")
+                        return index.with_suffix(""), int(offset), int(length)
+        except FileNotFoundError:
+            vanished = True  # compressed or deleted meanwhile
+        except OSError:
+            continue
+    if vanished:
+        raise FileNotFoundError(key)
+    return None
+
+
+def read_run(directory, key):
+    """(header dict, output text) of the run logged under ``key``, or None"""
+    directory = Path(directory)
+    for _ in range(2):
+        try:
+            found = _locate(directory, key)
+            if found is None:
+                return None
+            segment, offset, length = found
+            with open(segment, "rb") as f:
+                f.seek(offset)
+                data = f.read(length)
+        except FileNotFoundError:
+            continue  # compressed while we looked; look again
+        if segment.suffix == ".gz":
+            data = gzip.decompress(data)
+        head, _, output = data.partition(b"\n")
+        return json.loads(head), output[:-1].decode("utf-8", errors="replace")
+    return None
@@ -0,0 +1,179 @@
+import heapq
+from collections import defaultdict
+
+# Characters that start a new "word" inside a script name or module path
+WORD_BREAKS = " _-./"
+
+# Every module shares this prefix, so it would match almost any query
+MODULE_PREFIX = "scripts_list."
+
+_TO_SPACES = str.maketrans({c: " " for c in WORD_BREAKS})
+
+
+def _trigrams(text):
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+def fuzzy_score(query: str, text: str):
+    """Score ``query`` as a subsequence of ``text``; None if it doesn't match
+
+    Consecutive characters, word starts and an early first match score higher,
+    so "sai" ranks "study_ai" above "scripts_list.annual_retro_index".
+    """
+    score = 0
+    position = 0
+    previous = -2
+    for char in query:
+        index = text.find(char, position)
+        if index < 0:
+            return None
+        if index == previous + 1:
+            score += 5
+        if index == 0 or text[index - 1] in WORD_BREAKS:
+            score += 3
+        score -= min(index - position, 3)
+        previous = index
+        position = index + 1
+
+    first = text.find(query[0])
+    return score - first // 4
+
+
+class SearchIndex:
+    """Incrementally updated index over every script's name, module and category
+
+    Each entry is posted under its characters (to narrow fuzzy candidates) and
+    its trigrams (to find exact substring hits), so a query only scores the few
+    entries that could possibly match. Postings hold small integer ids rather
+    than the entries themselves to keep set operations cheap.
+    """
+
+    def __init__(self):
+        self._ids = {}
+        self._entries = {}
+        self._texts = {}
+        # Text with every word break turned into a space, for word-start checks
+        self._words = {}
+        self._next_id = 0
+        self._ordered = None
+        self._chars = defaultdict(set)
+        self._grams = defaultdict(set)
+        # (query, ids it matched) from the last complete search; typing more
+        # characters can only narrow that set
+        self._last = None
+
+    def __len__(self):
+        return len(self._ids)
+
+    @staticmethod
+    def _text(entry):
+        module = entry.module
+        if module.startswith(MODULE_PREFIX):
+            module = module[len(MODULE_PREFIX) :]
+        return f"{entry.name} {module} {entry.category}".lower()
+
+    def _changed(self):
+        self._ordered = None
+        self._last = None
+
+    def add(self, entry):
+        if entry in self._ids:
+            return
+        entry_id = self._next_id
+        self._next_id += 1
+        text = self._text(entry)
+
+        self._ids[entry] = entry_id
+        self._entries[entry_id] = entry
+        self._texts[entry_id] = text
+        self._words[entry_id] = " " + text.translate(_TO_SPACES)
+        for char in set(text):
+            self._chars[char].add(entry_id)
+        for gram in _trigrams(text):
+            self._grams[gram].add(entry_id)
+        self._changed()
+
+    def remove(self, entry):
+        entry_id = self._ids.pop(entry, None)
+        if entry_id is None:
+            return
+        del self._entries[entry_id]
+        del self._words[entry_id]
+        text = self._texts.pop(entry_id)
+        for char in set(text):
+            self._chars[char].discard(entry_id)
+        for gram in _trigrams(text):
+            self._grams[gram].discard(entry_id)
+        self._changed()
+
+    def update(self, entries):
+        """Bring the index in line with ``entries``, touching only the difference"""
+        entries = set(entries)
+        for entry in [e for e in self._ids if e not in entries]:
+            self.remove(entry)
+        for entry in entries:
+            self.add(entry)
+
+    def _sort_key(self, entry_id):
+        return (len(self._texts[entry_id]), self._entries[entry_id].name)
+
+    def _in_order(self, ids, limit):
+        """Up to ``limit`` of ``ids``, shortest text first"""
+        if len(ids) <= limit:
+            return sorted(ids, key=self._sort_key)
+
+        if self._ordered is None:
+            self._ordered = sorted(self._texts, key=self._sort_key)
+        picked = []
+        for entry_id in self._ordered:
+            if entry_id in ids:
+                picked.append(entry_id)
+                if len(picked) == limit:
+                    break
+        return picked
+
+    def search(self, query: str, limit: int = 50):
+        """Return the best matching entries for ``query``, best first
+
+        Matches at the start of a word rank first, then other substring hits,
+        both shortest first; the fuzzy scorer only runs when those don't fill
+        ``limit``.
+        """
+        query = query.lower().replace(" ", "")
+        if not query:
+            return heapq.nsmallest(limit, self._ids, key=lambda e: (e.category, e.name))
+
+        postings = sorted((self._chars.get(c, set()) for c in set(query)), key=len)
+        candidates = set.intersection(*postings)
+        if self._last and query.startswith(self._last[0]):
+            candidates &= self._last[1]
+
+        if len(query) >= 3:
+            gram_postings = sorted(
+                (self._grams.get(g, set()) for g in _trigrams(query)), key=len
+            )
+            possible = set.intersection(*gram_postings) & candidates
+        else:
+            possible = candidates
+
+        texts, words = self._texts, self._words
+        exact = {i for i in possible if query in texts[i]}
+        word_query = " " + query
+        at_word = {i for i in exact if word_query in words[i]}
+
+        results = self._in_order(at_word, limit)
+        if len(results) < limit:
+            results += self._in_order(exact - at_word, limit - len(results))
+
+        if len(results) < limit:
+            ranked = []
+            for entry_id in candidates - exact:
+                text = texts[entry_id]
+                score = fuzzy_score(query, text)
+                if score is not None:
+                    ranked.append((-score, len(text), entry_id))
+            self._last = (query, exact.union(r[2] for r in ranked))
+            fuzzy = heapq.nsmallest(limit - len(results), ranked)
+            results += [r[2] for r in fuzzy]
+
+        return [self._entries[i] for i in results]
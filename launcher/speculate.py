@@ -0,0 +1,135 @@
+import time
+
+from launcher.browser import RateLimiter
+from launcher.macros import is_macro
+
+HISTORY_LIMIT = 500
+
+# How much a past run says about the next one: halves every two days, counts
+# within an hour and a half of the same time of day (more on the same
+# weekday), and counts extra when it came soon after the script that ran last
+RECENCY_HALF_LIFE = 2 * 86400
+TIME_OF_DAY_WINDOW = 90 * 60
+SAME_WEEKDAY_BONUS = 0.5
+FOLLOW_WINDOW = 30 * 60
+FOLLOW_WEIGHT = 2.0
+
+
+class RunHistory:
+    """When each script was started, oldest first
+
+    Seeded from the run store, which records every run once it finishes;
+    runs started since are added with ``record``.
+    """
+
+    def __init__(self, store, limit=HISTORY_LIMIT):
+        self.limit = limit
+        self.runs = [(module, float(when)) for module, when in store.starts(limit)]
+
+    def record(self, module, when=None):
+        self.runs.append((module, time.time() if when is None else when))
+        del self.runs[: -self.limit]
+
+
+def _seconds_of_day(when) -> int:
+    local = time.localtime(when)
+    return local.tm_hour * 3600 + local.tm_min * 60 + local.tm_sec
+
+
+def predict(runs, now=None, limit=3) -> list:
+    """Modules most likely to be run next according to ``runs``, best first"""
+    now = time.time() if now is None else now
+    today = time.localtime(now).tm_wday
+    clock = _seconds_of_day(now)
+    last = runs[-1][0] if runs else None
+
+    scores = {}
+    for i, (module, when) in enumerate(runs):
+        score = 0.5 ** (max(0.0, now - when) / RECENCY_HALF_LIFE)
+
+        gap = abs(_seconds_of_day(when) - clock)
+        gap = min(gap, 86400 - gap)
+        if gap < TIME_OF_DAY_WINDOW:
+            weight = 1 - gap / TIME_OF_DAY_WINDOW
+            if time.localtime(when).tm_wday == today:
+                weight *= 1 + SAME_WEEKDAY_BONUS
+            score += weight
+
+        if i and runs[i - 1][0] == last and when - runs[i - 1][1] < FOLLOW_WINDOW:
+            score += FOLLOW_WEIGHT
+
+        scores[module] = scores.get(module, 0.0) + score
+    return sorted(scores, key=scores.get, reverse=True)[:limit]
+
+
+class Speculator:
+    """Gets idle warm workers ready for the scripts likely to run next
+
+    Candidates are the script under the pointer (once it has stayed there for
+    ``hover_delay_ms``) and, while nothing is running, the best guesses from
+    run history. Preparing compiles a script and imports its dependencies in
+    an idle worker at idle priority, so a click starts straight away; at most
+    ``per_minute`` preparations are started, and moving the pointer off a
+    script before the delay cancels it. Runs on the Tk thread.
+    """
+
+    def __init__(
+        self,
+        root,
+        pool,
+        history,
+        busy=lambda: False,
+        enabled=True,
+        hover_delay_ms=150,
+        per_minute=12,
+        guesses=2,
+    ):
+        self.root = root
+        self.pool = pool
+        self.history = history
+        self.busy = busy
+        self.enabled = enabled
+        self.hover_delay_ms = hover_delay_ms
+        self.guesses = guesses
+        self.limiter = RateLimiter(per_minute / 60, burst=guesses + 1)
+        self._pending = None
+        self._hover_prepared = None
+
+    def hover(self, module):
+        """The pointer is on ``module``'s button; None when it left"""
+        if self._pending is not None:
+            self.root.after_cancel(self._pending)
+            self._pending = None
+        if self._hover_prepared is not None:
+            self.pool.cancel_preparation(self._hover_prepared)
+            self._hover_prepared = None
+        if module is not None and self.enabled:
+            self._pending = self.root.after(
+                self.hover_delay_ms, lambda: self._hovered(module)
+            )
+
+    def _hovered(self, module):
+        self._pending = None
+        if self.prepare(module):
+            self._hover_prepared = module
+
+    def anticipate(self):
+        """Prepare the best guesses from history, unless something is running"""
+        if not self.enabled or self.busy():
+            return
+        for module in predict(self.history.runs, limit=self.guesses):
+            if not self.prepare(module):
+                break
+
+    def prepare(self, module) -> bool:
+        # A macro has no module of its own to compile
+        if not self.enabled or is_macro(module):
+            return False
+        if self.pool.is_prepared(module):
+            return True
+        if not self.limiter.try_acquire():
+            return False
+        return self.pool.prepare(module)
+
+    def record(self, module):
+        self.history.record(module)
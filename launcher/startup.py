@@ -0,0 +1,102 @@
+import importlib
+import os
+import sys
+import time
+
+# Taken as early as possible: __main__ imports this module before anything heavy
+PROCESS_START = time.perf_counter()
+
+HISTORY_LIMIT = 50
+
+# A start counts as a regression when it is this much slower than the median
+REGRESSION_FACTOR = 1.5
+REGRESSION_MIN_MS = 50
+
+
+class StartupTimer:
+    """Collects import times and startup milestones for one launcher start"""
+
+    def __init__(self):
+        self.imports = {}
+        self.marks = {}
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - PROCESS_START) * 1000
+
+    def mark(self, label: str):
+        """Record a milestone such as "first_paint" relative to process start"""
+        self.marks[label] = self.elapsed_ms()
+
+    def timed_import(self, name: str):
+        """Import ``name`` and remember how long it took, if not already loaded"""
+        if name in sys.modules:
+            return sys.modules[name]
+        start = time.perf_counter()
+        module = importlib.import_module(name)
+        self.imports[name] = (time.perf_counter() - start) * 1000
+        return module
+
+    def report(self) -> str:
+        lines = ["Startup timing (ms since launch):"]
+        for label, ms in sorted(self.marks.items(), key=lambda item: item[1]):
+            lines.append(f"  {label:<24} {ms:8.1f}")
+        lines.append("Imports (ms, slowest first):")
+        for name, ms in sorted(self.imports.items(), key=lambda item: -item[1]):
+            lines.append(f"  {name:<24} {ms:8.1f}")
+        return "\n".join(lines)
+
+    def record(self, path, budget_ms=None):
+        """Append this start to the history at ``path`` and check for regressions
+
+        Returns a list of warnings: first paint over ``budget_ms``, or clearly
+        slower than the median of previous starts.
+        """
+        import json
+        import statistics
+
+        history = _read_history(path)
+        first_paint = self.marks.get("first_paint")
+        warnings = []
+
+        if first_paint is not None:
+            if budget_ms and first_paint > budget_ms:
+                warnings.append(
+                    f"first paint took {first_paint:.0f} ms (budget {budget_ms} ms)"
+                )
+            previous = [h["first_paint"] for h in history if "first_paint" in h]
+            if previous:
+                median = statistics.median(previous)
+                if (
+                    first_paint > median * REGRESSION_FACTOR
+                    and first_paint - median > REGRESSION_MIN_MS
+                ):
+                    warnings.append(
+                        f"first paint regressed: {first_paint:.0f} ms vs median "
+                        f"{median:.0f} ms over the last {len(previous)} starts"
+                    )
+
+        entry = {"time": time.time(), **self.marks, "imports": self.imports}
+        history = (history + [entry])[-HISTORY_LIMIT:]
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                for item in history:
+                    f.write(json.dumps(item) + "\n")
+        except OSError:
+            pass
+        return warnings
+
+
+def _read_history(path):
+    import json
+
+    try:
+        with open(path, encoding="utf-8") as f:
+            return [json.loads(line) for line in f if line.strip()]
+    except (OSError, ValueError):
+        return []
+
+
+def report_requested(argv=None) -> bool:
+    argv = sys.argv[1:] if argv is None else argv
+    return "--startup-report" in argv or os.getenv("LAUNCHER_STARTUP_REPORT") == "1"
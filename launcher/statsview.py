@@ -0,0 +1,171 @@
+import asyncio
+import time
+import tkinter as tk
+from functools import partial
+from tkinter import ttk
+
+from launcher.resources import sparkline
+from launcher.widgets import Theme
+
+# (column id, heading, width)
+COLUMNS = (
+    ("script", "Script", 150),
+    ("runs", "Runs", 45),
+    ("failures", "Failed", 50),
+    ("wall_p50", "Wall p50", 70),
+    ("wall_p95", "p95", 60),
+    ("wall_p99", "p99", 60),
+    ("spawn_p50", "Spawn p50", 75),
+    ("first_output_p50", "1st out p50", 80),
+    ("total_runs", "All runs", 60),
+    ("total_failures", "All failed", 65),
+    ("last_run", "Last run", 110),
+    ("cpu", "CPU mean", 70),
+    ("peak_rss", "Peak RSS", 70),
+    ("io", "Disk I/O", 70),
+    ("cpu_trend", "CPU trend", 140),
+    ("rss_trend", "RSS trend", 140),
+)
+
+# Sampled runs per script shown in the trend columns
+TREND_RUNS = 20
+
+
+def _ms(seconds):
+    return "" if seconds is None else f"{seconds * 1000:.0f} ms"
+
+
+def _when(timestamp):
+    return time.strftime("%Y-%m-%d %H:%M", time.localtime(timestamp))
+
+
+def _mb(size):
+    return "" if size is None else f"{size / 2**20:.0f} MB"
+
+
+def _resources(mean_cpu, max_rss, trend):
+    """Resource column values of one script; ``trend`` is oldest first"""
+    if mean_cpu is None:
+        return ("", "", "", "", "")
+    io = [run[2] for run in trend if run[2] is not None]
+    return (
+        f"{mean_cpu:.2f} s",
+        _mb(max_rss),
+        _mb(sum(io) / len(io)) if io else "",
+        sparkline([run[0] for run in trend]),
+        sparkline([run[1] for run in trend]),
+    )
+
+
+class StatsTable:
+    """Window with per-script latency percentiles from the metrics registry
+
+    With a run store, lifetime totals from the run history are shown too,
+    including scripts not run since the launcher started, along with the
+    CPU time, peak memory and disk I/O of sampled runs: means over all of
+    them, and sparklines of the last TREND_RUNS. The history is queried on
+    an executor thread, and refreshes asked for while a query is in flight
+    are folded into one more.
+    """
+
+    def __init__(self, root, aio, pump, registry, store=None):
+        self.root = root
+        self.aio = aio
+        self.pump = pump
+        self.registry = registry
+        self.store = store
+        self.window = None
+        self._task = None
+        self._stale = False
+
+    def open(self, event=None):
+        if self.window is not None:
+            self.window.lift()
+            self.refresh()
+            return "break"
+
+        self.window = tk.Toplevel(self.root, bg=Theme.BG_PRIMARY)
+        self.window.title("Run Statistics")
+        self.window.geometry("1240x300")
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+
+        self.tree = ttk.Treeview(
+            self.window, columns=[c[0] for c in COLUMNS], show="headings"
+        )
+        for column, heading, width in COLUMNS:
+            self.tree.heading(column, text=heading)
+            self.tree.column(column, width=width, anchor="w")
+        self.tree.pack(
+            fill="both", expand=True, padx=Theme.PADDING_M, pady=Theme.PADDING_M
+        )
+
+        self.refresh()
+        return "break"
+
+    def close(self):
+        if self.window is not None:
+            self.window.destroy()
+            self.window = None
+
+    def refresh(self):
+        if self.window is None:
+            return
+        self._stale = True
+        if self._task is None:
+            self._task = self.aio.create_task(self._load())
+
+    async def _load(self):
+        loop = asyncio.get_running_loop()
+        try:
+            while self._stale and self.window is not None:
+                self._stale = False
+                lifetime = {}
+                if self.store is not None:
+                    lifetime = await loop.run_in_executor(None, self._lifetime)
+                self.pump.post("stats", partial(self._show, lifetime))
+        finally:
+            self._task = None
+
+    def _lifetime(self) -> dict:
+        """{script: lifetime column values} from the run history"""
+        lifetime = {}
+        trends = self.store.resource_trends(TREND_RUNS)
+        for row in self.store.stats():
+            module, script, runs, failures, _, _, last, _, cpu, rss = row
+            lifetime.setdefault(
+                script,
+                (
+                    runs,
+                    failures,
+                    _when(last),
+                    *_resources(cpu, rss, trends.get(module, ())),
+                ),
+            )
+        return lifetime
+
+    def _show(self, lifetime):
+        if self.window is None:
+            return
+        self.tree.delete(*self.tree.get_children())
+        for script, runs, failures, percentiles in self.registry.summary():
+            wall = percentiles["wall"]
+            self.tree.insert(
+                "",
+                "end",
+                values=(
+                    script,
+                    runs,
+                    failures,
+                    _ms(wall[0]),
+                    _ms(wall[1]),
+                    _ms(wall[2]),
+                    _ms(percentiles["spawn"][0]),
+                    _ms(percentiles["first_output"][0]),
+                    *lifetime.pop(script, ("",) * 8),
+                ),
+            )
+        # Scripts with history but no runs this session
+        for script, totals in lifetime.items():
+            self.tree.insert(
+                "", "end", values=(script, 0, 0, "", "", "", "", "", *totals)
+            )
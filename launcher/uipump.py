@@ -0,0 +1,93 @@
+import sys
+import threading
+import time
+
+
+class UpdatePump:
+    """Applies UI updates on the Tk thread in batches, at most ``fps`` a second
+
+    ``post(key, update)`` may be called from any thread. Pending updates are
+    applied together once per frame, in the order their keys were first
+    posted; posting a key that is still pending replaces its update, so a
+    burst of status changes or table refreshes costs one widget update per
+    frame however many jobs report at once.
+    """
+
+    # How often to look for updates posted from other threads while idle
+    IDLE_MS = 100
+
+    def __init__(self, root, fps=30):
+        self.root = root
+        self.frame_ms = max(1, round(1000 / fps))
+        self.applied = 0
+        self.dropped = 0
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._tk_thread = threading.get_ident()
+        self._after = None
+        self._frame_requested = False
+        self._last_frame = 0.0
+        self._closed = False
+
+    def start(self):
+        self._schedule(self.IDLE_MS)
+
+    def post(self, key, update):
+        """Apply ``update()`` on the next frame, replacing any pending one for ``key``"""
+        if self._closed:
+            return
+        with self._lock:
+            if key in self._pending:
+                self.dropped += 1
+            self._pending[key] = update
+        if threading.get_ident() == self._tk_thread:
+            self._request_frame()
+
+    def _request_frame(self):
+        """Bring the next flush forward to the next frame boundary"""
+        if self._frame_requested or self._closed:
+            return
+        self._frame_requested = True
+        since = (time.monotonic() - self._last_frame) * 1000
+        if self._after is not None:
+            self.root.after_cancel(self._after)
+        self._schedule(max(0, round(self.frame_ms - since)))
+
+    def _schedule(self, delay):
+        if not self._closed:
+            self._after = self.root.after(delay, self._frame)
+
+    def _frame(self):
+        self._after = None
+        self._frame_requested = False
+        busy = self.flush()
+        self._schedule(self.frame_ms if busy else self.IDLE_MS)
+
+    def flush(self) -> bool:
+        """Apply everything pending now; False if there was nothing"""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return False
+        self._last_frame = time.monotonic()
+        for update in pending.values():
+            try:
+                update()
+            except Exception:
+                # One failing update mustn't hold back the rest; report it the
+                # way Tk reports a failing callback
+                self.root.report_callback_exception(*sys.exc_info())
+        self.applied += len(pending)
+        return True
+
+    def close(self):
+        """Stop applying updates; anything still pending is dropped"""
+        self._closed = True
+        if self._after is not None:
+            try:
+                self.root.after_cancel(self._after)
+            except Exception:
+                pass  # the root is already destroyed
+            self._after = None
+        with self._lock:
+            self._pending.clear()
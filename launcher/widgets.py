@@ -0,0 +1,286 @@
+import tkinter as tk
+
+
+class Theme:
+    """Design system for consistent styling"""
+
+    # Colors
+    BG_PRIMARY = "#FFFFFF"
+    BG_SECONDARY = "#F8F9FA"
+    BG_HOVER = "#E9ECEF"
+
+    ACCENT_PRIMARY = "#4A90E2"
+    ACCENT_HOVER = "#357ABD"
+    ACCENT_DARK = "#2E5C8A"
+
+    TEXT_PRIMARY = "#1A1A1A"
+    TEXT_SECONDARY = "#6C757D"
+    TEXT_LIGHT = "#ADB5BD"
+
+    BORDER = "#DEE2E6"
+    SUCCESS = "#28A745"
+    ERROR = "#DC3545"
+    WARNING = "#FFC107"
+
+    # Fonts
+    FONT_TITLE = ("Segoe UI", 24, "bold")
+    FONT_SUBTITLE = ("Segoe UI", 12)
+    FONT_CATEGORY = ("Segoe UI", 16, "bold")
+    FONT_BUTTON = ("Segoe UI", 11)
+    FONT_BUTTON_LARGE = ("Segoe UI", 13)
+    FONT_STATUS = ("Segoe UI", 9)
+
+    # Spacing
+    PADDING_XL = 34
+    PADDING_L = 18
+    PADDING_M = 12
+    PADDING_S = 6
+
+    # Dimensions
+    BUTTON_HEIGHT = 32
+    BUTTON_HEIGHT_SMALL = 22
+    BORDER_RADIUS = 6
+
+
+class ModernButton(tk.Button):
+    """Custom button with hover effects and modern styling"""
+
+    def __init__(self, parent, style="primary", **kwargs):
+        # Set default styling based on style type
+        if style == "primary":
+            defaults = {
+                "bg": Theme.ACCENT_PRIMARY,
+                "fg": "white",
+                "activebackground": Theme.ACCENT_HOVER,
+                "activeforeground": "white",
+            }
+            self.hover_color = Theme.ACCENT_HOVER
+            self.normal_color = Theme.ACCENT_PRIMARY
+        elif style == "secondary":
+            defaults = {
+                "bg": Theme.BG_SECONDARY,
+                "fg": Theme.TEXT_PRIMARY,
+                "activebackground": Theme.BG_HOVER,
+                "activeforeground": Theme.TEXT_PRIMARY,
+            }
+            self.hover_color = Theme.BG_HOVER
+            self.normal_color = Theme.BG_SECONDARY
+        else:  # ghost/back button
+            defaults = {
+                "bg": Theme.BG_PRIMARY,
+                "fg": Theme.TEXT_SECONDARY,
+                "activebackground": Theme.BG_SECONDARY,
+                "activeforeground": Theme.TEXT_PRIMARY,
+            }
+            self.hover_color = Theme.BG_SECONDARY
+            self.normal_color = Theme.BG_PRIMARY
+
+        defaults.update(
+            {
+                "font": kwargs.get("font", Theme.FONT_BUTTON),
+                "relief": "flat",
+                "cursor": "hand2",
+                "bd": 0,
+                "padx": 20,
+                "pady": 12,
+            }
+        )
+
+        # Merge with provided kwargs
+        defaults.update(kwargs)
+
+        super().__init__(parent, **defaults)
+
+        # Bind hover events
+        self.bind("<Enter>", self._on_enter)
+        self.bind("<Leave>", self._on_leave)
+
+    def _on_enter(self, e):
+        self.config(bg=self.hover_color)
+
+    def _on_leave(self, e):
+        self.config(bg=self.normal_color)
+
+
+class VirtualList(tk.Frame):
+    """Scrollable list that only creates widgets for the rows on screen
+
+    Rows are recycled while scrolling, so memory stays constant no matter how
+    many items the list holds. ``label(item)`` gives a row's text,
+    ``on_select(item)`` runs when its button is clicked, ``on_shift_select(item)``
+    when it is Shift+clicked and ``on_hover(item)`` when the pointer enters a
+    row (with None when it leaves).
+    """
+
+    def __init__(
+        self,
+        parent,
+        label=str,
+        on_select=None,
+        on_hover=None,
+        on_shift_select=None,
+        **kwargs,
+    ):
+        kwargs.setdefault("bg", Theme.BG_PRIMARY)
+        super().__init__(parent, **kwargs)
+        self.label = label
+        self.on_select = on_select
+        self.on_hover = on_hover
+        self.on_shift_select = on_shift_select
+        self.items = []
+        self.selected = None
+        self.row_height = None
+        self._offset = 0
+        self._rows = []
+
+        self.scrollbar = tk.Scrollbar(self, orient="vertical", command=self._on_scroll)
+        self.viewport = tk.Frame(self, bg=self["bg"])
+        self.viewport.pack(side="left", fill="both", expand=True)
+
+        self.viewport.bind("<Configure>", lambda e: self._layout())
+        self._bind_wheel(self.viewport)
+
+    def set_items(self, items):
+        """Replace the list contents and redraw the visible rows"""
+        self.items = list(items)
+        if self.selected is not None and self.selected >= len(self.items):
+            self.selected = None
+        self._offset = min(self._offset, self._max_offset())
+        self._layout()
+
+    def _bind_wheel(self, widget):
+        widget.bind("<MouseWheel>", self._on_wheel)
+        widget.bind("<Button-4>", lambda e: self.scroll_rows(-1))
+        widget.bind("<Button-5>", lambda e: self.scroll_rows(1))
+
+    def _make_row(self):
+        container = tk.Frame(self.viewport, bg=self["bg"])
+        card_frame = tk.Frame(container, bg=Theme.BG_SECONDARY)
+        card_frame.pack(fill="x", pady=Theme.PADDING_S)
+
+        button = ModernButton(
+            card_frame,
+            style="secondary",
+            font=Theme.FONT_BUTTON,
+            width=50,
+            anchor="w",
+        )
+        button.pack(fill="x", padx=2, pady=2, ipady=8)
+        button.item = None
+        button.config(command=lambda b=button: self._select(b))
+        if self.on_shift_select:
+            button.bind("<Shift-Button-1>", lambda e, b=button: self._shift_select(b))
+        if self.on_hover:
+            button.bind("<Enter>", lambda e, b=button: self.on_hover(b.item), add="+")
+            button.bind("<Leave>", lambda e: self.on_hover(None), add="+")
+
+        self._bind_wheel(container)
+        self._bind_wheel(button)
+        self._rows.append((container, button))
+
+        if self.row_height is None:
+            container.update_idletasks()
+            self.row_height = max(1, container.winfo_reqheight())
+
+    def _select(self, button):
+        if self.on_select and button.item is not None:
+            self.on_select(button.item)
+
+    def _shift_select(self, button):
+        if button.item is not None:
+            self.on_shift_select(button.item)
+        # Skip the button's own press handling so the click doesn't also select
+        return "break"
+
+    def _max_offset(self):
+        if not self.row_height:
+            return 0
+        total = len(self.items) * self.row_height
+        return max(0, total - self.viewport.winfo_height())
+
+    def _layout(self):
+        height = self.viewport.winfo_height()
+        if not self._rows and self.items:
+            self._make_row()
+        if not self.row_height:
+            return
+
+        # One extra row covers the partially visible one at the bottom
+        needed = min(len(self.items), height // self.row_height + 2)
+        while len(self._rows) < needed:
+            self._make_row()
+
+        first = self._offset // self.row_height
+        shift = self._offset % self.row_height
+        for i, (container, button) in enumerate(self._rows):
+            index = first + i
+            y = i * self.row_height - shift
+            if index >= len(self.items) or y >= height:
+                container.place_forget()
+                continue
+
+            item = self.items[index]
+            if button.item is not item:
+                button.item = item
+                button.config(text=self.label(item))
+            selected = index == self.selected
+            button.config(bg=button.hover_color if selected else button.normal_color)
+            container.place(x=0, y=y, relwidth=1, height=self.row_height)
+
+        self._update_scrollbar(height)
+
+    def _update_scrollbar(self, height):
+        total = len(self.items) * self.row_height
+        if total <= height:
+            self.scrollbar.pack_forget()
+            return
+        self.scrollbar.pack(side="right", fill="y", before=self.viewport)
+        self.scrollbar.set(self._offset / total, (self._offset + height) / total)
+
+    def select(self, index):
+        """Highlight the row at ``index`` (None clears) and scroll it into view"""
+        if index is not None and self.items:
+            index = max(0, min(index, len(self.items) - 1))
+        else:
+            index = None
+        self.selected = index
+
+        if index is not None and self.row_height:
+            top = index * self.row_height
+            bottom = top + self.row_height - self.viewport.winfo_height()
+            if top < self._offset:
+                self._offset = top
+            elif bottom > self._offset:
+                self._offset = min(bottom, self._max_offset())
+        self._layout()
+
+    def selected_item(self):
+        if self.selected is None or self.selected >= len(self.items):
+            return None
+        return self.items[self.selected]
+
+    def scroll_to(self, offset):
+        """Scroll so that ``offset`` pixels of content are above the viewport"""
+        offset = max(0, min(int(offset), self._max_offset()))
+        if offset != self._offset:
+            self._offset = offset
+            self._layout()
+
+    def scroll_rows(self, count):
+        if self.row_height:
+            self.scroll_to(self._offset + count * self.row_height)
+
+    def _on_wheel(self, event):
+        # Windows reports multiples of 120 per notch, macOS small deltas
+        step = event.delta // 120 if abs(event.delta) >= 120 else event.delta
+        self.scroll_rows(-step)
+
+    def _on_scroll(self, action, amount, unit=None):
+        if action == "moveto":
+            total = len(self.items) * (self.row_height or 0)
+            self.scroll_to(float(amount) * total)
+        elif unit == "pages":
+            page = max(1, self.viewport.winfo_height() // (self.row_height or 1) - 1)
+            self.scroll_rows(int(amount) * page)
+        else:
+            self.scroll_rows(int(amount))
@@ -0,0 +1,268 @@
+import ast
+import codecs
+import importlib
+import importlib.util
+import json
+import os
+import runpy
+import sys
+import threading
+import traceback
+
+# Modules every script pulls in; importing them once here is what makes a
+# warm worker faster than a cold `python -m` start
+PRELOAD_MODULES = (
+    "json",
+    "subprocess",
+    "webbrowser",
+    "launcher.apps",
+    "launcher.browser",
+    "launcher.config",
+    "template.workspace",
+    "template.coding_template",
+    "template.study_template",
+)
+
+# Audit events raised whenever a script starts another process
+SPAWN_EVENTS = {
+    "subprocess.Popen",
+    "os.startfile",
+    "os.system",
+    "os.spawn",
+    "os.posix_spawn",
+    "os.exec",
+}
+
+_spawned = 0
+
+# How long to wait for the tail of a run's output once the script returns; an
+# app the script started may hold the pipe open for as long as it runs
+OUTPUT_DRAIN_TIMEOUT = 0.2
+
+_send_lock = threading.Lock()
+
+
+def _audit(event, args):
+    global _spawned
+    if event in SPAWN_EVENTS:
+        _spawned += 1
+
+
+def _open_channel():
+    """Move the protocol onto private fds so script output can't corrupt it"""
+    channel_in = os.fdopen(os.dup(0), "r", encoding="utf-8")
+    channel_out = os.fdopen(os.dup(1), "w", encoding="utf-8")
+
+    # Anything a script (or an app it spawns) reads or writes on the standard
+    # streams must never reach the protocol pipes
+    devnull = os.open(os.devnull, os.O_RDWR)
+    os.dup2(devnull, 0)
+    os.dup2(devnull, 1)
+    os.close(devnull)
+
+    return channel_in, channel_out
+
+
+def _preload():
+    """Import shared dependencies and resolve .env ahead of the first run"""
+    for name in PRELOAD_MODULES:
+        try:
+            importlib.import_module(name)
+        except Exception:
+            pass
+
+    try:
+        from launcher.config import load_env
+
+        load_env()
+    except ImportError:
+        pass
+
+
+def _idle_priority():
+    """Lower the calling thread to the lowest scheduling priority (Linux)"""
+    if sys.platform.startswith("linux"):
+        try:
+            os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), 19)
+        except OSError:
+            pass
+
+
+def _script_imports(spec) -> list:
+    """Absolute names of the modules a script imports at top level"""
+    tree = ast.parse(spec.loader.get_source(spec.name))
+    names = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            names.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            relative = "." * node.level + (node.module or "")
+            names.append(importlib.util.resolve_name(relative, spec.parent))
+    return names
+
+
+def _prepare(module_path, cancelled, channel):
+    """Get a script ready to run: compile it and import what it imports
+
+    Runs in a thread of its own at idle priority, which it never leaves, and
+    stops between imports once ``cancelled`` is set. The pool sends this
+    worker no run until "prepared" is reported, so nothing waits on the
+    thread and whatever the imports print goes to devnull, not into a run.
+    """
+    _idle_priority()
+    imported = 0
+    try:
+        try:
+            spec = importlib.util.find_spec(module_path)
+            # Compiling writes the bytecode cache the run will load from
+            spec.loader.get_code(module_path)
+            names = _script_imports(spec)
+        except Exception:
+            names = []
+        for name in names:
+            if cancelled.is_set():
+                break
+            if name in sys.modules:
+                continue
+            try:
+                importlib.import_module(name)
+                imported += 1
+            except Exception:
+                pass  # the run reports it properly
+    finally:
+        _send(
+            channel, {"event": "prepared", "module": module_path, "imported": imported}
+        )
+
+
+def _send(channel, message):
+    with _send_lock:
+        channel.write(json.dumps(message) + "\n")
+        channel.flush()
+
+
+def _forward(read_fd, run_id, channel):
+    """Stream everything written to the run's stdout/stderr as output events"""
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    with os.fdopen(read_fd, "rb", buffering=0) as pipe:
+        while True:
+            chunk = pipe.read(65536)
+            if not chunk:
+                break
+            data = decoder.decode(chunk)
+            if data:
+                _send(channel, {"event": "output", "run": run_id, "data": data})
+
+
+def _exec_module(module_path: str) -> int:
+    """Run a module as __main__ and translate how it ended into an exit code"""
+    try:
+        runpy.run_module(module_path, run_name="__main__", alter_sys=True)
+        return 0
+    except SystemExit as e:
+        if e.code is None:
+            return 0
+        if isinstance(e.code, int):
+            return e.code
+        print(e.code, file=sys.stderr)
+        return 1
+    except BaseException:
+        traceback.print_exc()
+        return 1
+
+
+def _run(module_path: str, run_id, channel):
+    """Execute one script with its output streamed, then restore worker state"""
+    global _spawned
+    _spawned = 0
+    saved_argv = sys.argv[:]
+    saved_path = sys.path[:]
+    saved_env = dict(os.environ)
+    saved_cwd = os.getcwd()
+
+    read_fd, write_fd = os.pipe()
+    forwarder = threading.Thread(
+        target=_forward, args=(read_fd, run_id, channel), daemon=True
+    )
+    forwarder.start()
+
+    sys.stdout.flush()
+    sys.stderr.flush()
+    saved_fds = os.dup(1), os.dup(2)
+    os.dup2(write_fd, 1)
+    os.dup2(write_fd, 2)
+    os.close(write_fd)
+
+    try:
+        sys.argv = [module_path]
+        returncode = _exec_module(module_path)
+    finally:
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os.dup2(saved_fds[0], 1)
+        os.dup2(saved_fds[1], 2)
+        os.close(saved_fds[0])
+        os.close(saved_fds[1])
+
+        sys.argv = saved_argv
+        sys.path[:] = saved_path
+        os.environ.clear()
+        os.environ.update(saved_env)
+        os.chdir(saved_cwd)
+
+    forwarder.join(OUTPUT_DRAIN_TIMEOUT)
+    return returncode, _spawned
+
+
+def main():
+    channel_in, channel_out = _open_channel()
+    _preload()
+    sys.addaudithook(_audit)
+    _send(channel_out, {"event": "ready", "pid": os.getpid()})
+
+    preparing = None
+    for line in channel_in:
+        request = json.loads(line)
+        cmd = request.get("cmd")
+
+        # "cancel" cuts a preparation short; it reports "prepared" when it
+        # stops. The pool sends nothing else until then, but should anything
+        # come, the preparation is stopped before it's handled
+        if preparing is not None:
+            thread, cancelled = preparing
+            cancelled.set()
+            if cmd == "cancel":
+                continue
+            thread.join()
+            preparing = None
+
+        if cmd == "exit":
+            break
+        if cmd == "cancel":
+            continue
+        if cmd == "prepare":
+            cancelled = threading.Event()
+            thread = threading.Thread(
+                target=_prepare,
+                args=(request["module"], cancelled, channel_out),
+                daemon=True,
+            )
+            thread.start()
+            preparing = thread, cancelled
+            continue
+
+        run_id = request.get("run")
+        returncode, spawned = _run(request["module"], run_id, channel_out)
+        _send(
+            channel_out,
+            {
+                "event": "exit",
+                "run": run_id,
+                "returncode": returncode,
+                "spawned": spawned,
+            },
+        )
+
+
+if __name__ == "__main__":
+    main()
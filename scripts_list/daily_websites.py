@@ -1,11 +1,14 @@
-import webbrowser
-import time
 import os
-from dotenv import load_dotenv
 import json
 
+from launcher.browser import open_urls
+from launcher.config import load_env
+
+# Picked up by the launcher's script discovery
+SCRIPT_INFO = {"category": "morning"}
+
 # Load environment variables from .env file
-load_dotenv()
+load_env()
 
 # Get websites from environment variable and parse as JSON array
 websites_json = os.getenv("WEBSITES", "[]")
@@ -15,9 +18,7 @@ if not websites:
     print("No websites found in .env file. Please check your configuration.")
     exit(1)
 
-# Open each website in a new tab
-for url in websites:
-    webbrowser.open(url)
-    time.sleep(3)  # Brief delay between opening tabs
+# Hand the whole list to the browser; tabs keep opening in the background
+open_urls(websites)
 
-print(f"Successfully opened {len(websites)} websites!")
+print(f"Opening {len(websites)} websites...")
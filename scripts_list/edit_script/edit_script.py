@@ -1,7 +1,5 @@
 import os
 import sys
-from dotenv import load_dotenv
-
 
 # Add the parent directory (py_scripts) to Python path
 parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -10,6 +8,9 @@ if parent_dir not in sys.path:
 
 from template.coding_template import CodingEnvironment
 
+# Picked up by the launcher's script discovery
+SCRIPT_INFO = {"category": "coding"}
+
 
 class CurrentCoding(CodingEnvironment):
     """Current coding environment implementation"""
@@ -30,5 +31,4 @@ class CurrentCoding(CodingEnvironment):
 if __name__ == "__main__":
     # Create and launch the coding environment
     coding = CurrentCoding()
-    coding.launch()
-    coding.open_powershell(coding.get_coding_path())
+    coding.launch_workspace(shell=True)
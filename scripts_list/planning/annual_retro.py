@@ -1,10 +1,14 @@
 import os
 import subprocess
 import sys
-from dotenv import load_dotenv
+
+from launcher.config import load_env
+
+# Picked up by the launcher's script discovery
+SCRIPT_INFO = {"name": "Annual Retrospective"}
 
 # Load environment variables from .env file
-load_dotenv()
+load_env()
 
 # Get file path from environment variable
 file_path = os.getenv("YEARLY_RETROSPECTIVE_PATH")
@@ -2,10 +2,15 @@ import webbrowser
 import subprocess
 import os
 import sys
-from dotenv import load_dotenv
+
+from launcher.apps import registry, vscode_window
+from launcher.config import load_env
+
+# Picked up by the launcher's script discovery
+SCRIPT_INFO = {"name": "Start Claude Web UI", "category": "coding"}
 
 # Load environment variables from .env file
-load_dotenv()
+load_env()
 
 # Open Claude.ai in the default browser
 print("Opening Claude.ai...")
@@ -21,9 +26,16 @@ vscode_workspace = os.getenv(
 try:
     print("Opening VS Code...")
     if vscode_workspace:
-        # Open VS Code with a specific workspace/folder
-        subprocess.Popen([vscode_path, vscode_workspace])
-        print(f"VS Code opened with: {vscode_workspace}")
+        # Open VS Code with a specific workspace/folder, unless it already is
+        if registry.launch(
+            "vscode",
+            vscode_workspace,
+            [vscode_path, vscode_workspace],
+            window=vscode_window(vscode_workspace),
+        ):
+            print(f"VS Code is already open with: {vscode_workspace}")
+        else:
+            print(f"VS Code opened with: {vscode_workspace}")
     else:
         # Open VS Code without a specific workspace
         subprocess.Popen([vscode_path])
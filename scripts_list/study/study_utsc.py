@@ -1,6 +1,5 @@
 import os
 import sys
-from dotenv import load_dotenv
 
 # Add the parent directory (py_scripts) to Python path
 parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -9,6 +8,9 @@ if parent_dir not in sys.path:
 
 from template.study_template import StudyEnvironment
 
+# Picked up by the launcher's script discovery
+SCRIPT_INFO = {"name": "Study UTSC"}
+
 
 class CurrentStudy(StudyEnvironment):
     """Current study environment implementation"""
@@ -29,5 +31,4 @@ class CurrentStudy(StudyEnvironment):
 if __name__ == "__main__":
     # Create and launch the study environment
     study = CurrentStudy()
-    study.launch()
-    study.open_file_explorer(study.get_study_path())
+    study.launch_workspace(file_manager=True)
@@ -13,7 +13,16 @@ $pythonPath = "C:\Users\james\AppData\Local\Programs\Python\Python310\python.exe
 # Project root (IMPORTANT: this must be py_scripts)
 $projectRoot = "C:\Users\james\projects\py_scripts"
 
-# Log directory and file
+# Launcher arguments; empty starts the GUI. For scheduled runs without a GUI
+# use the headless CLI, e.g. @("run-many", "-j", "2", "Planning/Annual Plan").
+# Recurring runs are better set in LAUNCHER_SCHEDULE in .env: the GUI runs
+# them while it is open, and @("schedule") runs them headless, so a single
+# at-logon trigger replaces one trigger (and cold start) per run.
+$launcherArgs = @()
+
+# Log directory and file. This only captures the launcher's own console
+# output; each run's full output is kept by the launcher in rotating,
+# compressed segments under logs\launcher (see `python -m script_launcher log`).
 $logDir = "$projectRoot\logs"
 $logFile = "$logDir\script_launcher.log"
 
@@ -39,7 +48,7 @@ Add-Content -Path $logFile -Value "`n[$startTime] Starting ScriptLauncher"
 
 try {
     # Run ScriptLauncher as a module
-    $output = & $pythonPath -m script_launcher 2>&1
+    $output = & $pythonPath -m script_launcher @launcherArgs 2>&1
 
     # Log output
     $output | Add-Content -Path $logFile
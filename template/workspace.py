@@ -0,0 +1,313 @@
+import subprocess
+import os
+import sys
+import json
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+
+from launcher.apps import folder_window, registry, vscode_window
+from launcher.browser import open_urls
+from launcher.config import load_env
+
+# Step outcomes
+OK = "ok"
+FAILED = "failed"
+SKIPPED = "skipped"
+
+
+@dataclass
+class Step:
+    name: str
+    action: object
+    requires: tuple = ()
+    critical: bool = False
+
+
+@dataclass
+class StepResult:
+    name: str
+    status: str
+    elapsed: float = 0.0
+    error: str = ""
+
+
+@dataclass
+class WorkspaceResult:
+    steps: dict = field(default_factory=dict)
+    elapsed: float = 0.0
+    critical: tuple = ()
+
+    @property
+    def ok(self) -> bool:
+        """True unless a critical step failed or was skipped"""
+        return all(self.steps[name].status == OK for name in self.critical)
+
+    def report(self) -> str:
+        lines = [f"Workspace finished in {self.elapsed:.2f}s"]
+        for result in self.steps.values():
+            line = f"  {result.name:<20} {result.status:<8} {result.elapsed:6.2f}s"
+            if result.error:
+                line += f"  {result.error}"
+            lines.append(line)
+        return "\n".join(lines)
+
+
+class Workspace:
+    """A set of launch steps with dependencies, run concurrently as a DAG
+
+    A step runs as soon as everything it ``requires`` finished successfully.
+    A step fails when its action raises or returns False; steps depending on
+    it are skipped, every other branch carries on regardless.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self.steps = {}
+
+    def add(self, name, action, requires=(), critical=False):
+        if name in self.steps:
+            raise ValueError(f"duplicate workspace step: {name}")
+        self.steps[name] = Step(name, action, tuple(requires), critical)
+        return self
+
+    def _check(self):
+        """Reject unknown dependencies and cycles before anything is launched"""
+        for step in self.steps.values():
+            for dependency in step.requires:
+                if dependency not in self.steps:
+                    raise ValueError(
+                        f"step {step.name!r} requires unknown step {dependency!r}"
+                    )
+
+        visiting, done = set(), set()
+
+        def visit(name):
+            if name in done:
+                return
+            if name in visiting:
+                raise ValueError(f"workspace steps form a cycle through {name!r}")
+            visiting.add(name)
+            for dependency in self.steps[name].requires:
+                visit(dependency)
+            visiting.discard(name)
+            done.add(name)
+
+        for name in self.steps:
+            visit(name)
+
+    def run(self, max_workers=None) -> WorkspaceResult:
+        self._check()
+        start = time.perf_counter()
+        results = {}
+        pending = dict(self.steps)
+        running = {}
+
+        with ThreadPoolExecutor(max_workers=max_workers or len(pending) or 1) as pool:
+            while pending or running:
+                for name, step in list(pending.items()):
+                    states = [results.get(d) for d in step.requires]
+                    if any(r is not None and r.status != OK for r in states):
+                        del pending[name]
+                        results[name] = StepResult(name, SKIPPED)
+                    elif all(r is not None for r in states):
+                        del pending[name]
+                        running[pool.submit(_run_step, step)] = name
+
+                if not running:
+                    # Only skips happened this round; re-scan the rest
+                    continue
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    del running[future]
+                    result = future.result()
+                    results[result.name] = result
+
+        return WorkspaceResult(
+            steps={name: results[name] for name in self.steps},
+            elapsed=time.perf_counter() - start,
+            critical=tuple(s.name for s in self.steps.values() if s.critical),
+        )
+
+
+def _run_step(step) -> StepResult:
+    start = time.perf_counter()
+    try:
+        ok = step.action() is not False
+        error = ""
+    except Exception as e:
+        ok, error = False, str(e) or type(e).__name__
+    status = OK if ok else FAILED
+    return StepResult(step.name, status, time.perf_counter() - start, error)
+
+
+class WorkspaceEnvironment(ABC):
+    """Shared base for workspace environments: editor, file manager, shell,
+    websites and documents, launched through a ``Workspace`` step graph"""
+
+    # Used in messages, e.g. "coding path not configured"
+    kind = "workspace"
+
+    def __init__(self, env_file=".env"):
+        """Initialize and load environment variables"""
+        load_env(env_file)
+        self.vscode_path = os.getenv("VSCODE_PATH", "code")
+
+    @abstractmethod
+    def get_workspace_path(self):
+        """Return the workspace path - must be implemented by subclasses"""
+        pass
+
+    def validate_path(self, path):
+        """Check if the directory exists"""
+        if not os.path.exists(path):
+            print(f"Error: Directory not found at {path}")
+            return False
+        return True
+
+    def open_vscode(self, path):
+        """Open VS Code in the specified directory"""
+        try:
+            if registry.launch(
+                "vscode", path, [self.vscode_path, path], window=vscode_window(path)
+            ):
+                print(f"VS Code is already open in: {path}")
+                return True
+            print(f"Opening VS Code in: {path}")
+            print("VS Code opened successfully!")
+            return True
+        except FileNotFoundError:
+            print(f"Error: VS Code not found at '{self.vscode_path}'")
+            print(
+                "Make sure VS Code is installed and the path is correct in your .env file"
+            )
+            return False
+        except Exception as e:
+            print(f"Error opening VS Code: {e}")
+            return False
+
+    def open_file_explorer(self, path):
+        """Open file explorer in the specified directory"""
+        try:
+            if registry.launch(
+                "explorer",
+                path,
+                _system_open_command(path),
+                window=folder_window(path),
+            ):
+                print(f"File Explorer is already open in: {path}")
+                return True
+            print(f"Opening File Explorer in: {path}")
+            print("File Explorer opened successfully!")
+            return True
+        except Exception as e:
+            print(f"Error opening File Explorer: {e}")
+            return False
+
+    def open_document(self, path):
+        """Open a file with its default application"""
+        try:
+            print(f"Opening document: {path}")
+            subprocess.Popen(_system_open_command(path))
+            return True
+        except Exception as e:
+            print(f"Error opening {path}: {e}")
+            return False
+
+    def open_websites(self, websites_array):
+        websites_json = os.getenv(websites_array, "[]")
+        websites = json.loads(websites_json)
+
+        # Opening continues in the background while the rest of the setup runs
+        open_urls(websites)
+        print(f"Opening {len(websites)} websites...")
+
+    def open_powershell(self, path):
+        try:
+            if registry.launch(
+                "powershell",
+                path,
+                [
+                    "powershell.exe",
+                    "-NoExit",
+                    "-ExecutionPolicy",
+                    "Bypass",
+                ],
+                cwd=path,
+                # A console of its own on Windows; the flag doesn't exist elsewhere
+                creationflags=getattr(subprocess, "CREATE_NEW_CONSOLE", 0),
+            ):
+                print(f"PowerShell is already open in: {path}")
+            return True
+        except Exception as e:
+            print(f"Error opening PowerShell: {e}")
+            return False
+
+    def workspace(
+        self,
+        editor=True,
+        file_manager=False,
+        shell=False,
+        websites=None,
+        documents=(),
+    ) -> Workspace:
+        """Declare the steps of this workspace
+
+        Everything that needs the directory waits for it to be validated;
+        websites don't need it and start straight away.
+        """
+        path = self.get_workspace_path()
+        workspace = Workspace(path)
+        workspace.add("validate", lambda: self.validate_path(path), critical=True)
+        if editor:
+            workspace.add(
+                "editor",
+                lambda: self.open_vscode(path),
+                requires=["validate"],
+                critical=True,
+            )
+        if file_manager:
+            workspace.add(
+                "file_manager",
+                lambda: self.open_file_explorer(path),
+                requires=["validate"],
+            )
+        if shell:
+            workspace.add(
+                "shell", lambda: self.open_powershell(path), requires=["validate"]
+            )
+        if websites:
+            workspace.add("websites", lambda: self.open_websites(websites))
+        for document in documents:
+            workspace.add(
+                f"document:{document}",
+                lambda d=document: self.open_document(os.path.join(path, d)),
+                requires=["validate"],
+            )
+        return workspace
+
+    def launch_workspace(self, **steps) -> WorkspaceResult:
+        """Run the declared workspace; exits with status 1 if a critical step failed"""
+        if not self.get_workspace_path():
+            print(f"Error: {self.kind} path not configured")
+            sys.exit(1)
+
+        result = self.workspace(**steps).run()
+        print(result.report())
+        if not result.ok:
+            sys.exit(1)
+        return result
+
+    def launch(self):
+        """Main method to launch the environment: validate and open VS Code"""
+        self.launch_workspace()
+
+
+def _system_open_command(path):
+    if sys.platform == "win32":
+        return ["explorer", path]
+    elif sys.platform == "darwin":  # macOS
+        return ["open", path]
+    else:  # Linux
+        return ["xdg-open", path]
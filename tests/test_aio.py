@@ -0,0 +1,188 @@
+import asyncio
+import os
+import subprocess
+
+import pytest
+
+from launcher.aio import AsyncJobScheduler, AsyncWorkerPool, TkEventLoop
+from launcher.config import BASE_DIR
+from launcher.jobs import CANCELLED, DONE, QUEUED, RUNNING
+
+
+class FakeRoot:
+    """Tk's after/after_cancel; ``run_due()`` fires what's scheduled"""
+
+    def __init__(self):
+        self.timers = {}
+        self.delays = []
+        self._ids = 0
+
+    def after(self, ms, callback):
+        self._ids += 1
+        self.timers[self._ids] = callback
+        self.delays.append(ms)
+        return self._ids
+
+    def after_cancel(self, timer):
+        self.timers.pop(timer, None)
+
+    def run_due(self, times=1):
+        for _ in range(times):
+            timers, self.timers = self.timers, {}
+            for callback in timers.values():
+                callback()
+
+
+@pytest.fixture
+def tk_loop():
+    root = FakeRoot()
+    aio = TkEventLoop(root)
+    yield root, aio
+    if not aio.loop.is_closed():
+        aio.close()
+    asyncio.set_event_loop(None)
+
+
+def test_tk_loop_runs_tasks_in_slices(tk_loop):
+    root, aio = tk_loop
+    aio.start()
+    steps = []
+
+    async def work():
+        for i in range(3):
+            steps.append(i)
+            await asyncio.sleep(0)
+        return "done"
+
+    task = aio.create_task(work())
+    root.run_due(10)
+    assert task.result() == "done"
+    assert steps == [0, 1, 2]
+    # Slices come quickly while busy and slowly once idle
+    assert TkEventLoop.BUSY_MS in root.delays
+    assert root.delays[-1] == TkEventLoop.IDLE_MS
+
+
+def test_tk_loop_close_runs_final_and_cancels_the_rest(tk_loop):
+    root, aio = tk_loop
+    aio.start()
+    finished = []
+
+    async def final():
+        await asyncio.sleep(0)
+        finished.append("final")
+
+    forever = aio.create_task(asyncio.sleep(3600))
+    root.run_due()
+    aio.close(final())
+    assert finished == ["final"]
+    assert forever.cancelled()
+    assert aio.loop.is_closed()
+    assert root.timers == {}
+
+
+def test_async_scheduler_priorities_and_shutdown_cancellation():
+    async def test():
+        loop = asyncio.get_running_loop()
+        started = []
+        gates = {}
+
+        async def run(job):
+            started.append(job.script_name)
+            await gates.setdefault(job.script_name, asyncio.Event()).wait()
+            return job.script_name
+
+        scheduler = AsyncJobScheduler(run, loop, max_workers=1)
+        first = scheduler.submit("first", "m.first")
+        low = scheduler.submit("low", "m.low")
+        high = scheduler.submit("high", "m.high", priority=3)
+        await asyncio.sleep(0)
+        assert first.state == RUNNING and low.state == QUEUED
+
+        gates.setdefault("first", asyncio.Event()).set()
+        while len(started) < 2:
+            await asyncio.sleep(0)
+        assert first.state == DONE and first.result == "first"
+        assert started == ["first", "high"]
+
+        # Closing: the queued job never starts, the running one is cancelled
+        scheduler.shutdown(cancel_running=True)
+        await scheduler.wait()
+        assert low.state == high.state == CANCELLED
+        assert high.cancelled
+        assert started == ["first", "high"]
+
+    asyncio.run(test())
+
+
+@pytest.fixture
+def script_env(tmp_path):
+    (tmp_path / "aio_ok.py").write_text('print("hello")\n')
+    (tmp_path / "aio_sleeps.py").write_text(
+        "import sys, time\nprint('sleeping', flush=True)\ntime.sleep(30)\n"
+    )
+    return dict(os.environ, PYTHONPATH=str(tmp_path))
+
+
+def _pool_test(env, test, **kwargs):
+    async def main():
+        pool = AsyncWorkerPool(asyncio.get_running_loop(), BASE_DIR, env=env, **kwargs)
+        pool.start()
+        try:
+            await test(pool)
+        finally:
+            await pool.shutdown()
+
+    asyncio.run(main())
+
+
+async def _run(pool, module, timeout=20):
+    started = []
+    result = await pool.run(module, timeout=timeout, on_start=started.append)
+    return result, started[0]
+
+
+def test_async_pool_reuses_workers_and_replaces_timed_out_ones(script_env):
+    async def test(pool):
+        while not pool._idle:
+            await asyncio.sleep(0.01)
+        result, first = await _run(pool, "aio_ok")
+        assert (result.returncode, result.stdout) == (0, "hello\n")
+        assert (await _run(pool, "aio_ok"))[1].pid == first.pid
+
+        started = []
+        with pytest.raises(subprocess.TimeoutExpired):
+            await pool.run("aio_sleeps", timeout=1, on_start=started.append)
+        await asyncio.wait_for(started[0].wait(), 5)
+        assert (await _run(pool, "aio_ok"))[1].pid != started[0].pid
+
+    _pool_test(script_env, test, size=1)
+
+
+def test_async_pool_cancel_kills_unless_shut_down(script_env):
+    async def test(pool):
+        async def cancel_run():
+            started = []
+            task = asyncio.create_task(
+                pool.run("aio_sleeps", timeout=30, on_start=started.append)
+            )
+            while not started:
+                await asyncio.sleep(0.01)
+            await asyncio.sleep(0.5)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            return started[0]
+
+        process = await cancel_run()
+        await asyncio.wait_for(process.wait(), 5)
+
+        # After shutdown, runs in flight are left to finish on their own
+        await pool.shutdown()
+        process = await cancel_run()
+        await asyncio.sleep(0.2)
+        assert process.returncode is None
+        process.kill()
+        await process.wait()
+
+    _pool_test(script_env, test, size=0)
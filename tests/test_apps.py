@@ -0,0 +1,103 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from launcher import apps
+from launcher.apps import AppRegistry
+
+SLEEPER = [sys.executable, "-c", "import time; time.sleep(30)"]
+
+
+@pytest.fixture
+def registry(tmp_path, monkeypatch):
+    monkeypatch.delenv("LAUNCHER_REUSE_APPS", raising=False)
+    # No window manager to ask in tests
+    monkeypatch.setattr(apps, "focus", lambda pid=None, window=None: False)
+    return AppRegistry(tmp_path / "apps.json")
+
+
+@pytest.fixture
+def started(monkeypatch):
+    """Processes the registry starts, killed at the end of the test"""
+    processes = []
+    popen = subprocess.Popen
+
+    def tracking(*args, **kwargs):
+        processes.append(popen(*args, **kwargs))
+        return processes[-1]
+
+    monkeypatch.setattr(apps.subprocess, "Popen", tracking)
+    yield processes
+    for process in processes:
+        process.kill()
+        process.wait()
+
+
+def test_key_normalises_the_path(tmp_path):
+    assert AppRegistry.key("vscode", tmp_path / "a" / "..") == AppRegistry.key(
+        "vscode", str(tmp_path)
+    )
+    assert AppRegistry.key("shell", None) == "shell:"
+
+
+def test_only_live_entries_are_loaded_and_kept(registry):
+    finished = subprocess.Popen([sys.executable, "-c", "pass"])
+    finished.wait()
+    me = os.getpid()
+    entries = {
+        "alive": {"pid": me, "started": apps._start_token(me)},
+        "exited": {"pid": finished.pid, "started": "1"},
+        # Same pid, but not the process that was launched
+        "recycled": {"pid": me, "started": "not this one"},
+    }
+    registry.path.write_text(json.dumps(entries))
+    assert list(registry.running()) == ["alive"]
+    assert list(json.loads(registry.path.read_text())) == ["alive"]
+
+
+def test_unreadable_registry_is_empty(registry):
+    registry.path.write_text("{not json")
+    assert registry.running() == {}
+
+
+def test_launch_reuses_a_running_app_until_it_exits(registry, started, tmp_path):
+    assert not registry.launch("shell", tmp_path, SLEEPER)
+    assert registry.launch("shell", tmp_path, SLEEPER)
+    assert len(started) == 1
+    entry = registry.running()[AppRegistry.key("shell", tmp_path)]
+    assert entry["pid"] == started[0].pid
+
+    started[0].kill()
+    started[0].wait()
+    assert not registry.launch("shell", tmp_path, SLEEPER)
+    assert len(started) == 2
+
+
+def test_reuse_can_be_turned_off(registry, started, tmp_path, monkeypatch):
+    monkeypatch.setenv("LAUNCHER_REUSE_APPS", "0")
+    assert not registry.launch("shell", tmp_path, SLEEPER)
+    assert not registry.launch("shell", tmp_path, SLEEPER)
+    assert len(started) == 2
+
+
+def test_apps_with_a_window_are_found_by_it_not_their_launcher_pid(
+    registry, started, tmp_path, monkeypatch
+):
+    windows = []
+    monkeypatch.setattr(
+        apps,
+        "focus",
+        lambda pid=None, window=None: any(window(*found) for found in windows),
+    )
+    match = apps.folder_window(tmp_path)
+    # The stub may still be running; only the window counts
+    assert not registry.launch("explorer", tmp_path, SLEEPER, window=match)
+    assert registry.running() == {}
+    assert not registry.launch("explorer", tmp_path, SLEEPER, window=match)
+
+    windows.append(("Nautilus", tmp_path.name))
+    assert registry.launch("explorer", tmp_path, SLEEPER, window=match)
+    assert len(started) == 2
@@ -0,0 +1,93 @@
+import sys
+import time
+
+import pytest
+
+from launcher import browser
+from launcher.browser import RateLimiter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+        self.slept = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(browser.time, "monotonic", clock.monotonic)
+    monkeypatch.setattr(browser.time, "sleep", clock.sleep)
+    return clock
+
+
+def test_burst_then_rate(clock):
+    limiter = RateLimiter(rate=2, burst=3)
+    assert [limiter.try_acquire() for _ in range(4)] == [True, True, True, False]
+    clock.now += 0.25
+    assert not limiter.try_acquire()
+    clock.now += 0.25
+    assert limiter.try_acquire()
+    # Refills never go past the burst
+    clock.now += 60
+    assert [limiter.try_acquire() for _ in range(4)] == [True, True, True, False]
+
+
+def test_acquire_sleeps_until_the_next_token(clock):
+    limiter = RateLimiter(rate=4)
+    for _ in range(3):
+        limiter.acquire()
+    assert clock.slept == [0.25, 0.25]
+
+
+def test_zero_rate_is_unlimited(clock):
+    limiter = RateLimiter(rate=0)
+    for _ in range(50):
+        limiter.acquire()
+    assert clock.slept == []
+
+
+def test_batches_respect_the_command_length(monkeypatch):
+    monkeypatch.setattr(browser, "MAX_COMMAND_LENGTH", 30)
+    urls = [f"https://e.com/{i}" for i in range(4)]
+    batches = list(browser._batches(["browser"], urls))
+    assert [url for batch in batches for url in batch] == urls
+    assert all(len(" ".join(["browser", *batch])) <= 30 for batch in batches)
+    assert len(batches) == 4
+
+
+@pytest.mark.parametrize("value", ["fast", "-1"])
+def test_bad_rate_falls_back_with_a_warning(monkeypatch, capsys, value):
+    monkeypatch.setenv("BROWSER_OPEN_RATE", value)
+    rate = browser._env_number("BROWSER_OPEN_RATE", browser.DEFAULT_RATE, float)
+    assert rate == browser.DEFAULT_RATE
+    assert "BROWSER_OPEN_RATE" in capsys.readouterr().err
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="fake browser is a shell script")
+def test_opener_outlives_the_caller_and_batches(tmp_path, monkeypatch):
+    log = tmp_path / "opened.txt"
+    fake = tmp_path / "fake-browser"
+    fake.write_text(f'#!/bin/sh\necho "$@" >> "{log}"\n')
+    fake.chmod(0o755)
+    monkeypatch.setenv("BROWSER_PATH", str(fake))
+
+    urls = [f"https://example.com/{i}" for i in range(5)]
+    started = time.monotonic()
+    opener = browser.open_urls(urls, rate=0)
+    # Returns at once; the pacing happens in the opener process
+    assert time.monotonic() - started < 1
+    assert opener.wait(timeout=30) == 0
+    # The browser it started may still be writing
+    deadline = time.monotonic() + 10
+    while not (log.exists() and len(log.read_text().split()) == len(urls)):
+        assert time.monotonic() < deadline, "the browser never got the URLs"
+        time.sleep(0.02)
+    assert log.read_text().split() == urls
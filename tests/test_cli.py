@@ -0,0 +1,67 @@
+import subprocess
+import sys
+
+import pytest
+
+from launcher.cli import COMMANDS, build_parser, resolve, resolve_all
+from launcher.config import BASE_DIR, ScriptEntry
+
+SCRIPTS = {
+    "coding": [ScriptEntry("Capstone", "scripts_list.coding_capstone", "coding")],
+    "study": [ScriptEntry("Math", "scripts_list.study_math", "study")],
+}
+
+
+def _launcher(*args, **kwargs):
+    """Run the package as `python -m script_launcher` would"""
+    return subprocess.run(
+        [sys.executable, "-X", "importtime", str(BASE_DIR), *args],
+        capture_output=True,
+        text=True,
+        timeout=60,
+        **kwargs,
+    )
+
+
+def test_commands_match_the_parser():
+    subparsers = next(
+        action for action in build_parser()._actions if action.dest == "command"
+    )
+    assert set(subparsers.choices) == set(COMMANDS)
+
+
+def test_resolve_by_ref_or_module():
+    assert resolve(SCRIPTS, "coding/capstone").name == "Capstone"
+    assert resolve(SCRIPTS, " Study / MATH ").module == "scripts_list.study_math"
+    assert resolve(SCRIPTS, "scripts_list.study_math").name == "Math"
+    assert resolve(SCRIPTS, "coding") is None
+    assert resolve(SCRIPTS, "coding/missing") is None
+
+
+def test_resolve_all_names_the_unknown_ref():
+    with pytest.raises(LookupError, match="study/missing"):
+        resolve_all(SCRIPTS, ["coding/capstone", "study/missing"])
+
+
+@pytest.mark.parametrize("flag", ["-h", "--help"])
+def test_help_is_the_cli_and_skips_tkinter(flag):
+    result = _launcher(flag)
+    assert result.returncode == 0
+    assert "run-many" in result.stdout
+    # -X importtime lists every module imported on stderr
+    assert "tkinter" not in result.stderr
+
+
+def test_closed_stdout_exits_quietly():
+    process = subprocess.Popen(
+        [sys.executable, str(BASE_DIR), "list", "--local"],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    # Like `list | head` once head has read what it wanted
+    process.stdout.close()
+    stderr = process.stderr.read()
+    assert process.wait(timeout=60) == 1
+    assert "BrokenPipeError" not in stderr
+    assert "Traceback" not in stderr
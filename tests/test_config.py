@@ -0,0 +1,124 @@
+import json
+import os
+
+import pytest
+
+from launcher import config
+from launcher.config import RESOLVED_MARKER, ScriptEntry, load_config, load_env
+
+
+@pytest.fixture(autouse=True)
+def isolated(tmp_path, monkeypatch):
+    """A cache of the test's own and nothing loaded in this process yet"""
+    monkeypatch.setattr(config, "CACHE_DIR", tmp_path / "cache")
+    monkeypatch.setattr(config, "_loaded", {})
+    monkeypatch.delenv(RESOLVED_MARKER, raising=False)
+    monkeypatch.delenv("SCRIPTS_LIST", raising=False)
+
+
+@pytest.fixture
+def parses(monkeypatch):
+    """Names of the env files parsed from here on"""
+    parsed = []
+    parse = config._parse_env_file
+
+    def counting(env_file):
+        parsed.append(env_file.name)
+        return parse(env_file)
+
+    monkeypatch.setattr(config, "_parse_env_file", counting)
+    return parsed
+
+
+def _env_file(path, **values):
+    path.write_text("".join(f"{k}={v}\n" for k, v in values.items()))
+    return path
+
+
+def test_parse_scripts_keeps_valid_entries_and_reports_the_rest():
+    problems = []
+    raw = json.dumps(
+        {
+            "coding": [
+                {"name": "Capstone", "module": "scripts_list.capstone"},
+                {"module": "scripts_list.unnamed"},
+                {"name": "No module"},
+                "not an entry",
+            ],
+            "study": "not a list",
+        }
+    )
+    assert config.parse_scripts(raw, problems) == {
+        "coding": (
+            ScriptEntry("Capstone", "scripts_list.capstone", "coding"),
+            ScriptEntry("Unnamed Script", "scripts_list.unnamed", "coding"),
+        )
+    }
+    assert len(problems) == 3
+
+
+@pytest.mark.parametrize("raw", ["{nope", "[1, 2]"])
+def test_parse_scripts_rejects_bad_json(raw):
+    problems = []
+    assert config.parse_scripts(raw, problems) == {}
+    assert problems
+
+
+def test_snapshot_is_reused_across_processes(tmp_path, parses):
+    env_file = _env_file(tmp_path / ".env", GREETING="hello")
+    assert load_config(env_file).get("GREETING") == "hello"
+    assert load_config(env_file) is load_config(env_file)
+    assert parses == [".env"]
+
+    # A new process reads the snapshot rather than the file
+    config._loaded.clear()
+    assert load_config(env_file).env == {"GREETING": "hello"}
+    assert parses == [".env"]
+
+
+def test_digest_decides_when_the_file_changed(tmp_path, parses):
+    env_file = _env_file(tmp_path / ".env", GREETING="hello")
+    first = load_config(env_file)
+
+    # Touched but unchanged: no parse, same digest
+    os.utime(env_file, ns=(1, 1))
+    touched = load_config(env_file)
+    assert touched is not first and touched.digest == first.digest
+    assert parses == [".env"]
+
+    _env_file(env_file, GREETING="howdy")
+    changed = load_config(env_file)
+    assert changed.digest != first.digest
+    assert changed.get("GREETING") == "howdy"
+    assert parses == [".env", ".env"]
+
+
+def test_missing_file_is_an_empty_config(tmp_path):
+    loaded = load_config(tmp_path / "missing.env")
+    assert (loaded.env, loaded.scripts, loaded.digest) == ({}, {}, "missing")
+
+
+def test_environment_wins_over_the_file(tmp_path, monkeypatch):
+    env_file = _env_file(tmp_path / ".env", GREETING="hello", OTHER="x")
+    monkeypatch.setenv("GREETING", "set")
+    loaded = load_config(env_file)
+    assert loaded.get("GREETING") == "set"
+    child = loaded.child_env()
+    assert (child["GREETING"], child["OTHER"]) == ("set", "x")
+    assert child[RESOLVED_MARKER] == str(env_file.resolve())
+
+
+def test_load_env_skips_only_the_file_already_resolved(tmp_path, monkeypatch, parses):
+    first = _env_file(tmp_path / "first.env", FIRST="1")
+    second = _env_file(tmp_path / "second.env", SECOND="2")
+    monkeypatch.delenv("FIRST", raising=False)
+    monkeypatch.delenv("SECOND", raising=False)
+    # As in a child the launcher started with first.env resolved
+    monkeypatch.setenv(RESOLVED_MARKER, str(first.resolve()))
+
+    load_env(first)
+    assert "FIRST" not in os.environ and parses == []
+
+    load_env(second)
+    assert os.environ["SECOND"] == "2"
+    assert parses == ["second.env"]
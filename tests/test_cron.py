@@ -0,0 +1,85 @@
+import json
+from datetime import datetime
+
+import pytest
+
+from launcher.cron import CronExpression, CronScheduler, ScheduleEntry, parse_schedule
+
+# A Wednesday
+NOW = datetime(2025, 1, 1, 12, 0)
+
+
+def test_ranges_and_lists():
+    cron = CronExpression("0,30 9-11 * * *")
+    assert cron.minutes == (0, 30)
+    assert cron.hours == (9, 10, 11)
+    assert cron.next_after(NOW) == datetime(2025, 1, 2, 9, 0)
+    assert cron.next_after(datetime(2025, 1, 2, 9, 0)) == datetime(2025, 1, 2, 9, 30)
+
+
+def test_steps():
+    assert CronExpression("*/15 * * * *").minutes == (0, 15, 30, 45)
+    assert CronExpression("5/20 * * * *").minutes == (5, 25, 45)
+    assert CronExpression("0 8-18/4 * * *").hours == (8, 12, 16)
+
+
+def test_names_and_macros():
+    cron = CronExpression("30 7 * jan-mar mon-fri")
+    assert cron.months == (1, 2, 3)
+    assert cron.weekdays == frozenset({1, 2, 3, 4, 5})
+    # Friday to the following Monday
+    assert cron.next_after(datetime(2025, 1, 3, 8, 0)) == datetime(2025, 1, 6, 7, 30)
+    assert CronExpression("0 0 * * 7").weekdays == frozenset({0})
+    assert CronExpression("@daily").next_after(NOW) == datetime(2025, 1, 2, 0, 0)
+
+
+def test_day_of_month_or_weekday():
+    # Both restricted: the 15th or any Monday, whichever comes first
+    cron = CronExpression("0 9 15 * mon")
+    assert cron.next_after(NOW) == datetime(2025, 1, 6, 9, 0)
+    assert cron.next_after(datetime(2025, 1, 13, 10, 0)) == datetime(2025, 1, 15, 9, 0)
+    # Only one restricted: it alone decides
+    assert CronExpression("0 9 15 * *").next_after(NOW) == datetime(2025, 1, 15, 9, 0)
+    assert CronExpression("0 9 * * mon").next_after(NOW) == datetime(2025, 1, 6, 9, 0)
+    # A stepped * still counts as unrestricted, so both must match
+    cron = CronExpression("0 9 */2 * mon")
+    assert cron.next_after(NOW) == datetime(2025, 1, 13, 9, 0)
+    cron = CronExpression("0 9 1 * */2")
+    assert cron.next_after(NOW) == datetime(2025, 2, 1, 9, 0)
+
+
+@pytest.mark.parametrize("text", ["60 * * * *", "* * * *", "* * 0 * *", "* * * foo *"])
+def test_bad_expressions(text):
+    with pytest.raises(ValueError):
+        CronExpression(text)
+
+
+def test_never_matching_expression_is_a_problem():
+    problems = []
+    entries = parse_schedule(
+        json.dumps(
+            [
+                {"cron": "0 9 30 2 *", "run": "morning"},
+                {"cron": "0 9 * * *", "run": "morning"},
+            ]
+        ),
+        problems,
+    )
+    assert [entry.cron.text for entry in entries] == ["0 9 * * *"]
+    assert len(problems) == 1 and "never matches" in problems[0]
+
+
+def test_update_skips_entries_that_cannot_be_scheduled(tmp_path):
+    scheduler = CronScheduler(
+        lambda entry: [],
+        state_path=tmp_path / "state.json",
+        lock_path=tmp_path / "schedule.lock",
+    )
+    good = ScheduleEntry("good", CronExpression("0 9 * * *"), ("morning",))
+    never = ScheduleEntry("never", CronExpression("0 9 30 2 *"), ("morning",))
+    try:
+        scheduler.update([never, good])
+        assert scheduler.entries == [good]
+        assert [name for name, _, _ in scheduler.describe()] == ["good"]
+    finally:
+        scheduler.close()
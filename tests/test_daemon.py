@@ -0,0 +1,104 @@
+import json
+import stat
+import sys
+import threading
+import time
+from multiprocessing.connection import AuthenticationError, Client
+
+import pytest
+
+from launcher import config, daemon
+from launcher.daemon import LauncherDaemon, connect
+
+pytestmark = pytest.mark.skipif(
+    sys.platform == "win32", reason="tests the AF_UNIX socket"
+)
+
+
+@pytest.fixture
+def running(tmp_path, monkeypatch):
+    """A daemon serving on a socket in tmp_path, with two scripts of its own"""
+    (tmp_path / "daemon_hello.py").write_text('print("hello from the daemon")\n')
+    (tmp_path / "daemon_fails.py").write_text("raise SystemExit(3)\n")
+    scripts = {
+        "test": [
+            {"name": "Hello", "module": "daemon_hello"},
+            {"name": "Fails", "module": "daemon_fails"},
+        ]
+    }
+    monkeypatch.setattr(daemon, "KEY_FILE", tmp_path / "cache" / "daemon.key")
+    monkeypatch.setattr(daemon, "ADDRESS", str(tmp_path / "daemon.sock"))
+    monkeypatch.setattr(config, "CACHE_DIR", tmp_path / "cache")
+    monkeypatch.setattr(config, "_loaded", {})
+    for key, value in {
+        "SCRIPTS_LIST": json.dumps(scripts),
+        "LAUNCHER_DISCOVER": "0",
+        "LAUNCHER_POOL_SIZE": "1",
+        "LAUNCHER_HISTORY_DB": str(tmp_path / "history.db"),
+        "LAUNCHER_RUN_LOG": "0",
+        "LAUNCHER_RESOURCE_INTERVAL": "0",
+        "PYTHONPATH": str(tmp_path),
+    }.items():
+        monkeypatch.setenv(key, value)
+
+    server = LauncherDaemon()
+    thread = threading.Thread(target=server.serve, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        if thread.is_alive():
+            server.stop()
+            thread.join(10)
+        server.close()
+
+
+def _request(message):
+    # serve() may not be listening yet
+    deadline = time.monotonic() + 10
+    while (conn := connect()) is None:
+        assert time.monotonic() < deadline, "the daemon never listened"
+        time.sleep(0.02)
+    with conn:
+        conn.send(message)
+        events = [conn.recv()]
+        while events[-1]["event"] == "output":
+            events.append(conn.recv())
+    return events
+
+
+def test_key_is_private_and_required(running):
+    assert _request({"cmd": "ping"})[0]["event"] == "pong"
+    assert stat.S_IMODE(daemon.KEY_FILE.stat().st_mode) == 0o600
+
+    with pytest.raises(AuthenticationError):
+        Client(daemon.ADDRESS, daemon.FAMILY, authkey=b"not the key")
+    # Still serving the next client
+    assert _request({"cmd": "ping"})[0]["event"] == "pong"
+
+
+def test_list_run_and_stop(running):
+    (listed,) = _request({"cmd": "list"})
+    assert [tuple(row) for row in listed["scripts"]] == [
+        ("test", "Hello", "daemon_hello"),
+        ("test", "Fails", "daemon_fails"),
+    ]
+
+    *output, done = _request({"cmd": "run", "scripts": ["test/hello", "test/fails"]})
+    assert "".join(event["data"] for event in output) == "hello from the daemon\n"
+    assert [(o["script"], o["ok"], o["returncode"]) for o in done["outcomes"]] == [
+        ("test/Hello", True, 0),
+        ("test/Fails", False, 3),
+    ]
+
+    (error,) = _request({"cmd": "run", "scripts": ["test/missing"]})
+    assert error["event"] == "error" and "test/missing" in error["message"]
+    assert _request({"cmd": "dance"})[0]["event"] == "error"
+
+    assert _request({"cmd": "stop"})[0]["event"] == "stopping"
+
+
+def test_second_daemon_refuses_to_start(running):
+    _request({"cmd": "ping"})
+    with pytest.raises(RuntimeError, match="already running"):
+        LauncherDaemon()
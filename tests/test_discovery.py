@@ -0,0 +1,134 @@
+import json
+import os
+
+import pytest
+
+from launcher import discovery
+from launcher.config import ScriptEntry
+from launcher.discovery import (
+    INDEX_VERSION,
+    discover_scripts,
+    inspect_module,
+    merge_scripts,
+)
+
+
+def _module(path, source):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(source)
+    return path
+
+
+@pytest.mark.parametrize(
+    "source, expected",
+    [
+        ('if __name__ == "__main__":\n    main()\n', ("Daily Notes", "general")),
+        (
+            'SCRIPT_INFO = {"name": "Notes", "category": "study"}\nrun()\n',
+            ("Notes", "study"),
+        ),
+        # Not a literal, so not metadata; the script is still found
+        ("SCRIPT_INFO = dict(name='Notes')\nrun()\n", ("Daily Notes", "general")),
+        ('SCRIPT_INFO = {"hidden": True}\nrun()\n', None),
+        ('"""Helpers"""\nimport os\n\ndef helper():\n    pass\n', None),
+        ("def broken(:\n", None),
+    ],
+)
+def test_inspect_module_reads_the_source_without_running_it(tmp_path, source, expected):
+    path = _module(tmp_path / "daily_notes.py", source)
+    script = inspect_module(path, "scripts_list.daily_notes", "")
+    if expected is None:
+        assert script is None
+    else:
+        assert (script["name"], script["category"]) == expected
+        assert script["module"] == "scripts_list.daily_notes"
+
+
+@pytest.fixture
+def scripts(tmp_path):
+    root = tmp_path / "scripts_list"
+    _module(root / "__init__.py", "")
+    _module(root / "top.py", "print('top')\n")
+    _module(root / "_private.py", "print('private')\n")
+    _module(root / "study" / "__init__.py", "")
+    _module(root / "study" / "algebra.py", "print('algebra')\n")
+    _module(root / "loose" / "not_a_package.py", "print('loose')\n")
+    return root
+
+
+@pytest.fixture
+def parsed(monkeypatch):
+    """Modules parsed from here on"""
+    modules = []
+    inspect = discovery.inspect_module
+
+    def counting(path, module, package):
+        modules.append(module)
+        return inspect(path, module, package)
+
+    monkeypatch.setattr(discovery, "inspect_module", counting)
+    return modules
+
+
+def test_packages_are_categories(scripts, tmp_path):
+    found = discover_scripts(scripts, tmp_path / "index.json")
+    assert found == [
+        ScriptEntry("Algebra", "scripts_list.study.algebra", "study"),
+        ScriptEntry("Top", "scripts_list.top", "general"),
+    ]
+
+
+def test_index_only_parses_changed_files(scripts, tmp_path, parsed):
+    index = tmp_path / "index.json"
+    first = discover_scripts(scripts, index)
+    assert len(parsed) == 2
+
+    assert discover_scripts(scripts, index) == first
+    assert len(parsed) == 2
+
+    _module(scripts / "top.py", 'SCRIPT_INFO = {"name": "Renamed"}\nprint()\n')
+    os.utime(scripts / "top.py", ns=(1, 1))
+    found = discover_scripts(scripts, index)
+    assert parsed[2:] == ["scripts_list.top"]
+    assert "Renamed" in [script.name for script in found]
+
+
+def test_index_of_another_version_is_rebuilt(scripts, tmp_path, parsed):
+    index = tmp_path / "index.json"
+    discover_scripts(scripts, index)
+    data = json.loads(index.read_text())
+    assert data["version"] == INDEX_VERSION
+
+    # Same stamps, but written by a version that derived categories otherwise
+    for entry in data["files"].values():
+        if entry["script"]:
+            entry["script"]["category"] = "Old Category"
+    index.write_text(json.dumps({**data, "version": INDEX_VERSION - 1}))
+    found = discover_scripts(scripts, index)
+    assert len(parsed) == 4
+    assert {script.category for script in found} == {"general", "study"}
+    assert json.loads(index.read_text())["version"] == INDEX_VERSION
+
+
+def test_manual_entries_win_the_merge():
+    manual = {
+        "coding": (ScriptEntry("My Capstone", "scripts_list.capstone", "coding"),),
+    }
+    discovered = [
+        ScriptEntry("Capstone", "scripts_list.capstone", "general"),
+        ScriptEntry("Algebra", "scripts_list.study.algebra", "study"),
+        ScriptEntry("Notes", "scripts_list.notes", "coding"),
+    ]
+    assert merge_scripts(manual, discovered) == {
+        "coding": (
+            ScriptEntry("My Capstone", "scripts_list.capstone", "coding"),
+            ScriptEntry("Notes", "scripts_list.notes", "coding"),
+        ),
+        "study": (ScriptEntry("Algebra", "scripts_list.study.algebra", "study"),),
+    }
+
+
+def test_bundled_scripts_all_declare_their_metadata(tmp_path):
+    for script in discover_scripts(index_path=tmp_path / "index.json"):
+        path = discovery.BASE_DIR.joinpath(*script.module.split(".")).with_suffix(".py")
+        assert discovery.METADATA_NAME in path.read_text(encoding="utf-8"), script
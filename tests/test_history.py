@@ -0,0 +1,166 @@
+import sqlite3
+import time
+
+import pytest
+
+from launcher import history
+from launcher.history import SCHEMA_VERSION, Run, RunStore
+
+# The schema as version 1 of the launcher created it
+SCHEMA_V1 = """
+CREATE TABLE runs (
+    id INTEGER PRIMARY KEY,
+    script TEXT NOT NULL,
+    module TEXT NOT NULL,
+    category TEXT NOT NULL,
+    source TEXT NOT NULL,
+    status TEXT NOT NULL,
+    exit_code INTEGER,
+    queued_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL NOT NULL,
+    queue_wait REAL,
+    spawn REAL,
+    first_output REAL,
+    wall REAL,
+    output_path TEXT
+);
+CREATE TABLE script_stats (
+    module TEXT PRIMARY KEY,
+    script TEXT NOT NULL,
+    runs INTEGER NOT NULL,
+    failures INTEGER NOT NULL,
+    total_wall REAL NOT NULL,
+    max_wall REAL NOT NULL,
+    last_finished REAL NOT NULL,
+    last_status TEXT NOT NULL
+);
+CREATE TRIGGER runs_rollup AFTER INSERT ON runs BEGIN
+    INSERT INTO script_stats VALUES (
+        NEW.module, NEW.script, 1, NEW.status != 'success',
+        coalesce(NEW.wall, 0), coalesce(NEW.wall, 0),
+        NEW.finished_at, NEW.status
+    )
+    ON CONFLICT (module) DO UPDATE SET
+        script = NEW.script,
+        runs = runs + 1,
+        failures = failures + (NEW.status != 'success'),
+        total_wall = total_wall + coalesce(NEW.wall, 0),
+        max_wall = max(max_wall, coalesce(NEW.wall, 0)),
+        last_finished = max(last_finished, NEW.finished_at),
+        last_status = CASE WHEN NEW.finished_at >= last_finished
+            THEN NEW.status ELSE last_status END;
+END;
+INSERT INTO runs (script, module, category, source, status, queued_at,
+                  finished_at, wall)
+VALUES ('Old', 'scripts_list.old', 'coding', 'gui', 'success', 1, 2, 4.0);
+PRAGMA user_version = 1;
+"""
+
+
+def _run(module="scripts_list.a", status="success", finished_at=None, **fields):
+    finished_at = time.time() if finished_at is None else finished_at
+    return Run(
+        script=module.rsplit(".", 1)[-1],
+        module=module,
+        category="coding",
+        source="gui",
+        status=status,
+        queued_at=finished_at - 1,
+        finished_at=finished_at,
+        **fields,
+    )
+
+
+@pytest.fixture
+def db(tmp_path):
+    return tmp_path / "history.db"
+
+
+def _store(path, **kwargs):
+    store = RunStore(path, **kwargs)
+    # Retention runs in the writer before anything queued after it
+    store.flush()
+    return store
+
+
+def test_version_1_database_is_upgraded_in_place(db):
+    conn = sqlite3.connect(db)
+    conn.executescript(SCHEMA_V1)
+    conn.close()
+
+    store = _store(db, retention_days=100_000)
+    store.record(_run("scripts_list.old", wall=2.0, cpu_time=1.5, peak_rss=100))
+    store.flush()
+    old, new = store.last_runs("scripts_list.old")[::-1]
+    assert old.script == "Old" and old.cpu_time is None
+    assert new.cpu_time == 1.5
+    # The old totals carry on, and only the sampled run counts towards cpu
+    (stats,) = store.stats()
+    assert stats[2:6] == (2, 0, 3.0, 4.0)
+    assert stats[8:] == (1.5, 100)
+    store.close()
+
+    conn = sqlite3.connect(db)
+    assert conn.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION
+    conn.close()
+
+
+def test_stats_are_kept_up_to_date_by_the_trigger(db):
+    store = _store(db)
+    now = time.time()
+    store.record(_run(finished_at=now - 30, wall=1.0))
+    store.record(_run(status="error", finished_at=now, wall=3.0, cpu_time=2.0))
+    # Recorded late but finished earlier, so not the last status
+    store.record(_run(finished_at=now - 60, wall=2.0, peak_rss=50, cpu_time=4.0))
+    store.record(_run("scripts_list.b", finished_at=now - 10))
+    store.flush()
+
+    a, b = store.stats()
+    assert a == ("scripts_list.a", "a", 3, 1, 2.0, 3.0, now, "error", 3.0, 50)
+    assert b[:4] == ("scripts_list.b", "b", 1, 0)
+    # Never sampled
+    assert b[8:] == (None, 0)
+    store.close()
+
+
+def test_retention_by_age_keeps_the_lifetime_stats(db):
+    store = _store(db)
+    now = time.time()
+    store.record(_run(finished_at=now - 10 * 86400))
+    store.record(_run(finished_at=now - 3 * 86400))
+    store.record(_run(finished_at=now))
+    store.close()
+
+    store = _store(db, retention_days=5)
+    assert [run.finished_at for run in store.recent(0)] == [now, now - 3 * 86400]
+    assert store.stats()[0][2] == 3
+    store.close()
+
+
+def test_retention_by_count_keeps_the_newest(db):
+    store = _store(db)
+    now = time.time()
+    for i in range(6):
+        store.record(_run(finished_at=now - 60 + i, samples=[[0, i, 0, 0, 0]]))
+    store.close()
+
+    store = _store(db, retention_runs=2)
+    assert [run.finished_at for run in store.recent(0)] == [now - 55, now - 56]
+    assert store._query("SELECT count(*) FROM run_samples") == [(2,)]
+    store.close()
+
+
+def test_close_writes_the_batch_in_progress(db, monkeypatch):
+    # A batch that would otherwise wait a minute for more runs
+    monkeypatch.setattr(history, "BATCH_DELAY", 60)
+    store = _store(db)
+    for i in range(5):
+        store.record(_run(finished_at=1000 + i))
+    started = time.monotonic()
+    store.close()
+    assert time.monotonic() - started < 10
+
+    store = _store(db, retention_days=100_000)
+    assert len(store.recent(0)) == 5
+    store.close()
@@ -0,0 +1,150 @@
+import threading
+import time
+
+import pytest
+
+from launcher import jobs
+from launcher.jobs import CANCELLED, DONE, FAILED, QUEUED, RUNNING, JobScheduler
+
+
+class GatedRunner:
+    """Runner whose jobs run until the test lets them finish"""
+
+    def __init__(self):
+        self.started = []
+        self._gates = {}
+        self._lock = threading.Lock()
+
+    def _gate(self, name):
+        with self._lock:
+            return self._gates.setdefault(name, threading.Event())
+
+    def __call__(self, job):
+        with self._lock:
+            self.started.append(job.script_name)
+        gate = self._gate(job.script_name)
+        while not gate.wait(0.01):
+            if job.cancelled:
+                raise RuntimeError("cancelled")
+        if job.script_name.startswith("fail"):
+            raise RuntimeError("failed on purpose")
+        return job.script_name
+
+    def release(self, *names):
+        for name in names:
+            self._gate(name).set()
+
+
+def _wait_for(predicate, timeout=10):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.005)
+
+
+@pytest.fixture
+def runner():
+    return GatedRunner()
+
+
+def test_higher_priority_starts_first_oldest_first_among_equals(runner):
+    scheduler = JobScheduler(runner, max_workers=1)
+    blocker = scheduler.submit("blocker", "m.blocker")
+    _wait_for(lambda: blocker.state == RUNNING)
+    queued = [
+        scheduler.submit("low", "m.low"),
+        scheduler.submit("high", "m.high", priority=5),
+        scheduler.submit("mid", "m.mid", priority=2),
+        scheduler.submit("high again", "m.high2", priority=5),
+    ]
+    assert all(job.state == QUEUED for job in queued)
+
+    runner.release("blocker", "low", "high", "mid", "high again")
+    _wait_for(lambda: all(job.state == DONE for job in queued))
+    assert runner.started == ["blocker", "high", "high again", "mid", "low"]
+    scheduler.shutdown()
+
+
+def test_category_limit_holds_back_only_that_category(runner):
+    scheduler = JobScheduler(runner, max_workers=4, category_limit=1)
+    a1 = scheduler.submit("a1", "m.a1", "coding")
+    a2 = scheduler.submit("a2", "m.a2", "coding")
+    b1 = scheduler.submit("b1", "m.b1", "study")
+    _wait_for(lambda: a1.state == RUNNING and b1.state == RUNNING)
+    time.sleep(0.05)
+    assert a2.state == QUEUED
+
+    runner.release("a1")
+    _wait_for(lambda: a2.state == RUNNING)
+    runner.release("a2", "b1")
+    _wait_for(lambda: a2.state == DONE and b1.state == DONE)
+    scheduler.shutdown()
+
+
+def test_script_limit_serialises_runs_of_one_module(runner):
+    scheduler = JobScheduler(runner, max_workers=4)
+    first = scheduler.submit("same", "m.same")
+    second = scheduler.submit("same", "m.same")
+    other = scheduler.submit("other", "m.other")
+    _wait_for(lambda: first.state == RUNNING and other.state == RUNNING)
+    time.sleep(0.05)
+    assert second.state == QUEUED
+    assert scheduler.active() == 2
+
+    runner.release("same", "other")
+    _wait_for(lambda: second.state == DONE)
+    assert first.result == second.result == "same"
+    scheduler.shutdown()
+
+
+def test_failures_and_cancellation(runner):
+    changes = []
+    scheduler = JobScheduler(
+        runner, max_workers=1, on_change=lambda job: changes.append(job.state)
+    )
+    running = scheduler.submit("running", "m.running")
+    _wait_for(lambda: running.state == RUNNING)
+    queued = scheduler.submit("queued", "m.queued")
+
+    assert scheduler.cancel(queued.id)
+    assert queued.state == CANCELLED
+    assert scheduler.cancel(running.id)
+    _wait_for(lambda: running.state == CANCELLED)
+    assert "queued" not in runner.started
+    assert not scheduler.cancel(running.id)
+
+    failing = scheduler.submit("fail", "m.fail")
+    runner.release("fail")
+    _wait_for(lambda: failing.state == FAILED)
+    assert str(failing.error) == "failed on purpose"
+    assert changes.count(CANCELLED) == 2
+    scheduler.shutdown()
+
+
+def test_shutdown_cancels_what_is_queued(runner):
+    scheduler = JobScheduler(runner, max_workers=1)
+    running = scheduler.submit("running", "m.running")
+    _wait_for(lambda: running.state == RUNNING)
+    queued = scheduler.submit("queued", "m.queued")
+    scheduler.shutdown(cancel_running=True)
+    assert queued.state == CANCELLED
+    _wait_for(lambda: running.state == CANCELLED)
+
+
+def test_finished_jobs_beyond_history_are_forgotten(runner):
+    scheduler = JobScheduler(runner, max_workers=2, history=3)
+    runner.release(*(f"job {i}" for i in range(5)))
+    done = [scheduler.submit(f"job {i}", f"m.job{i}") for i in range(5)]
+    _wait_for(lambda: all(job.state == DONE for job in done))
+    # Trimmed as jobs are submitted, so the last few may linger
+    scheduler.submit("extra", "m.extra")
+    assert len(scheduler.jobs()) <= 4
+    assert scheduler.jobs()[0].script_name == "extra"
+    scheduler.shutdown(cancel_running=True)
+
+
+@pytest.mark.parametrize("cpus, expected", [(None, 2), (8, 8)])
+def test_max_workers_defaults_to_cpu_count(monkeypatch, cpus, expected):
+    monkeypatch.setattr(jobs.os, "cpu_count", lambda: cpus)
+    assert JobScheduler(lambda job: None).max_workers == expected
+    assert JobScheduler(lambda job: None, max_workers=3).max_workers == 3
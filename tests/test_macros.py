@@ -0,0 +1,97 @@
+import json
+import subprocess
+
+import pytest
+
+from launcher.config import ScriptEntry
+from launcher.jobs import Job
+from launcher.macros import NOT_RUN, MacroFailed, parse_macros, run_macro
+
+SCRIPTS = {
+    "coding": [
+        ScriptEntry("Ok", "scripts_list.ok", "coding"),
+        ScriptEntry("Also Ok", "scripts_list.also_ok", "coding"),
+        ScriptEntry("Broken", "scripts_list.broken", "coding"),
+        ScriptEntry("Slow", "scripts_list.slow", "coding"),
+    ]
+}
+
+
+class FakePool:
+    """Runs nothing: each module exits with the code given for it"""
+
+    def __init__(self, codes):
+        self.codes = codes
+        self.ran = []
+
+    def run(self, module_path, timeout=None, on_start=None, on_output=None):
+        self.ran.append(module_path)
+        code = self.codes.get(module_path, 0)
+        if code == "timeout":
+            raise subprocess.TimeoutExpired(module_path, timeout)
+        if on_output is not None:
+            on_output(f"{module_path} ran\n")
+        return subprocess.CompletedProcess([module_path], code)
+
+
+def _macro(steps, on_failure):
+    raw = json.dumps([{"name": "routine", "steps": steps, "on_failure": on_failure}])
+    problems = []
+    macros = parse_macros(raw, problems)
+    assert not problems
+    return macros["routine"]
+
+
+def _run(macro, codes):
+    pool = FakePool(codes)
+    job = Job(1, macro.name, macro.module)
+    result = run_macro(job, macro, SCRIPTS, pool, on_start=lambda process: None)
+    return result, pool.ran
+
+
+def test_success_returns_zero():
+    macro = _macro(["coding/Ok", ["coding/Also Ok", "coding/Slow"]], "stop")
+    result, ran = _run(macro, {})
+    assert result.returncode == 0
+    result.check_returncode()
+    assert result.summary == "3/3 steps succeeded"
+    assert len(ran) == 3
+
+
+def test_stop_policy_skips_later_stages():
+    macro = _macro(["coding/Broken", "coding/Ok"], "stop")
+    result, ran = _run(macro, {"scripts_list.broken": 3})
+    assert ran == ["scripts_list.broken"]
+    assert [step.status for step in result.steps] == ["failed", NOT_RUN]
+    assert result.returncode == 3
+    with pytest.raises(MacroFailed) as raised:
+        result.check_returncode()
+    assert str(raised.value) == "0/2 steps succeeded, 1 failed, 1 not run; stopped"
+
+
+def test_skip_policy_runs_everything_but_still_fails():
+    macro = _macro(["coding/Broken", "coding/Slow", "coding/Ok"], "skip")
+    result, ran = _run(
+        macro, {"scripts_list.broken": 2, "scripts_list.slow": "timeout"}
+    )
+    assert len(ran) == 3
+    assert [step.status for step in result.steps] == ["failed", "timeout", "success"]
+    assert not result.stopped
+    # The first failing step's code, even though later ones went on to run
+    assert result.returncode == 2
+    with pytest.raises(MacroFailed):
+        result.check_returncode()
+
+
+def test_skip_policy_without_exit_codes_returns_one():
+    macro = _macro(["coding/Slow", "coding/Also Ok"], "skip")
+    result, _ = _run(macro, {"scripts_list.slow": "timeout"})
+    assert result.returncode == 1
+    assert result.summary == "1/2 steps succeeded, 1 timeout"
+
+
+def test_stage_policy_overrides_macro_policy():
+    steps = [{"run": "coding/Broken", "on_failure": "skip"}, "coding/Ok"]
+    result, ran = _run(_macro(steps, "stop"), {"scripts_list.broken": 1})
+    assert ran == ["scripts_list.broken", "scripts_list.ok"]
+    assert result.returncode == 1
@@ -0,0 +1,88 @@
+import subprocess
+import urllib.request
+
+from launcher.metrics import BUCKETS, MetricsRegistry, run_status, serve
+
+
+def _registry():
+    registry = MetricsRegistry()
+    registry.record_run("Mail", "success", wall=0.02, spawn=0.004)
+    registry.record_run("Mail", "failed", wall=3.0)
+    registry.record_run('Say "hi"\\now', "success", wall=0.5)
+    return registry
+
+
+def test_openmetrics_histograms_are_cumulative():
+    lines = _registry().to_openmetrics().splitlines()
+    assert lines[:3] == [
+        "# TYPE launcher_run_queue_wait_seconds histogram",
+        "# UNIT launcher_run_queue_wait_seconds seconds",
+        "# HELP launcher_run_queue_wait_seconds Time a run waited in the job queue.",
+    ]
+    wall = [line for line in lines if line.startswith("launcher_run_wall_seconds")]
+    mail = [line for line in wall if 'script="Mail"' in line]
+    assert len(mail) == len(BUCKETS) + 2
+    assert 'launcher_run_wall_seconds_bucket{script="Mail",le="0.01"} 0' in mail
+    assert 'launcher_run_wall_seconds_bucket{script="Mail",le="0.025"} 1' in mail
+    assert 'launcher_run_wall_seconds_bucket{script="Mail",le="2.5"} 1' in mail
+    assert 'launcher_run_wall_seconds_bucket{script="Mail",le="+Inf"} 2' in mail
+    assert mail[-2:] == [
+        'launcher_run_wall_seconds_count{script="Mail"} 2',
+        'launcher_run_wall_seconds_sum{script="Mail"} 3.020000',
+    ]
+    # Missing timings count as no observation
+    assert 'launcher_run_queue_wait_seconds_count{script="Mail"} 0' in lines
+    assert lines[-1] == "# EOF"
+
+
+def test_openmetrics_counts_statuses_and_escapes_labels():
+    text = _registry().to_openmetrics()
+    assert 'launcher_runs_total{script="Mail",status="failed"} 1\n' in text
+    assert 'launcher_runs_total{script="Mail",status="success"} 1\n' in text
+    assert 'launcher_runs_total{script="Say \\"hi\\"\\\\now",status="success"} 1' in (
+        text
+    )
+
+
+def test_empty_registry_is_valid():
+    text = MetricsRegistry().to_openmetrics()
+    assert text.endswith("# EOF\n")
+    assert "{" not in text
+
+
+def test_summary_percentiles_and_failures():
+    registry = MetricsRegistry()
+    for i in range(1, 101):
+        registry.record_run("Job", "success" if i % 10 else "timeout", wall=i / 100)
+    ((script, runs, failures, percentiles),) = registry.summary()
+    assert (script, runs, failures) == ("Job", 100, 10)
+    assert percentiles["wall"] == (0.5, 0.95, 0.99)
+    assert percentiles["spawn"] == (None, None, None)
+
+
+def test_run_status():
+    assert run_status() == "success"
+    assert run_status(subprocess.TimeoutExpired("x", 1)) == "timeout"
+    assert run_status(subprocess.CalledProcessError(1, "x")) == "failed"
+    assert run_status(RuntimeError()) == "error"
+    assert run_status(RuntimeError(), cancelled=True) == "cancelled"
+
+
+def test_write_file_and_serve(tmp_path):
+    registry = _registry()
+    path = tmp_path / "metrics" / "launcher.prom"
+    registry.write_file(path)
+    assert path.read_text(encoding="utf-8") == registry.to_openmetrics()
+    assert not path.with_suffix(".tmp").exists()
+
+    server = serve(registry, 0)
+    try:
+        url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+        with urllib.request.urlopen(url, timeout=10) as response:
+            assert response.headers["Content-Type"].startswith(
+                "application/openmetrics-text"
+            )
+            assert response.read().decode("utf-8") == registry.to_openmetrics()
+    finally:
+        server.shutdown()
+        server.server_close()
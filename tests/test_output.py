@@ -0,0 +1,41 @@
+from launcher.output import MAX_LINE_CHARS, OutputBuffer
+
+
+def test_lines_across_writes():
+    buffer = OutputBuffer()
+    buffer.write("one\ntw")
+    buffer.write("o\r")
+    buffer.write("\nthree")
+    assert buffer.lines_since(0) == (2, ["one", "two"])
+    assert buffer.partial() == "three"
+    buffer.close()
+    assert buffer.lines_since(2) == (3, ["three"])
+
+
+def test_carriage_returns_keep_the_last_redraw():
+    buffer = OutputBuffer()
+    for percent in range(0, 101, 10):
+        buffer.write(f"\r{percent:3}%")
+        assert buffer.partial() == f"{percent:3}%"
+    buffer.write("\ndone\n")
+    assert buffer.lines_since(0) == (2, ["100%", "done"])
+
+
+def test_output_without_newlines_is_bounded():
+    buffer = OutputBuffer(max_lines=10)
+    for _ in range(1000):
+        buffer.write("x" * 1000)
+    assert len(buffer.partial()) <= MAX_LINE_CHARS
+    total, lines = buffer.lines_since(0)
+    assert total == 1000 * 1000 // MAX_LINE_CHARS
+    assert len(lines) == 10 and all(len(line) == MAX_LINE_CHARS for line in lines)
+
+
+def test_long_lines_are_truncated():
+    buffer = OutputBuffer()
+    buffer.write("a" * (MAX_LINE_CHARS * 3) + "\nshort\n")
+    buffer.write("b" * 10 + "\r" + "c" * (MAX_LINE_CHARS + 1) + "\n")
+    assert buffer.lines_since(0) == (
+        3,
+        ["a" * MAX_LINE_CHARS, "short", "c" * MAX_LINE_CHARS],
+    )
@@ -0,0 +1,121 @@
+import os
+import subprocess
+import sys
+import textwrap
+
+import pytest
+
+from launcher.config import BASE_DIR
+from launcher.pool import WorkerPool
+
+SCRIPTS = {
+    "pool_ok": """
+        import os, sys
+        print("to stdout")
+        print("to stderr", file=sys.stderr)
+        os.write(1, b"straight to fd 1\\n")
+    """,
+    "pool_raises": """
+        raise RuntimeError("boom")
+    """,
+    "pool_exits": """
+        import sys
+        sys.exit(3)
+    """,
+    "pool_sleeps": """
+        import time
+        time.sleep(30)
+    """,
+    "pool_spawns": """
+        import subprocess, sys
+        subprocess.run([sys.executable, "-c", "pass"], check=True)
+        print("spawned")
+    """,
+}
+
+
+@pytest.fixture
+def make_pool(tmp_path):
+    for name, source in SCRIPTS.items():
+        (tmp_path / f"{name}.py").write_text(textwrap.dedent(source))
+    env = dict(os.environ, PYTHONPATH=str(tmp_path))
+    pools = []
+
+    def make(**kwargs):
+        pool = WorkerPool(BASE_DIR, env=env, **kwargs)
+        pools.append(pool)
+        return pool
+
+    yield make
+    for pool in pools:
+        pool.shutdown()
+
+
+def _run(pool, module, timeout=20):
+    """(result, process that ran it)"""
+    started = []
+    result = pool.run(module, timeout=timeout, on_start=started.append)
+    return result, started[0]
+
+
+def test_output_is_streamed_and_worker_is_reused(make_pool):
+    pool = make_pool(size=1)
+    chunks = []
+    result = pool.run("pool_ok", timeout=20, on_output=chunks.append)
+    assert result.returncode == 0
+    output = "".join(chunks)
+    for line in ("to stdout", "to stderr", "straight to fd 1"):
+        assert line in output
+
+    first = _run(pool, "pool_ok")[1]
+    second = _run(pool, "pool_ok")[1]
+    assert first.pid == second.pid
+    assert first.poll() is None
+
+
+def test_failing_scripts_keep_the_worker(make_pool):
+    pool = make_pool(size=1)
+    result, first = _run(pool, "pool_raises")
+    assert result.returncode == 1
+    assert "RuntimeError: boom" in result.stdout
+
+    result, second = _run(pool, "pool_exits")
+    assert result.returncode == 3
+    assert second.pid == first.pid
+
+
+def test_timeout_kills_the_worker(make_pool):
+    pool = make_pool(size=1)
+    started = []
+    with pytest.raises(subprocess.TimeoutExpired):
+        pool.run("pool_sleeps", timeout=1, on_start=started.append)
+    assert started[0].poll() is not None
+
+    result, process = _run(pool, "pool_ok")
+    assert result.returncode == 0
+    assert process.pid != started[0].pid
+
+
+def test_run_that_spawns_processes_retires_the_worker(make_pool):
+    pool = make_pool(size=1)
+    result, first = _run(pool, "pool_spawns")
+    assert result.returncode == 0
+    assert "spawned" in result.stdout
+    # Stopped rather than returned to the pool: a later cancel of its group
+    # could reach whatever the script left running
+    assert first.poll() is not None
+    assert _run(pool, "pool_ok")[1].pid != first.pid
+
+
+def test_worker_is_recycled_after_max_runs(make_pool):
+    pool = make_pool(size=1, max_runs=2)
+    pids = [_run(pool, "pool_ok")[1].pid for _ in range(3)]
+    assert pids[0] == pids[1]
+    assert pids[2] != pids[1]
+
+
+def test_size_zero_runs_cold(make_pool):
+    pool = make_pool(size=0)
+    result, process = _run(pool, "pool_exits")
+    assert result.returncode == 3
+    assert process.args == [sys.executable, "-m", "pool_exits"]
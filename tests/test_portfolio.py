@@ -0,0 +1,97 @@
+import pytest
+
+from launcher import portfolio
+
+CSV = """Date,Symbol,Action,Quantity,Price,Fees,Current Price
+2024-01-02,AAPL,Buy,10,150.00,1.00,
+2024-01-03,msft,Buy,5,"$1,000.50",0,
+2024-01-04,AAPL,Buy,10,170,1,
+2024-01-05,AAPL,Sell,5,180,2,
+2024-01-06,MSFT,,-2,1100,,
+2024-01-07,AAPL,Dividend,0,0.24,,
+2024-01-08,,Buy,1,10,,
+2024-01-09,TSLA,Buy,n/a,200,,
+2024-01-10,TSLA,Buy,3,200,,
+2024-01-11,GOOG,Buy,4,100,,
+2024-01-12,GOOG,Sell,4,120,,
+2024-01-13,AAPL,Buy,1,175,,190
+"""
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    path = tmp_path / "portfolio.csv"
+    path.write_text(CSV, encoding="utf-8")
+    return path
+
+
+def _summarize(path, monkeypatch, engine):
+    if engine == "python":
+        monkeypatch.setattr(portfolio, "np", None)
+    # Small chunks so totals are folded across several of them
+    monkeypatch.setattr(portfolio, "CHUNK_ROWS", 3)
+    summary = portfolio.summarize(path)
+    assert summary.engine == engine
+    return summary
+
+
+def test_python_engine(csv_path, monkeypatch):
+    summary = _summarize(csv_path, monkeypatch, "python")
+    holdings = {h.symbol: h for h in summary.holdings}
+    assert summary.rows == 12
+    # The dividend, the row without a symbol and the unparseable quantity
+    assert summary.skipped == 3
+    assert set(holdings) == {"AAPL", "MSFT", "TSLA", "GOOG"}
+
+    aapl = holdings["AAPL"]
+    assert aapl.quantity == pytest.approx(16)
+    assert aapl.avg_cost == pytest.approx((1501 + 1701 + 175) / 21)
+    assert aapl.realized == pytest.approx(5 * 180 - 2 - 5 * aapl.avg_cost)
+    assert aapl.price == pytest.approx(190)
+    assert holdings["MSFT"].avg_cost == pytest.approx(1000.5)
+    assert holdings["MSFT"].quantity == pytest.approx(3)
+    # Fully sold, kept for its realized gain
+    assert holdings["GOOG"].quantity == pytest.approx(0)
+    assert holdings["GOOG"].realized == pytest.approx(80)
+    assert sum(h.allocation for h in summary.holdings) == pytest.approx(100)
+
+
+def test_engines_agree(csv_path, monkeypatch):
+    pytest.importorskip("numpy")
+    vectorized = _summarize(csv_path, monkeypatch, "numpy")
+    python = _summarize(csv_path, monkeypatch, "python")
+
+    assert (vectorized.rows, vectorized.skipped) == (python.rows, python.skipped)
+    assert len(vectorized.holdings) == len(python.holdings)
+    for fast, slow in zip(vectorized.holdings, python.holdings):
+        assert fast.symbol == slow.symbol
+        for name in ("quantity", "avg_cost", "value", "realized", "return_pct"):
+            assert getattr(fast, name) == pytest.approx(getattr(slow, name))
+    for name in ("value", "cost", "unrealized", "realized", "return_pct"):
+        assert getattr(vectorized, name) == pytest.approx(getattr(python, name))
+
+
+def test_cache_tells_prices_files_apart(csv_path, tmp_path, monkeypatch):
+    monkeypatch.setattr(portfolio, "CACHE_DIR", tmp_path / "cache")
+    monkeypatch.setattr(portfolio, "_memory", {})
+    # Same size and modification time, different prices
+    low, high = tmp_path / "low.csv", tmp_path / "high.csv"
+    low.write_text("AAPL,100\n", encoding="utf-8")
+    high.write_text("AAPL,300\n", encoding="utf-8")
+    for path in (low, high):
+        portfolio.os.utime(path, ns=(1, 1))
+
+    def aapl(prices_path):
+        summary = portfolio.load_summary(csv_path, prices_path)
+        return next(h for h in summary.holdings if h.symbol == "AAPL").price
+
+    assert aapl(low) == pytest.approx(100)
+    assert aapl(high) == pytest.approx(300)
+    assert aapl(None) == pytest.approx(190)
+    assert portfolio.load_summary(csv_path, low) is portfolio.load_summary(
+        csv_path, low
+    )
+
+    # From the disk cache, in a process that has seen neither
+    monkeypatch.setattr(portfolio, "_memory", {})
+    assert aapl(low) == pytest.approx(100)
@@ -0,0 +1,131 @@
+import subprocess
+import sys
+import time
+
+import pytest
+
+from launcher import resources
+from launcher.resources import (
+    MAX_SAMPLES,
+    ResourceMonitor,
+    RunUsage,
+    open_monitor,
+    sparkline,
+)
+
+needs_proc = pytest.mark.skipif(not resources.HAVE_PROC, reason="reads /proc")
+
+
+def test_sparkline_scales_to_the_maximum():
+    assert sparkline([0, 4, 8]) == "▁▅█"
+    assert sparkline([0, 0]) == "▁▁"
+    assert sparkline([]) == ""
+
+
+def test_open_monitor_off_or_unavailable(monkeypatch):
+    assert open_monitor({"LAUNCHER_RESOURCE_INTERVAL": "0"}) is None
+    monkeypatch.setattr(resources, "HAVE_PROC", False)
+    monkeypatch.setattr(resources, "psutil", None)
+    problems = []
+    assert open_monitor({}, problems) is None
+    assert "psutil" in problems[0]
+
+
+class NullMonitor:
+    def remove(self, usage):
+        pass
+
+
+def test_usage_counts_from_the_baseline_and_keeps_exited_processes():
+    usage = RunUsage(NullMonitor())
+    usage.roots.append(1)
+    # A warm worker that had used a second and 1000 bytes before this run
+    usage._baseline_from({1: [1.0, 500, 1000, 0]})
+    usage._update({1: [1.5, 800, 1500, 0], 2: [0.25, 100, 0, 40]})
+    # The child exits; what it used still counts
+    usage._update({1: [2.0, 600, 1500, 0]})
+    assert usage.stop().__dict__ == {
+        "cpu_time": 1.25,
+        "peak_rss": 900,
+        "read_bytes": 500,
+        "write_bytes": 40,
+        "samples": usage.samples,
+    }
+    assert len(usage.samples) == 2
+
+
+def test_long_runs_keep_a_bounded_number_of_samples():
+    usage = RunUsage(NullMonitor())
+    for tick in range(MAX_SAMPLES * 4):
+        usage._update({1: [tick, 0, 0, 0]})
+    assert MAX_SAMPLES // 2 <= len(usage.samples) <= MAX_SAMPLES
+    cpu = [sample[1] for sample in usage.samples]
+    assert cpu == sorted(cpu) and cpu[-1] > MAX_SAMPLES * 3
+
+
+@pytest.fixture
+def tree():
+    """A session of its own with a shell and two children"""
+    process = subprocess.Popen(
+        ["sh", "-c", "sleep 30 & sleep 30 & wait"], start_new_session=True
+    )
+    yield process
+    resources.os.killpg(process.pid, 9)
+    process.wait()
+
+
+@needs_proc
+def test_trees_are_process_groups_and_others_are_read_once(tree, monkeypatch):
+    known = {}
+    deadline = time.monotonic() + 10
+    while len(resources._trees([tree.pid], known)[tree.pid]) < 3:
+        assert time.monotonic() < deadline, "children never started"
+        time.sleep(0.02)
+    assert tree.pid in known
+    others = [pid for pid, group in known.items() if group != tree.pid]
+    assert others
+
+    read = []
+    stat = resources._proc_stat
+    monkeypatch.setattr(
+        resources, "_proc_stat", lambda pid: read.append(pid) or stat(pid)
+    )
+    trees = resources._trees([tree.pid], known)
+    assert len(trees[tree.pid]) == 3
+    # Only the tracked group and processes new since the last pass
+    assert not set(read) & set(others)
+
+
+@needs_proc
+def test_monitor_measures_a_busy_child():
+    monitor = ResourceMonitor(interval=0.05)
+    usage = monitor.track()
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            "-c",
+            "import time\nend = time.time() + 0.5\nwhile time.time() < end: pass",
+        ],
+        start_new_session=True,
+    )
+    usage.add(process)
+    process.wait()
+    result = usage.stop()
+    assert result.cpu_time > 0.1
+    assert result.peak_rss > 0
+    assert result.samples
+    # The sampler stops once nothing is tracked
+    deadline = time.monotonic() + 5
+    while monitor._thread is not None:
+        assert time.monotonic() < deadline
+        time.sleep(0.02)
+
+
+def test_psutil_reads_a_tree(tree):
+    pytest.importorskip("psutil")
+    deadline = time.monotonic() + 10
+    while len(resources._psutil_tree(tree.pid)) < 3:
+        assert time.monotonic() < deadline, "children never started"
+        time.sleep(0.02)
+    values = resources._psutil_tree(tree.pid)[tree.pid]
+    assert len(values) == 4 and values[1] > 0
@@ -0,0 +1,61 @@
+import time
+
+from launcher.history import Run
+from launcher.jobs import Job
+from launcher.runlog import RunLog, read_run
+
+
+def _log_runs(log, count):
+    keys = {}
+    for i in range(count):
+        job = Job(i + 1, f"Script {i}", f"scripts_list.script_{i}")
+        job.started = time.time()
+        log.write(job, f"first line of {i}\n")
+        log.write(job, "x" * 100 + "\n" * (i % 2))
+        run = Run(job.script_name, job.module, "coding", "cli", "success", 0)
+        run.started_at = job.started
+        keys[log.finish(job, run)] = (
+            job.script_name,
+            f"first line of {i}\n" + "x" * 100,
+        )
+    return keys
+
+
+def test_records_round_trip_through_rotation_and_compression(tmp_path):
+    # Every record fills a segment, so each one is rotated and sealed
+    log = RunLog(tmp_path, segment_bytes=64)
+    keys = _log_runs(log, 6)
+    log.flush()
+    for key, (script, output) in keys.items():
+        header, text = log.read(key)
+        assert header["key"] == key and header["script"] == script
+        assert text.rstrip("\n") == output
+    log.close()
+    assert not list(tmp_path.glob("*.lock"))
+
+    # The next process to open the log compresses what this one left
+    RunLog(tmp_path).close()
+    assert not list(tmp_path.glob("*.log"))
+    assert len(list(tmp_path.glob("*.log.gz"))) == 6
+    for key, (script, output) in keys.items():
+        header, text = read_run(tmp_path, key)
+        assert header["script"] == script
+        assert text.rstrip("\n") == output
+    assert read_run(tmp_path, "20000101-000000-1-1") is None
+
+
+def test_header_leaves_out_samples_and_output_path(tmp_path):
+    log = RunLog(tmp_path)
+    job = Job(1, "Sampled", "scripts_list.sampled")
+    log.write(job, "out\n")
+    run = Run(job.script_name, job.module, "coding", "gui", "success", 0)
+    run.started_at = time.time()
+    run.cpu_time = 1.5
+    run.samples = [[0.5, 1.5, 1024, 0, 0]]
+    key = log.finish(job, run)
+    log.close()
+
+    header, text = read_run(tmp_path, key)
+    assert header["cpu_time"] == 1.5 and header["bytes"] == 4
+    assert "samples" not in header and "output_path" not in header
+    assert text == "out\n"
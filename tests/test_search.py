@@ -0,0 +1,90 @@
+import pytest
+
+from launcher.config import ScriptEntry
+from launcher.search import SearchIndex, fuzzy_score
+
+ENTRIES = [
+    ScriptEntry("Study AI", "scripts_list.study_ai", "study"),
+    ScriptEntry("Annual Retro Index", "scripts_list.annual_retro_index", "coding"),
+    ScriptEntry("Bootstrap", "scripts_list.bootstrap", "coding"),
+    ScriptEntry("Strava Sync", "scripts_list.strava_sync", "health"),
+    ScriptEntry("Daily Standup", "scripts_list.daily_standup", "work"),
+    ScriptEntry("Test Runner", "scripts_list.test_runner", "coding"),
+]
+
+
+def _index(entries=ENTRIES):
+    index = SearchIndex()
+    index.update(entries)
+    return index
+
+
+def _names(results):
+    return [entry.name for entry in results]
+
+
+def test_word_starts_rank_before_other_substrings():
+    # Word starts shortest first, then the substring hits
+    assert _names(_index().search("st")) == [
+        "Study AI",
+        "Strava Sync",
+        "Daily Standup",
+        "Bootstrap",
+        "Test Runner",
+    ]
+    assert _names(_index().search("stra")) == ["Strava Sync", "Bootstrap"]
+    assert _names(_index().search("Strava S")) == ["Strava Sync"]
+
+
+def test_substring_hits_shortest_first():
+    assert _names(_index().search("tr")) == [
+        "Bootstrap",
+        "Strava Sync",
+        "Annual Retro Index",
+        "Test Runner",
+        "Daily Standup",
+    ]
+
+
+def test_fuzzy_matches_rank_by_score():
+    assert _names(_index().search("sai")) == ["Study AI", "Daily Standup", "Bootstrap"]
+    assert _names(_index().search("dsu")) == ["Daily Standup", "Study AI"]
+    assert fuzzy_score("sai", "study_ai") > fuzzy_score(
+        "sai", "scripts_list.annual_retro_index"
+    )
+    assert fuzzy_score("xyz", "study ai") is None
+    assert _index().search("xyz") == []
+
+
+def test_limit_keeps_the_best():
+    assert _names(_index().search("st", limit=2)) == ["Study AI", "Strava Sync"]
+
+
+def test_empty_query_lists_by_category_and_name():
+    assert _names(_index().search("", limit=3)) == [
+        "Annual Retro Index",
+        "Bootstrap",
+        "Test Runner",
+    ]
+
+
+@pytest.mark.parametrize("typed", ["study", "strava sync", "dsup", "boostrap", "tes"])
+def test_narrowing_matches_a_fresh_search(typed):
+    index = _index()
+    for end in range(1, len(typed) + 1):
+        query = typed[:end]
+        assert index.search(query) == _index().search(query), query
+    # Deleting characters must not keep the narrowed set
+    for end in range(len(typed) - 1, 0, -1):
+        query = typed[:end]
+        assert index.search(query) == _index().search(query), query
+
+
+def test_narrowing_is_reset_by_changes():
+    index = _index()
+    index.search("st")
+    added = ScriptEntry("Stretch Timer", "scripts_list.stretch_timer", "health")
+    index.add(added)
+    assert added in index.search("str")
+    index.remove(added)
+    assert index.search("stre") == _index().search("stre")
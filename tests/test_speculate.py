@@ -0,0 +1,202 @@
+import asyncio
+import os
+import time
+
+import pytest
+
+from launcher.aio import AsyncWorkerPool
+from launcher.config import BASE_DIR
+from launcher.speculate import Speculator, predict
+
+DAY = 86400
+
+
+def _at(day, hour, minute=0):
+    """Local timestamp ``day`` days into a fixed week (day 0 is a Monday)"""
+    return time.mktime((2025, 1, 6 + day, hour, minute, 0, 0, 0, -1))
+
+
+def test_predict_prefers_the_usual_time_of_day():
+    runs = [("mail", _at(day, 9)) for day in range(5)]
+    runs += [("report", _at(day, 16)) for day in range(5)]
+    assert predict(runs, now=_at(5, 9, 10), limit=2) == ["mail", "report"]
+    assert predict(runs, now=_at(5, 16, 10), limit=2) == ["report", "mail"]
+
+
+def test_predict_favours_what_usually_follows_the_last_run():
+    runs = []
+    for day in range(4):
+        runs += [("editor", _at(day, 9)), ("notes", _at(day, 9, 10))]
+        runs += [("music", _at(day, 12))]
+    # Long after the usual hours, so only the follow-on pattern counts
+    runs.append(("editor", _at(4, 21)))
+    assert predict(runs, now=_at(4, 21, 1), limit=1) == ["notes"]
+
+
+def test_predict_limit_and_empty_history():
+    assert predict([], now=_at(0, 9)) == []
+    runs = [(f"script_{i}", _at(0, 9)) for i in range(5)]
+    assert len(predict(runs, now=_at(0, 9), limit=3)) == 3
+
+
+class FakeRoot:
+    """Tk's after/after_cancel with a clock the test advances"""
+
+    def __init__(self):
+        self.now = 0
+        self.timers = {}
+        self._ids = 0
+
+    def after(self, ms, callback):
+        self._ids += 1
+        self.timers[self._ids] = (self.now + ms, callback)
+        return self._ids
+
+    def after_cancel(self, timer):
+        self.timers.pop(timer, None)
+
+    def advance(self, ms):
+        self.now += ms
+        for timer, (due, callback) in sorted(self.timers.items()):
+            if due <= self.now:
+                del self.timers[timer]
+                callback()
+
+
+class FakePool:
+    def __init__(self, idle=True):
+        self.idle = idle
+        self.prepared = []
+        self.cancelled = []
+
+    def is_prepared(self, module):
+        return module in self.prepared
+
+    def prepare(self, module):
+        if self.idle:
+            self.prepared.append(module)
+        return self.idle
+
+    def cancel_preparation(self, module):
+        self.cancelled.append(module)
+
+
+class FakeHistory:
+    def __init__(self, runs=()):
+        self.runs = list(runs)
+
+    def record(self, module, when=None):
+        self.runs.append((module, when or time.time()))
+
+
+def _speculator(pool, **kwargs):
+    root = FakeRoot()
+    return root, Speculator(root, pool, FakeHistory(), **kwargs)
+
+
+def test_hover_prepares_after_the_delay_and_cancels_on_leave():
+    pool = FakePool()
+    root, speculator = _speculator(pool, hover_delay_ms=150)
+    speculator.hover("scripts_list.a")
+    root.advance(100)
+    speculator.hover("scripts_list.b")  # moved on before the delay
+    root.advance(100)
+    assert pool.prepared == []
+    root.advance(100)
+    assert pool.prepared == ["scripts_list.b"]
+
+    speculator.hover(None)
+    assert pool.cancelled == ["scripts_list.b"]
+
+
+def test_preparations_are_rate_limited():
+    pool = FakePool()
+    _, speculator = _speculator(pool, per_minute=6, guesses=2)
+    modules = [f"scripts_list.s{i}" for i in range(5)]
+    started = [speculator.prepare(module) for module in modules]
+    # A burst of guesses + 1, then one every ten seconds
+    assert started == [True, True, True, False, False]
+    # Already prepared costs nothing
+    assert speculator.prepare(modules[0])
+
+
+def test_macros_busy_and_disabled_prepare_nothing():
+    pool = FakePool()
+    _, speculator = _speculator(pool)
+    assert not speculator.prepare("macro:morning")
+
+    speculator.history.runs = [("scripts_list.a", time.time())]
+    speculator.busy = lambda: True
+    speculator.anticipate()
+    speculator.enabled = False
+    assert not speculator.prepare("scripts_list.a")
+    assert pool.prepared == []
+
+
+@pytest.fixture
+def scripts(tmp_path):
+    (tmp_path / "spec_noisy.py").write_text('print("imported noisy")\n')
+    (tmp_path / "spec_slow.py").write_text("import time\ntime.sleep(1.5)\n")
+    (tmp_path / "spec_job.py").write_text('import spec_noisy\nprint("job ran")\n')
+    (tmp_path / "spec_slow_job.py").write_text('import spec_slow\nprint("slow ran")\n')
+    return dict(os.environ, PYTHONPATH=str(tmp_path))
+
+
+async def _wait_for(predicate, timeout=20):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "timed out"
+        await asyncio.sleep(0.02)
+
+
+def _with_pool(env, test):
+    async def main():
+        pool = AsyncWorkerPool(asyncio.get_running_loop(), BASE_DIR, size=1, env=env)
+        pool.start()
+        try:
+            await _wait_for(lambda: pool._idle)
+            await test(pool)
+        finally:
+            await pool.shutdown()
+
+    asyncio.run(main())
+
+
+async def _run(pool, module):
+    started, output = [], []
+    result = await pool.run(
+        module, timeout=20, on_start=started.append, on_output=output.append
+    )
+    return result, started[0].pid, "".join(output)
+
+
+def test_prepared_worker_runs_the_script_without_import_output(scripts):
+    async def test(pool):
+        worker = pool._idle[0]
+        assert pool.prepare("spec_job")
+        # Reserved while it prepares
+        assert pool._idle == [] and pool.is_prepared("spec_job")
+        await _wait_for(lambda: pool._idle)
+        assert pool._idle == [worker]
+
+        result, pid, output = await _run(pool, "spec_job")
+        assert result.returncode == 0
+        assert pid == worker.process.pid
+        # Printed by the preparation into devnull, not into the run
+        assert output == "job ran\n"
+
+    _with_pool(scripts, test)
+
+
+def test_run_during_preparation_uses_another_worker(scripts):
+    async def test(pool):
+        preparing = pool._idle[0]
+        assert pool.prepare("spec_slow_job")
+        result, pid, output = await _run(pool, "spec_slow_job")
+        assert result.returncode == 0
+        assert pid != preparing.process.pid
+        assert output == "slow ran\n"
+        # Cut short, it comes back once the import in flight is done
+        await _wait_for(lambda: preparing in pool._idle)
+
+    _with_pool(scripts, test)
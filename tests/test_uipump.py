@@ -0,0 +1,100 @@
+import threading
+
+from launcher.uipump import UpdatePump
+
+
+class FakeRoot:
+    """Tk's after/after_cancel; ``run_next()`` fires the scheduled callback"""
+
+    def __init__(self):
+        self.timers = {}
+        self.delays = []
+        self.errors = []
+        self._ids = 0
+
+    def after(self, ms, callback):
+        self._ids += 1
+        self.timers[self._ids] = callback
+        self.delays.append(ms)
+        return self._ids
+
+    def after_cancel(self, timer):
+        del self.timers[timer]
+
+    def report_callback_exception(self, kind, value, traceback):
+        self.errors.append(value)
+
+    def run_next(self):
+        (timer,) = self.timers
+        self.timers.pop(timer)()
+
+
+def _pump(fps=50):
+    root = FakeRoot()
+    pump = UpdatePump(root, fps=fps)
+    pump.start()
+    return root, pump
+
+
+def test_updates_are_coalesced_by_key_in_first_posted_order():
+    root, pump = _pump()
+    applied = []
+    for i in range(3):
+        pump.post("status", lambda i=i: applied.append(("status", i)))
+        pump.post("table", lambda i=i: applied.append(("table", i)))
+    pump.post("dialog", lambda: applied.append(("dialog", 0)))
+
+    root.run_next()
+    assert applied == [("status", 2), ("table", 2), ("dialog", 0)]
+    assert (pump.applied, pump.dropped) == (3, 4)
+
+
+def test_posting_on_the_tk_thread_brings_the_frame_forward():
+    root, pump = _pump(fps=50)
+    assert root.delays == [UpdatePump.IDLE_MS]
+    pump.post("status", lambda: None)
+    # The idle tick was replaced by one at most a frame away
+    assert len(root.timers) == 1 and root.delays[-1] <= pump.frame_ms
+    pump.post("table", lambda: None)
+    assert len(root.delays) == 2
+
+    root.run_next()
+    assert root.delays[-1] == pump.frame_ms
+    # Nothing more came, so back to idle ticks
+    root.run_next()
+    assert root.delays[-1] == UpdatePump.IDLE_MS
+
+
+def test_updates_from_other_threads_wait_for_the_next_tick():
+    root, pump = _pump()
+    applied = []
+    thread = threading.Thread(
+        target=pump.post, args=("status", lambda: applied.append(1))
+    )
+    thread.start()
+    thread.join()
+    # Tk isn't called from the other thread
+    assert root.delays == [UpdatePump.IDLE_MS]
+    root.run_next()
+    assert applied == [1]
+
+
+def test_a_failing_update_is_reported_and_the_rest_still_apply():
+    root, pump = _pump()
+    applied = []
+    pump.post("bad", lambda: 1 / 0)
+    pump.post("good", lambda: applied.append("good"))
+    root.run_next()
+    assert applied == ["good"]
+    assert isinstance(root.errors[0], ZeroDivisionError)
+
+
+def test_close_drops_what_is_pending():
+    root, pump = _pump()
+    applied = []
+    pump.post("status", lambda: applied.append(1))
+    pump.close()
+    assert root.timers == {}
+    pump.post("status", lambda: applied.append(2))
+    assert not pump.flush()
+    assert applied == []
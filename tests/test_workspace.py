@@ -0,0 +1,90 @@
+import threading
+
+import pytest
+
+from template.workspace import FAILED, OK, SKIPPED, Workspace
+
+
+def _recorder(order, lock, name, result=True):
+    def action():
+        with lock:
+            order.append(name)
+        return result
+
+    return action
+
+
+def test_steps_run_after_their_dependencies():
+    order, lock = [], threading.Lock()
+    workspace = Workspace()
+    workspace.add("editor", _recorder(order, lock, "editor"), requires=["validate"])
+    workspace.add("validate", _recorder(order, lock, "validate"), critical=True)
+    workspace.add("shell", _recorder(order, lock, "shell"), requires=["validate"])
+    workspace.add(
+        "notes", _recorder(order, lock, "notes"), requires=["editor", "shell"]
+    )
+    workspace.add("websites", _recorder(order, lock, "websites"))
+
+    result = workspace.run()
+
+    assert result.ok
+    assert all(step.status == OK for step in result.steps.values())
+    assert list(result.steps) == ["editor", "validate", "shell", "notes", "websites"]
+    assert sorted(order) == sorted(result.steps)
+    for step, dependency in [
+        ("editor", "validate"),
+        ("shell", "validate"),
+        ("notes", "editor"),
+        ("notes", "shell"),
+    ]:
+        assert order.index(dependency) < order.index(step)
+
+
+def test_failure_skips_dependents_only():
+    order, lock = [], threading.Lock()
+
+    def explode():
+        raise OSError("no such directory")
+
+    workspace = Workspace()
+    workspace.add("validate", explode, critical=True)
+    workspace.add("editor", _recorder(order, lock, "editor"), requires=["validate"])
+    workspace.add("notes", _recorder(order, lock, "notes"), requires=["editor"])
+    workspace.add("websites", _recorder(order, lock, "websites"))
+    workspace.add("docs", _recorder(order, lock, "docs", result=False))
+
+    result = workspace.run()
+
+    assert not result.ok
+    assert result.steps["validate"].status == FAILED
+    assert result.steps["validate"].error == "no such directory"
+    assert result.steps["editor"].status == SKIPPED
+    assert result.steps["notes"].status == SKIPPED
+    assert result.steps["websites"].status == OK
+    # An action returning False fails its step without raising
+    assert result.steps["docs"].status == FAILED
+    assert sorted(order) == ["docs", "websites"]
+
+
+def test_non_critical_failure_keeps_the_workspace_ok():
+    workspace = Workspace()
+    workspace.add("validate", lambda: True, critical=True)
+    workspace.add("shell", lambda: False, requires=["validate"])
+    assert workspace.run().ok
+
+
+def test_bad_graphs_are_rejected_before_running():
+    ran = []
+    workspace = Workspace()
+    workspace.add("a", lambda: ran.append("a"), requires=["b"])
+    workspace.add("b", lambda: ran.append("b"), requires=["a"])
+    with pytest.raises(ValueError, match="cycle"):
+        workspace.run()
+
+    workspace = Workspace()
+    workspace.add("a", lambda: ran.append("a"), requires=["missing"])
+    with pytest.raises(ValueError, match="unknown step"):
+        workspace.run()
+    with pytest.raises(ValueError, match="duplicate"):
+        workspace.add("a", lambda: None)
+    assert ran == []